@@ -0,0 +1,158 @@
+"""
+Análisis de impacto de fallos sobre el grafo de routers de una sesión
+
+Encuentra los puntos únicos de fallo de la topología y cuántos pares
+VLAN-VLAN deja incomunicados cada uno:
+
+    enlaces puente            su caída parte la red en dos
+    routers de articulación   su caída parte la red en dos o más trozos
+
+Un solo recorrido en profundidad (Tarjan, iterativo) sobre el grafo de
+routing.grafo_de_conexiones() da puentes y articulaciones en O(routers +
+enlaces). En el mismo recorrido se acumula el número de VLANs de cada
+subárbol, así que el impacto de cada fallo sale de los tamaños de los trozos
+(subárbol y resto de la componente) sin volver a recorrer el grafo. Los
+enlaces paralelos entre dos routers nunca son puente.
+
+Los pares se cuentan como en verificador_alcance (origen, destino) entre
+VLANs de los routers que siguen en pie; las VLANs del propio router caído
+se informan aparte.
+
+Uso:
+    python analisis_fallos.py <sesion.json>
+"""
+import sys
+
+from routing import grafo_de_conexiones
+from modelo_sesion import ModeloSesion
+
+def _pares_entre_trozos(tamanos):
+    """Pares (origen, destino) entre VLANs de trozos distintos"""
+    total = sum(tamanos)
+    return total * total - sum(tamano * tamano for tamano in tamanos)
+
+def analizar_grafo(routers, enlaces, vlans_por_router):
+    """
+    Puentes y articulaciones con su impacto.
+
+    Args:
+        routers: Routers (enteros)
+        enlaces: [(red, mascara, r1, r2)]
+        vlans_por_router: {router: número de VLANs}
+
+    Returns:
+        tuple: (puentes [(indice_enlace, pares_cortados)],
+                articulaciones {router: pares_cortados})
+    """
+    adyacencia = {r: [] for r in routers}
+    for indice, (_, _, r1, r2) in enumerate(enlaces):
+        adyacencia[r1].append((r2, indice))
+        adyacencia[r2].append((r1, indice))
+
+    descubierto = {}
+    bajo = {}
+    peso = {}  # VLANs del subárbol DFS de cada router
+    puentes = []
+    articulaciones = {}
+    tiempo = 0
+    for raiz in sorted(adyacencia):
+        if raiz in descubierto:
+            continue
+
+        descubierto[raiz] = bajo[raiz] = tiempo
+        tiempo += 1
+        peso[raiz] = vlans_por_router.get(raiz, 0)
+        trozos = {raiz: []}  # {router: VLANs de cada hijo que queda aislado si cae}
+        puentes_componente = []  # [(enlace, VLANs del lado del hijo)]
+        pila = [(raiz, -1, iter(adyacencia[raiz]))]  # (router, enlace de llegada, vecinos pendientes)
+        while pila:
+            router, enlace_padre, pendientes = pila[-1]
+            avanzado = False
+            for vecino, indice in pendientes:
+                if indice == enlace_padre:
+                    continue
+                if vecino in descubierto:
+                    bajo[router] = min(bajo[router], descubierto[vecino])
+                    continue
+                descubierto[vecino] = bajo[vecino] = tiempo
+                tiempo += 1
+                peso[vecino] = vlans_por_router.get(vecino, 0)
+                trozos[vecino] = []
+                pila.append((vecino, indice, iter(adyacencia[vecino])))
+                avanzado = True
+                break
+            if avanzado:
+                continue
+
+            pila.pop()
+            if not pila:
+                break
+            padre = pila[-1][0]
+            bajo[padre] = min(bajo[padre], bajo[router])
+            peso[padre] += peso[router]
+            if bajo[router] > descubierto[padre]:
+                puentes_componente.append((enlace_padre, peso[router]))
+            if bajo[router] >= descubierto[padre]:
+                trozos[padre].append(peso[router])
+
+        # Al cerrar la raíz su peso es el total de VLANs de la componente
+        total = peso[raiz]
+        for indice, lado in puentes_componente:
+            puentes.append((indice, _pares_entre_trozos([lado, total - lado])))
+        for router, hijos in trozos.items():
+            # La raíz es articulación con dos o más hijos; el resto, con uno que quede aislado
+            if (router == raiz and len(hijos) < 2) or not hijos:
+                continue
+            propias = vlans_por_router.get(router, 0)
+            articulaciones[router] = _pares_entre_trozos(hijos + [total - propias - sum(hijos)])
+    return puentes, articulaciones
+
+def analizar_fallos(estado):
+    """
+    Puntos únicos de fallo de la sesión, de mayor a menor impacto.
+
+    Returns:
+        dict: {"pares_totales",
+               "enlaces": [{"enlace", "red", "pares_cortados"}],
+               "routers": [{"router", "vlans_locales", "pares_cortados"}]}
+    """
+    modelo = ModeloSesion.desde_estado(estado)
+    vlans = {r: len(router.vlans) for r, router in modelo.routers.items()}
+    vecinos = grafo_de_conexiones(modelo.enlaces.values(), modelo.routers)
+    enlaces = [(enlace.red.ip, enlace.red.prefijo, r1, r2) for (r1, r2), enlace in modelo.enlaces.items()]
+    puentes, articulaciones = analizar_grafo(vecinos.keys(), enlaces, vlans)
+
+    total = sum(vlans.values())
+    informe = {"pares_totales": total * total, "enlaces": [], "routers": []}
+    for indice, pares in puentes:
+        red, mascara, r1, r2 = enlaces[indice]
+        informe["enlaces"].append({"enlace": f"R{r1}-R{r2}", "red": f"{red}/{mascara}", "pares_cortados": pares})
+    for router, pares in articulaciones.items():
+        informe["routers"].append({"router": f"R{router}", "vlans_locales": vlans.get(router, 0), "pares_cortados": pares})
+    informe["enlaces"].sort(key=lambda fallo: (-fallo["pares_cortados"], fallo["enlace"]))
+    informe["routers"].sort(key=lambda fallo: (-fallo["pares_cortados"], int(fallo["router"][1:])))
+    return informe
+
+def mostrar_informe(informe):
+    """Imprime el informe de analizar_fallos()"""
+    print("\nANÁLISIS DE PUNTOS ÚNICOS DE FALLO")
+    print("=" * 70)
+    print(f"   Pares VLAN-VLAN: {informe['pares_totales']}")
+    for fallo in informe["enlaces"]:
+        print(f"   🔗 Enlace {fallo['enlace']} ({fallo['red']}): corta {fallo['pares_cortados']} pares")
+    for fallo in informe["routers"]:
+        print(f"   📡 {fallo['router']}: corta {fallo['pares_cortados']} pares "
+              f"(además de sus {fallo['vlans_locales']} VLANs)")
+    if not informe["enlaces"] and not informe["routers"]:
+        print("   ✅ Ningún enlace ni router aislado deja VLANs incomunicadas")
+
+if __name__ == "__main__":
+    from session_manager import cargar_sesion
+
+    if len(sys.argv) != 2:
+        print("Uso: python analisis_fallos.py <sesion.json>")
+        sys.exit(1)
+    estado = cargar_sesion(sys.argv[1])
+    if estado is None:
+        sys.exit(1)
+    mostrar_informe(analizar_fallos(estado))
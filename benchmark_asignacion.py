@@ -0,0 +1,139 @@
+"""
+Comparativa de estrategias de asignación sobre conjuntos de solicitudes grabados
+
+Un conjunto de solicitudes es la lista [(mascara, descripcion, dominio)] que
+recibió el DiagonalManager. Se obtiene de sesiones guardadas (.json) o de
+especificaciones de topología (.jsonl, ver planificador.py), y se reproduce
+con cada estrategia midiendo:
+
+    segundos        tiempo de procesar_asignaciones() (mejor de N repeticiones)
+    marca_maxima    última dirección ocupada (marca de agua del espacio usado)
+    prefijo         menor prefijo desde la IP base que contiene todo lo asignado
+    fragmentacion   % de direcciones libres por debajo de la marca máxima
+    huecos          tramos libres por debajo de la marca máxima
+
+Uso:
+    python benchmark_asignacion.py [sesion.json | specs.jsonl ...]
+"""
+import json
+import os
+import time
+
+from diagonal_manager import DiagonalManager
+from estrategias_asignacion import (
+    ESTRATEGIA_PRIMER_AJUSTE, ESTRATEGIA_MEJOR_AJUSTE, ESTRATEGIA_BUDDY, ESTRATEGIA_JERARQUICA
+)
+from ip_utils import entero_a_ip
+
+ESTRATEGIAS_COMPARADAS = (
+    ESTRATEGIA_PRIMER_AJUSTE, ESTRATEGIA_MEJOR_AJUSTE, ESTRATEGIA_BUDDY, ESTRATEGIA_JERARQUICA
+)
+REPETICIONES = 5
+
+def solicitudes_de_sesion(estado):
+    """Reconstruye las solicitudes de una sesión a partir de sus redes asignadas"""
+    calculada = estado["config_calculada"]
+    progreso = estado["progreso_routers"]
+
+    dueno = {}  # {(red, mascara): router}
+    for r_str, vlans in progreso.get("vlans_por_router", {}).items():
+        for red, mascara in vlans.values():
+            dueno[(red, int(mascara))] = int(r_str)
+    for r_str, datos in progreso.get("config_swc3", {}).items():
+        red, mascara = datos["red_hacia_router"]
+        dueno[(red, int(mascara))] = int(r_str)
+
+    solicitudes = []
+    for vlan_id, combos in calculada.get("vlans_con_combos", []):
+        for j, (red, mascara) in enumerate(combos):
+            solicitudes.append((int(mascara), f"VLAN {vlan_id} Combo-{j+1}", dueno.get((red, int(mascara)))))
+    for j, (red, mascara) in enumerate(calculada.get("redes_p2p_disponibles", [])):
+        solicitudes.append((int(mascara), f"Red P2P {j+1}", dueno.get((red, int(mascara)))))
+    return estado["datos_iniciales"]["base_ip"], solicitudes
+
+def cargar_conjuntos(ruta):
+    """
+    Lee los conjuntos de un archivo: una sesión (.json) o una especificación por línea (.jsonl)
+
+    Returns:
+        list: [(nombre, base_ip, solicitudes)]
+    """
+    if ruta.endswith(".jsonl"):
+        from planificador import planificar_sesion
+        conjuntos = []
+        with open(ruta, "r", encoding="utf-8") as f:
+            for numero_linea, linea in enumerate(f, start=1):
+                linea = linea.strip()
+                if linea and not linea.startswith("#"):
+                    spec = json.loads(linea)
+                    base_ip, solicitudes = solicitudes_de_sesion(planificar_sesion(spec))
+                    conjuntos.append((spec.get("nombre_sesion", f"linea{numero_linea}"), base_ip, solicitudes))
+        return conjuntos
+
+    with open(ruta, "r", encoding="utf-8") as f:
+        estado = json.load(f)
+    base_ip, solicitudes = solicitudes_de_sesion(estado)
+    return [(estado.get("nombre_sesion", os.path.basename(ruta)), base_ip, solicitudes)]
+
+def medir_estrategia(base_ip, solicitudes, estrategia, repeticiones=REPETICIONES):
+    """Reproduce las solicitudes con una estrategia y calcula sus métricas"""
+    mejor_tiempo = None
+    for _ in range(repeticiones):
+        dm = DiagonalManager(base_ip, verbose=False, estrategia=estrategia)
+        for mascara, descripcion, dominio in solicitudes:
+            dm.solicitar_combo(mascara, descripcion, dominio=dominio)
+        inicio = time.perf_counter()
+        dm.procesar_asignaciones()
+        segundos = time.perf_counter() - inicio
+        mejor_tiempo = segundos if mejor_tiempo is None else min(mejor_tiempo, segundos)
+
+    ocupado = sorted(dm.espacio_ocupado)
+    marca_maxima = max((fin for _, fin, _ in ocupado), default=dm.base_ip_int)
+    extension = marca_maxima - dm.base_ip_int + 1
+    asignadas = sum(fin - inicio + 1 for inicio, fin, _ in ocupado)
+
+    huecos = 0
+    cursor = dm.base_ip_int
+    for inicio, fin, _ in ocupado:
+        if inicio > cursor:
+            huecos += 1
+        cursor = max(cursor, fin + 1)
+
+    return {
+        "estrategia": estrategia,
+        "segundos": mejor_tiempo,
+        "marca_maxima": entero_a_ip(marca_maxima),
+        "prefijo": 32 - (extension - 1).bit_length(),
+        "direcciones_asignadas": asignadas,
+        "fragmentacion": round(100 * (extension - asignadas) / extension, 2),
+        "huecos": huecos
+    }
+
+def comparar_estrategias(base_ip, solicitudes, estrategias=ESTRATEGIAS_COMPARADAS, repeticiones=REPETICIONES):
+    """Mide todas las estrategias sobre el mismo conjunto de solicitudes"""
+    return [medir_estrategia(base_ip, solicitudes, e, repeticiones) for e in estrategias]
+
+def mostrar_comparativa(nombre, resultados):
+    """Imprime la tabla de resultados de un conjunto"""
+    print(f"\nCONJUNTO '{nombre}'")
+    print("=" * 86)
+    print(f"   {'Estrategia':14s} {'Tiempo (ms)':>12s} {'Marca máxima':>16s} {'Prefijo':>8s} {'Fragm. %':>9s} {'Huecos':>7s}")
+    for r in resultados:
+        print(f"   {r['estrategia']:14s} {r['segundos'] * 1000:12.3f} {r['marca_maxima']:>16s} "
+              f"{'/' + str(r['prefijo']):>8s} {r['fragmentacion']:9.2f} {r['huecos']:7d}")
+
+def ejecutar_benchmark(rutas, repeticiones=REPETICIONES):
+    """Compara las estrategias en todos los conjuntos de los archivos indicados"""
+    resultados = {}
+    for ruta in rutas:
+        for nombre, base_ip, solicitudes in cargar_conjuntos(ruta):
+            resultados[nombre] = comparar_estrategias(base_ip, solicitudes, repeticiones=repeticiones)
+            mostrar_comparativa(f"{nombre} ({len(solicitudes)} solicitudes)", resultados[nombre])
+    return resultados
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) < 2:
+        print("Uso: python benchmark_asignacion.py <sesion.json | specs.jsonl> [...]")
+        sys.exit(1)
+    ejecutar_benchmark(sys.argv[1:])
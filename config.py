@@ -1,13 +1,15 @@
 """
 Configuración inicial y constantes del sistema
 """
-import os
 import sys
 
 # --- CONFIGURACIÓN INICIAL ---
+# Sin subprocesos al importar: se reconfigura el flujo de salida en lugar de ejecutar 'chcp'
 if sys.platform.startswith('win'):
-    os.system('chcp 65001 > nul')
-    sys.stdout.reconfigure(encoding='utf-8')
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+    except (AttributeError, ValueError):
+        pass  # stdout redirigido o sin soporte de reconfigure
 
 # Constantes del sistema
 MAX_VLAN_ID = 4094
@@ -15,6 +17,9 @@ MIN_VLAN_ID = 2
 DEFAULT_TIMEOUT = 30000  # milliseconds
 DEFAULT_FILE_ENCODING = 'utf-8'
 
+# Registro de prefijos compartido por todas las sesiones de la instalación (ver registro_global.py)
+ARCHIVO_REGISTRO_GLOBAL = "registro_global.json"
+
 # Interfaces por defecto según el modo
 INTERFACES_WAN = ["eth0/0/0", "eth0/1/0", "eth0/2/0", "eth0/3/0"]
 INTERFACES_LAN = ["fa0/0", "fa0/1"]
@@ -0,0 +1,203 @@
+"""
+Generación de configuraciones delta entre dos sesiones (o dos versiones de una sesión)
+
+Compara las listas de comandos por dispositivo guardadas en
+progreso_routers["comandos_router"] / ["comandos_switches"] y produce el
+conjunto mínimo de cambios, incluyendo las formas "no" de lo eliminado.
+Todo el análisis es lineal en el tamaño de las configuraciones.
+"""
+import sys
+from session_manager import cargar_sesion, clave_natural
+
+# Líneas de control que no forman parte de la configuración en sí
+LINEAS_CONTROL = {"en", "enable", "conf t", "configure terminal", "end", "exit", "yes"}
+
+# Encabezados que abren un sub-modo (interfaz, pool, línea, etc.)
+PREFIJOS_BLOQUE = (
+    "int ", "interface ", "ip dhcp pool ", "line ", "vlan ",
+    "router ospf", "crypto key generate rsa"
+)
+
+# Comandos globales: cierran cualquier sub-modo abierto
+PREFIJOS_GLOBALES = (
+    "hostname ", "ip route ", "ip domain-name ", "username ", "enable secret ",
+    "ip ssh ", "spanning-tree ", "ip default-gateway ", "ip routing",
+    "no ip domain-lookup"
+)
+
+# Bloques que se eliminan completos con "no <encabezado>"
+PREFIJOS_BLOQUE_ELIMINABLE = ("ip dhcp pool ", "vlan ", "router ospf", "int port-channel", "int vlan")
+
+# Bloques que se regeneran completos si cambian (no admiten negar líneas sueltas)
+PREFIJOS_BLOQUE_ATOMICO = ("crypto key generate rsa",)
+
+def _es_encabezado(linea):
+    return linea.startswith(PREFIJOS_BLOQUE)
+
+def _es_global(linea):
+    return linea.startswith(PREFIJOS_GLOBALES)
+
+def parsear_configuracion(comandos):
+    """
+    Convierte una lista de comandos en (globales, bloques).
+
+    Returns:
+        tuple: (dict linea_global -> None, dict encabezado -> dict hijo -> None)
+               Se usan dicts como conjuntos ordenados para diffs en O(n).
+    """
+    globales = {}
+    bloques = {}
+    bloque_actual = None
+
+    for comando in comandos:
+        linea = comando.strip()
+        if not linea:
+            continue
+
+        if linea in LINEAS_CONTROL:
+            # "exit" cierra el sub-modo; "yes" pertenece al prompt de crypto
+            if linea == "exit":
+                bloque_actual = None
+            elif linea == "yes" and bloque_actual is not None:
+                bloque_actual[linea] = None
+            continue
+
+        if _es_encabezado(linea):
+            bloque_actual = bloques.setdefault(linea, {})
+        elif _es_global(linea) or bloque_actual is None:
+            bloque_actual = None
+            globales[linea] = None
+        else:
+            bloque_actual[linea] = None
+
+    return globales, bloques
+
+def negar_comando(linea):
+    """Devuelve la forma "no" de un comando"""
+    if linea in ("no shut", "no shutdown"):
+        return "shutdown"
+    if linea == "shutdown":
+        return "no shutdown"
+    if linea.startswith("no "):
+        return linea[3:]
+    if linea.startswith("username "):
+        return f"no username {linea.split()[1]}"
+    if linea.startswith("enable secret"):
+        return "no enable secret"
+    return f"no {linea}"
+
+def _eliminar_bloque(encabezado, hijos):
+    """Comandos para retirar un bloque completo"""
+    es_subinterfaz = encabezado.startswith(("int ", "interface ")) and "." in encabezado.split()[-1]
+    if es_subinterfaz or encabezado.startswith(PREFIJOS_BLOQUE_ELIMINABLE):
+        return [f"no {encabezado}"]
+    if encabezado.startswith(PREFIJOS_BLOQUE_ATOMICO):
+        return []  # Las claves RSA no se retiran automáticamente
+    return [encabezado] + [negar_comando(hijo) for hijo in hijos] + ["exit"]
+
+def calcular_delta_dispositivo(comandos_anteriores, comandos_nuevos):
+    """
+    Calcula el conjunto mínimo de comandos que lleva un dispositivo de
+    comandos_anteriores a comandos_nuevos.
+
+    Orden de aplicación:
+        1. Bloques eliminados (libera IPs que podrían reutilizarse)
+        2. Bloques nuevos o modificados
+        3. Comandos globales nuevos (rutas nuevas antes de retirar las viejas)
+        4. Comandos globales eliminados
+
+    Returns:
+        list: Comandos delta (vacía si no hay cambios)
+    """
+    globales_ant, bloques_ant = parsear_configuracion(comandos_anteriores or [])
+    globales_nue, bloques_nue = parsear_configuracion(comandos_nuevos or [])
+
+    eliminados = []
+    for encabezado, hijos in bloques_ant.items():
+        if encabezado not in bloques_nue:
+            eliminados.extend(_eliminar_bloque(encabezado, hijos))
+
+    modificados = []
+    for encabezado, hijos in bloques_nue.items():
+        hijos_ant = bloques_ant.get(encabezado)
+        if hijos_ant is None:
+            modificados.extend([encabezado, *hijos, "exit"])
+            continue
+        if hijos_ant == hijos:
+            continue
+        if encabezado.startswith(PREFIJOS_BLOQUE_ATOMICO):
+            modificados.extend([encabezado, *hijos])
+            continue
+        quitados = [negar_comando(h) for h in hijos_ant if h not in hijos]
+        agregados = [h for h in hijos if h not in hijos_ant]
+        modificados.extend([encabezado, *quitados, *agregados, "exit"])
+
+    hostname_nuevo = any(l.startswith("hostname ") for l in globales_nue)
+    globales_agregados = [l for l in globales_nue if l not in globales_ant]
+    globales_quitados = [
+        negar_comando(l) for l in globales_ant
+        if l not in globales_nue and not (l.startswith("hostname ") and hostname_nuevo)
+    ]
+
+    cambios = eliminados + modificados + globales_agregados + globales_quitados
+    if not cambios:
+        return []
+    return ["en", "conf t", *cambios, "end"]
+
+def _dispositivos_de_sesion(estado):
+    """Devuelve {nombre_dispositivo: comandos} de una sesión"""
+    progreso = estado.get("progreso_routers", {})
+    dispositivos = {}
+    for r_num, comandos in progreso.get("comandos_router", {}).items():
+        dispositivos[f"R{r_num}"] = comandos
+    for switches in progreso.get("comandos_switches", {}).values():
+        for sw_name, sw_cmds in switches.items():
+            dispositivos[sw_name] = sw_cmds
+    return dispositivos
+
+def calcular_delta_sesion(estado_anterior, estado_nuevo):
+    """
+    Calcula los cambios por dispositivo entre dos sesiones.
+
+    Returns:
+        dict: {nombre_dispositivo: comandos_delta} solo para dispositivos con cambios.
+              Los dispositivos nuevos reciben su configuración completa.
+    """
+    anteriores = _dispositivos_de_sesion(estado_anterior)
+    nuevos = _dispositivos_de_sesion(estado_nuevo)
+
+    delta = {}
+    for nombre in sorted(nuevos, key=clave_natural):
+        if nombre not in anteriores:
+            delta[nombre] = list(nuevos[nombre])
+            continue
+        cambios = calcular_delta_dispositivo(anteriores[nombre], nuevos[nombre])
+        if cambios:
+            delta[nombre] = cambios
+
+    for nombre in sorted(set(anteriores) - set(nuevos), key=clave_natural):
+        print(f"⚠️ {nombre} ya no existe en la nueva sesión; retíralo manualmente.")
+
+    return delta
+
+def generar_archivo_delta(estado_anterior, estado_nuevo, nombre_archivo):
+    """Escribe el archivo .cisco con solo los cambios por dispositivo"""
+    delta = calcular_delta_sesion(estado_anterior, estado_nuevo)
+    with open(nombre_archivo, "w", encoding="utf-8") as f:
+        for nombre, comandos in delta.items():
+            f.write(f"! Cambios para {nombre}\n")
+            f.write("\n".join(comandos))
+            f.write("\n\n")
+    print(f"\n✅ Archivo delta '{nombre_archivo}' generado: {len(delta)} dispositivos con cambios.")
+    return delta
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4:
+        print("Uso: python config_diff.py <sesion_anterior.json> <sesion_nueva.json> <salida.cisco>")
+        sys.exit(1)
+
+    anterior = cargar_sesion(sys.argv[1])
+    nuevo = cargar_sesion(sys.argv[2])
+    if anterior is None or nuevo is None:
+        sys.exit(1)
+    generar_archivo_delta(anterior, nuevo, sys.argv[3])
@@ -0,0 +1,84 @@
+"""
+Contexto explícito de planificación de una sesión
+
+Sustituye al DiagonalManager global de ip_utils y a los atributos que se le
+añadían sobre la marcha (solicitudes_p2p_guardadas, vlans_info_guardada).
+Cada sesión crea su propio contexto, por lo que varias sesiones pueden
+planificarse a la vez en el mismo proceso (hilos, servicio, lotes).
+"""
+import threading
+from diagonal_manager import DiagonalManager
+from estrategias_asignacion import ESTRATEGIA_SECUENCIAL
+
+class ContextoPlanificacion:
+    """Agrupa el asignador de IPs y las solicitudes pendientes de una sesión"""
+
+    def __init__(self, base_ip, verbose=True, estrategia=ESTRATEGIA_SECUENCIAL, prefijo_pool=None):
+        self.base_ip = base_ip
+        self.diagonal_manager = DiagonalManager(
+            base_ip, verbose=verbose, estrategia=estrategia, prefijo_pool=prefijo_pool
+        )
+        self.solicitudes_p2p = []  # [id_solicitud]
+        self.vlans_info = []  # [(vlan_id, vlan_nombre, mascara, [id_solicitud])]
+        self._lock = threading.Lock()
+
+    def registrar_solicitudes_p2p(self, solicitudes):
+        """Guarda los IDs de solicitud de redes P2P para convertirlos tras la asignación"""
+        with self._lock:
+            self.solicitudes_p2p.extend(solicitudes)
+
+    def registrar_vlan(self, vlan_id, vlan_nombre, mascara, solicitudes):
+        """Guarda las solicitudes de combos de una VLAN"""
+        with self._lock:
+            self.vlans_info.append((vlan_id, vlan_nombre, mascara, list(solicitudes)))
+
+    def excluir_reservas(self, registro, sesion=None):
+        """Excluye del pool lo que otras sesiones tienen reservado en el registro global"""
+        dm = self.diagonal_manager
+        dm.excluir_rangos(registro.rangos_ocupados(excluir_sesion=sesion, inicio=dm.pool.inicio, fin=dm.pool.fin))
+
+    @classmethod
+    def desde_estado(cls, estado, verbose=False):
+        """
+        Reconstruye el contexto de una sesión guardada con todas sus redes ya
+        asignadas, listo para asignar o liberar combos de forma incremental.
+        """
+        datos = estado["datos_iniciales"]
+        calculada = estado["config_calculada"]
+        progreso = estado["progreso_routers"]
+        contexto = cls(
+            datos["base_ip"], verbose=verbose,
+            estrategia=datos.get("estrategia_asignacion", ESTRATEGIA_SECUENCIAL),
+            prefijo_pool=datos.get("prefijo_pool")
+        )
+        dm = contexto.diagonal_manager
+        for r_str, (red, mascara) in calculada.get("bloques_por_router", {}).items():
+            dm.bloques_por_dominio[int(r_str)] = (red, int(mascara))
+
+        # Router dueño de cada red (para devolverla a su bloque al liberarla)
+        dueno = {}
+        for r_str, vlans in progreso.get("vlans_por_router", {}).items():
+            for red, mascara in vlans.values():
+                dueno[(red, int(mascara))] = int(r_str)
+        for r_str, datos_swc3 in progreso.get("config_swc3", {}).items():
+            red, mascara = datos_swc3["red_hacia_router"]
+            dueno[(red, int(mascara))] = int(r_str)
+
+        registradas = set()
+        def registrar(red, mascara, descripcion):
+            registradas.add((red, int(mascara)))
+            return dm.registrar_asignacion_existente(red, int(mascara), descripcion, dueno.get((red, int(mascara))))
+
+        nombres = calculada.get("vlans_nombres", {})
+        for vlan_id, combos in calculada.get("vlans_con_combos", []):
+            solicitudes = [registrar(red, mascara, f"VLAN {vlan_id} Combo-{j+1}") for j, (red, mascara) in enumerate(combos)]
+            mascara_vlan = int(combos[0][1]) if combos else None
+            contexto.vlans_info.append((vlan_id, nombres.get(str(vlan_id), nombres.get(vlan_id)), mascara_vlan, solicitudes))
+
+        for j, (red, mascara) in enumerate(calculada.get("redes_p2p_disponibles", [])):
+            contexto.solicitudes_p2p.append(registrar(red, mascara, f"Red P2P {j+1}"))
+        for conn_key, datos_conn in progreso.get("todas_las_conexiones", {}).items():
+            red, mascara = (datos_conn["red"], datos_conn["mascara"]) if isinstance(datos_conn, dict) else datos_conn
+            if (red, int(mascara)) not in registradas:
+                contexto.solicitudes_p2p.append(registrar(red, mascara, f"Enlace WAN {conn_key}"))
+        return contexto
@@ -2,35 +2,101 @@
 Gestión de diagonales para asignación secuencial de IPs
 Implementa "mejor ajuste" asignando primero redes más grandes (máscaras numéricamente mayores)
 """
+import bisect
 import ipaddress
-from collections import defaultdict
+import threading
+from collections import Counter, defaultdict
+from estrategias_asignacion import ESTRATEGIA_SECUENCIAL, AsignadorBuddy, PrimerAjuste, obtener_estrategia
+from pool_direcciones import PoolDirecciones, EspacioInsuficienteError
 
 class DiagonalManager:
     """Maneja la asignación de IPs usando el sistema de diagonales secuencial"""
     
-    def __init__(self, base_ip):
+    def __init__(self, base_ip, verbose=True, estrategia=ESTRATEGIA_SECUENCIAL, prefijo_pool=None):
         self.base_ip = base_ip
+        self.verbose = verbose
+        self.estrategia = obtener_estrategia(estrategia)  # Nombre o instancia (ver estrategias_asignacion)
         self.base_ip_int = int(ipaddress.IPv4Address(base_ip))
         
+        # Espacio del que pueden salir las asignaciones (por defecto, el bloque natural de la IP base)
+        if prefijo_pool is None:
+            self.pool = PoolDirecciones.por_defecto(base_ip)
+        else:
+            self.pool = PoolDirecciones(base_ip, prefijo_pool)
+        self.cantidades_por_mascara = Counter()  # {mascara: combos solicitados}
+        
         # Sistema de dos fases: recopilación y asignación
         self.solicitudes_pendientes = []  # [(mascara, descripcion, id_solicitud)]
         self.combos_asignados = {}  # {id_solicitud: (red, mascara)}
-        self.espacio_ocupado = []  # [(inicio, fin, mascara)] ordenado
+        self._solicitud_por_red = {}  # {(red, mascara): id_solicitud} para liberar_red
+        self._ocupado = set()  # {(inicio, fin, mascara)}: altas y bajas en O(1)
+        self._ocupado_ordenado = None  # Vista ordenada de _ocupado; None si hay que rehacerla
+        self.rangos_excluidos = set()  # Entradas de espacio_ocupado que no son de esta sesión
         self.siguiente_id = 0
         self.fase_recopilacion = True
         
-        print(f"Sistema secuencial inicializado con IP base: {base_ip}")
+        # Estrategia jerárquica: dominio de cada solicitud y bloque reservado por dominio
+        self.dominio_por_solicitud = {}  # {id_solicitud: dominio}
+        self.bloques_por_dominio = {}  # {dominio: (red, mascara)}
+        
+        # Asignación incremental tras el lote: un AsignadorBuddy por dominio con bloque
+        # y otro (clave None) para el resto del pool; se construyen al primer uso
+        self._asignadores = None
+        
+        # Estado del algoritmo anterior (obtener_siguiente_combo)
+        self.combos_usados = {}
+        self.puntero_por_mascara = {}
         
-    def solicitar_combo(self, mascara, descripcion=""):
-        """Solicita un combo - en fase de recopilación solo registra"""
-        if self.fase_recopilacion:
+        # Protege solicitudes y asignaciones cuando varios hilos comparten el manejador
+        self._lock = threading.RLock()
+        
+        self._log(f"Sistema secuencial inicializado con IP base: {base_ip}")
+        
+    def _log(self, mensaje):
+        """Imprime solo en modo detallado (el procesamiento por lotes lo desactiva)"""
+        if self.verbose:
+            print(mensaje)
+    
+    def solicitar_combo(self, mascara, descripcion="", dominio=None):
+        """
+        Solicita un combo - en fase de recopilación solo registra; después del
+        lote lo asigna en el momento (ver _asignar_incremental).
+        dominio (p. ej. el número de router) agrupa los combos en un mismo
+        bloque con la estrategia jerárquica; None = espacio compartido.
+        """
+        with self._lock:
+            if not self.fase_recopilacion:
+                return self._asignar_incremental(mascara, descripcion, dominio)
             solicitud_id = self.siguiente_id
             self.solicitudes_pendientes.append((mascara, descripcion, solicitud_id))
+            self.cantidades_por_mascara[mascara] += 1
+            if dominio is not None:
+                self.dominio_por_solicitud[solicitud_id] = dominio
             self.siguiente_id += 1
-            print(f"Solicitud #{solicitud_id}: /{mascara} - {descripcion}")
-            return solicitud_id
-        else:
-            raise Exception("Ya se completó la fase de asignación")
+        self._log(f"Solicitud #{solicitud_id}: /{mascara} - {descripcion}")
+        return solicitud_id
+    
+    def excluir_rangos(self, rangos):
+        """
+        Marca como ocupados rangos ajenos a la sesión, p. ej. los de otras sesiones
+        del registro global (ver registro_global.py). Solo se tienen en cuenta los
+        que tocan el pool; ninguna estrategia colocará combos encima.
+        
+        Args:
+            rangos: [(inicio, fin, mascara)] con direcciones enteras
+        """
+        with self._lock:
+            nuevos = 0
+            for inicio, fin, mascara in rangos:
+                if fin < self.pool.inicio or inicio > self.pool.fin or (inicio, fin, mascara) in self.rangos_excluidos:
+                    continue
+                self.rangos_excluidos.add((inicio, fin, mascara))
+                self._agregar_espacio_ocupado(inicio, fin, mascara)
+                self.pool.excluir(inicio, fin)
+                nuevos += 1
+            if nuevos:
+                self._asignadores = None  # Las listas libres ya no reflejan el pool
+        self._log(f"Rangos excluidos del pool {self.pool}: {len(self.rangos_excluidos)}")
     
     def obtener_siguiente_combo(self, mascara):
         """
@@ -38,13 +104,7 @@ class DiagonalManager:
         Para el sistema secuencial, usa solicitar_combo() + procesar_asignaciones()
         """
         # Para mantener compatibilidad temporal, usar el algoritmo anterior
-        if hasattr(self, 'combos_usados'):
-            # Sistema anterior para compatibilidad inmediata
-            return self._obtener_combo_antiguo(mascara)
-        else:
-            # Inicializar sistema anterior para compatibilidad
-            self.combos_usados = {}
-            self.puntero_por_mascara = {}
+        with self._lock:
             return self._obtener_combo_antiguo(mascara)
     
     def _obtener_combo_antiguo(self, mascara):
@@ -59,9 +119,11 @@ class DiagonalManager:
         inicio_combo = self.base_ip_int + (combo_num * tamano_combo)
         red_combo = str(ipaddress.IPv4Address(inicio_combo))
         
+        self.pool.comprobar_rango(inicio_combo, mascara)
         while self._hay_solapamiento_antiguo(inicio_combo, inicio_combo + tamano_combo - 1):
             combo_num += 1
             inicio_combo = self.base_ip_int + (combo_num * tamano_combo)
+            self.pool.comprobar_rango(inicio_combo, mascara)
             red_combo = str(ipaddress.IPv4Address(inicio_combo))
         
         self.combos_usados[mascara].append(combo_num)
@@ -80,83 +142,243 @@ class DiagonalManager:
                     return True
         return False
     
-    def procesar_asignaciones(self):
-        """Procesa todas las solicitudes de manera secuencial optimizada"""
+    def verificar_capacidad(self, estrategia=None):
+        """
+        Comprueba, sin asignar, si las solicitudes pendientes caben en el pool
+        (ver PoolDirecciones.verificar) con los bloques que coloca la estrategia.
+        """
+        with self._lock:
+            estrategia = obtener_estrategia(estrategia) if estrategia else self.estrategia
+            return self.pool.verificar(estrategia.cantidades_a_colocar(self))
+    
+    def procesar_asignaciones(self, estrategia=None):
+        """
+        Procesa todas las solicitudes de manera secuencial optimizada.
+        estrategia (nombre o instancia) sustituye solo en esta llamada a la del constructor.
+        """
+        with self._lock:
+            self._procesar_asignaciones(obtener_estrategia(estrategia) if estrategia else self.estrategia)
+    
+    def _procesar_asignaciones(self, estrategia):
         if not self.fase_recopilacion:
-            print("⚠️ Ya se procesaron las asignaciones")
+            self._log("⚠️ Ya se procesaron las asignaciones")
             return
             
-        print(f"\nPROCESANDO {len(self.solicitudes_pendientes)} SOLICITUDES SECUENCIALMENTE")
-        print("=" * 70)
+        self._log(f"\nPROCESANDO {len(self.solicitudes_pendientes)} SOLICITUDES SECUENCIALMENTE")
+        self._log("=" * 70)
         
         # Mostrar resumen de solicitudes
         solicitudes_por_mascara = defaultdict(list)
         for mascara, desc, sol_id in self.solicitudes_pendientes:
             solicitudes_por_mascara[mascara].append((desc, sol_id))
         
-        print("Solicitudes por mascara:")
+        self._log("Solicitudes por mascara:")
         for mascara in sorted(solicitudes_por_mascara.keys(), reverse=True):
             cantidad = len(solicitudes_por_mascara[mascara])
             hosts = 2 ** (32 - mascara)
-            print(f"   /{mascara}: {cantidad} solicitudes ({hosts} hosts cada una)")
+            self._log(f"   /{mascara}: {cantidad} solicitudes ({hosts} hosts cada una)")
+        
+        # Comprobación de capacidad antes de colocar nada
+        capacidad = self.pool.exigir_capacidad(estrategia.cantidades_a_colocar(self))
+        self._log(f"\nPool {self.pool}: se necesitan {capacidad['necesario']} de {capacidad['disponible']} direcciones "
+                  f"(mínimo /{capacidad['prefijo_minimo']}, holgura {capacidad['holgura']})")
         
-        print("\nProcesando en orden: MASCARAS GRANDES -> PEQUENAS")
-        print("=" * 70)
+        self._log("\nProcesando en orden: MASCARAS GRANDES -> PEQUENAS")
+        self._log("=" * 70)
         
         # Ordenar por máscara (grandes primero: /30, /29, /28, ... /24, /23, etc.)
         solicitudes_ordenadas = sorted(self.solicitudes_pendientes, 
                                      key=lambda x: x[0], reverse=True)
         
-        # Asignar secuencialmente
-        for mascara, descripcion, solicitud_id in solicitudes_ordenadas:
-            red_asignada = self._asignar_combo_optimizado(mascara)
-            self.combos_asignados[solicitud_id] = (red_asignada, mascara)
-            
-            # Mostrar asignación
-            red_obj = ipaddress.IPv4Network(f"{red_asignada}/{mascara}")
-            fin_ip = str(red_obj.broadcast_address)
-            print(f"   OK #{solicitud_id:2d}: {red_asignada} - {fin_ip} (/{mascara}) | {descripcion}")
+        self._log(f"Estrategia de colocación: {estrategia.nombre}")
+        estrategia.asignar(self, solicitudes_ordenadas)
         
         self.fase_recopilacion = False
-        print(f"\nASIGNACION SECUENCIAL COMPLETADA")
+        self._log(f"\nASIGNACION SECUENCIAL COMPLETADA")
         self._mostrar_resumen()
     
+    def _registrar_asignacion(self, solicitud_id, red_asignada, mascara, descripcion):
+        """Guarda y muestra la red asignada a una solicitud"""
+        self.combos_asignados[solicitud_id] = (red_asignada, mascara)
+        self._solicitud_por_red[(red_asignada, mascara)] = solicitud_id
+        if self.verbose:
+            red_obj = ipaddress.IPv4Network(f"{red_asignada}/{mascara}")
+            fin_ip = str(red_obj.broadcast_address)
+            self._log(f"   OK #{solicitud_id:2d}: {red_asignada} - {fin_ip} (/{mascara}) | {descripcion}")
+    
+    def obtener_bloque_dominio(self, dominio):
+        """Obtiene el bloque (red, mascara) reservado para un dominio, o None"""
+        with self._lock:
+            return self.bloques_por_dominio.get(dominio)
+    
     def _asignar_combo_optimizado(self, mascara):
-        """Asigna un combo de manera optimizada evitando fragmentación"""
-        tamano_combo = 2 ** (32 - mascara)
-        combo_num = 1  # Empezar desde el segundo combo
+        """Asigna un combo de manera optimizada evitando fragmentación (primer ajuste)"""
+        inicio_combo = PrimerAjuste().colocar(self, mascara)
+        self._agregar_espacio_ocupado(inicio_combo, inicio_combo + 2 ** (32 - mascara) - 1, mascara)
+        return str(ipaddress.IPv4Address(inicio_combo))
+    
+    def _construir_asignadores(self):
+        """
+        Crea las listas libres del sistema buddy a partir de lo ya asignado.
+        Cada bloque de dominio tiene su propio asignador (sus huecos no se
+        ceden a otros dominios) y el resto del pool va al asignador global.
+        La IP base sigue sin asignarse nunca.
+        """
+        bloques = {}
+        for dominio, (red, mascara) in self.bloques_por_dominio.items():
+            inicio = int(ipaddress.IPv4Address(red))
+            bloques[dominio] = (inicio, inicio + 2 ** (32 - mascara) - 1, mascara)
         
-        while True:
-            inicio_combo = self.base_ip_int + (combo_num * tamano_combo)
-            fin_combo = inicio_combo + tamano_combo - 1
-            
-            if not self._hay_solapamiento(inicio_combo, fin_combo):
-                red_combo = str(ipaddress.IPv4Address(inicio_combo))
-                self._agregar_espacio_ocupado(inicio_combo, fin_combo, mascara)
-                return red_combo
+        self._asignadores = {None: AsignadorBuddy(self.base_ip_int, self.pool.prefijo)}
+        for dominio, (inicio, _, mascara) in bloques.items():
+            self._asignadores[dominio] = AsignadorBuddy(inicio, mascara)
+        
+        # Huecos de cada región: complemento de lo ocupado (y, en la global, de los bloques)
+        regiones = [(None, self.base_ip_int + 1, self.pool.fin, sorted(self.espacio_ocupado + list(bloques.values())))]
+        for dominio, (inicio, fin, _) in bloques.items():
+            regiones.append((dominio, inicio, fin, self.espacio_ocupado))
+        for dominio, inicio_region, fin_region, ocupados in regiones:
+            cursor = inicio_region
+            for ocupado_inicio, ocupado_fin, _ in ocupados:
+                if ocupado_fin < inicio_region or ocupado_inicio > fin_region:
+                    continue
+                if ocupado_inicio > cursor:
+                    self._asignadores[dominio].liberar_rango(cursor, ocupado_inicio - 1)
+                cursor = max(cursor, ocupado_fin + 1)
+            if cursor <= fin_region:
+                self._asignadores[dominio].liberar_rango(cursor, fin_region)
+        self._ocupado_ordenado = None  # A partir de aquí las altas y bajas van al buddy
+    
+    def _asignador_de(self, dominio):
+        """Asignador incremental de un dominio (el global si no tiene bloque propio)"""
+        if self._asignadores is None:
+            self._construir_asignadores()
+        return self._asignadores.get(dominio, self._asignadores[None])
+    
+    def _asignar_incremental(self, mascara, descripcion, dominio):
+        """
+        Asigna un combo después del lote, dentro del bloque de su dominio si lo
+        tiene: O(log n) en el sistema buddy más O(1) para anotar el rango. La
+        primera llamada tras reconstruir el manejador paga _construir_asignadores
+        (O(n log n)).
+        """
+        inicio = self._asignador_de(dominio).tomar(mascara)
+        if inicio is None:
+            lugar = f"el bloque del dominio {dominio}" if dominio in self.bloques_por_dominio else f"el pool {self.pool}"
+            raise EspacioInsuficienteError(f"No queda espacio para un /{mascara} en {lugar}")
+        
+        solicitud_id = self.siguiente_id
+        self.siguiente_id += 1
+        self.solicitudes_pendientes.append((mascara, descripcion, solicitud_id))
+        self.cantidades_por_mascara[mascara] += 1
+        if dominio is not None:
+            self.dominio_por_solicitud[solicitud_id] = dominio
+        self._agregar_espacio_ocupado(inicio, inicio + 2 ** (32 - mascara) - 1, mascara)
+        self._registrar_asignacion(solicitud_id, str(ipaddress.IPv4Address(inicio)), mascara, descripcion)
+        return solicitud_id
+    
+    def registrar_asignacion_existente(self, red, mascara, descripcion="", dominio=None):
+        """
+        Registra una red ya asignada (p. ej. al reconstruir el manejador desde una
+        sesión guardada) y da por cerrada la fase de recopilación.
+        """
+        with self._lock:
+            inicio = int(ipaddress.IPv4Address(red))
+            solicitud_id = self.siguiente_id
+            self.siguiente_id += 1
+            self.fase_recopilacion = False
+            self._asignadores = None  # Se reconstruyen con el nuevo rango ocupado
+            self.solicitudes_pendientes.append((mascara, descripcion, solicitud_id))
+            self.cantidades_por_mascara[mascara] += 1
+            if dominio is not None:
+                self.dominio_por_solicitud[solicitud_id] = dominio
+            self._agregar_espacio_ocupado(inicio, inicio + 2 ** (32 - mascara) - 1, mascara)
+            self.combos_asignados[solicitud_id] = (red, mascara)
+            self._solicitud_por_red[(red, mascara)] = solicitud_id
+            return solicitud_id
+    
+    def liberar_combo(self, solicitud_id):
+        """
+        Libera un combo. Antes del lote retira la solicitud; después devuelve su
+        bloque al sistema buddy, que lo fusiona con su buddy si también está libre.
+        
+        Returns:
+            tuple: (red, mascara) liberada, o None si la solicitud no existía
+        """
+        with self._lock:
+            if self.fase_recopilacion:
+                for posicion, (mascara, _, s_id) in enumerate(self.solicitudes_pendientes):
+                    if s_id == solicitud_id:
+                        del self.solicitudes_pendientes[posicion]
+                        self.cantidades_por_mascara[mascara] -= 1
+                        self.dominio_por_solicitud.pop(solicitud_id, None)
+                        return None
+                return None
             
-            combo_num += 1
+            if solicitud_id not in self.combos_asignados:
+                return None
+            red, mascara = self.combos_asignados.pop(solicitud_id)
+            self._solicitud_por_red.pop((red, mascara), None)
+            inicio = int(ipaddress.IPv4Address(red))
+            dominio = self.dominio_por_solicitud.pop(solicitud_id, None)
+            asignador = self._asignador_de(dominio)  # Construye las listas libres antes de retirar el rango
+            self._quitar_espacio_ocupado(inicio, inicio + 2 ** (32 - mascara) - 1, mascara)
+            self.cantidades_por_mascara[mascara] -= 1
+            asignador.liberar(inicio, mascara)
+        self._log(f"Liberado #{solicitud_id}: {red}/{mascara}")
+        return red, mascara
+    
+    @property
+    def espacio_ocupado(self):
+        """
+        Rangos ocupados [(inicio, fin, mascara)] ordenados. La vista se crea al
+        pedirla (estrategias del lote, _construir_asignadores) y se mantiene
+        mientras exista; la fase incremental la descarta y solo toca el conjunto.
+        """
+        if self._ocupado_ordenado is None:
+            self._ocupado_ordenado = sorted(self._ocupado)
+        return self._ocupado_ordenado
+    
+    def liberar_red(self, red, mascara):
+        """Libera por su dirección una red ya asignada (ver liberar_combo); None si no lo estaba"""
+        with self._lock:
+            solicitud_id = self._solicitud_por_red.get((red, mascara))
+            if solicitud_id is None:
+                return None
+            return self.liberar_combo(solicitud_id)
     
     def _hay_solapamiento(self, inicio, fin):
         """Verifica solapamiento con rangos ya asignados"""
-        for ocupado_inicio, ocupado_fin, _ in self.espacio_ocupado:
+        for ocupado_inicio, ocupado_fin, _ in self._ocupado:
             if not (fin < ocupado_inicio or inicio > ocupado_fin):
                 return True
         return False
     
     def _agregar_espacio_ocupado(self, inicio, fin, mascara):
-        """Agrega un rango al espacio ocupado manteniendo orden"""
-        self.espacio_ocupado.append((inicio, fin, mascara))
-        self.espacio_ocupado.sort(key=lambda x: x[0])
+        """Agrega un rango al espacio ocupado (O(1), más la vista ordenada si existe)"""
+        self._ocupado.add((inicio, fin, mascara))
+        if self._ocupado_ordenado is not None:
+            bisect.insort(self._ocupado_ordenado, (inicio, fin, mascara))
+    
+    def _quitar_espacio_ocupado(self, inicio, fin, mascara):
+        """Retira un rango del espacio ocupado (O(1), más la vista ordenada si existe)"""
+        if (inicio, fin, mascara) not in self._ocupado:
+            return
+        self._ocupado.remove((inicio, fin, mascara))
+        if self._ocupado_ordenado is not None:
+            del self._ocupado_ordenado[bisect.bisect_left(self._ocupado_ordenado, (inicio, fin, mascara))]
     
     def obtener_combo_asignado(self, solicitud_id):
         """Obtiene la red asignada para una solicitud específica"""
-        return self.combos_asignados.get(solicitud_id)
+        with self._lock:
+            return self.combos_asignados.get(solicitud_id)
     
     def _mostrar_resumen(self):
         """Muestra resumen organizado por diagonal"""
-        print("\nRESUMEN POR DIAGONAL:")
-        print("=" * 70)
+        if not self.verbose:
+            return
+        self._log("\nRESUMEN POR DIAGONAL:")
+        self._log("=" * 70)
         
         # Agrupar por máscara
         por_mascara = defaultdict(list)
@@ -165,7 +387,7 @@ class DiagonalManager:
             fin_ip = str(ipaddress.IPv4Address(fin))
             
             # Buscar descripción
-            descripcion = "Desconocido"
+            descripcion = "Excluido (otra sesión)" if (inicio, fin, mascara) in self.rangos_excluidos else "Desconocido"
             for sol_id, (red, mask) in self.combos_asignados.items():
                 if red == inicio_ip and mask == mascara:
                     # Buscar en solicitudes originales
@@ -180,9 +402,9 @@ class DiagonalManager:
         # Mostrar ordenado por máscara (grandes primero)
         for mascara in sorted(por_mascara.keys(), reverse=True):
             asignaciones = por_mascara[mascara]
-            print(f"\nDIAGONAL /{mascara}:")
+            self._log(f"\nDIAGONAL /{mascara}:")
             for inicio, fin, desc in asignaciones:
-                print(f"   {desc:25s} | {inicio} - {fin} (/{mascara})")
+                self._log(f"   {desc:25s} | {inicio} - {fin} (/{mascara})")
         
-        print("=" * 70)
-        print(f"Total asignado: {len(self.espacio_ocupado)} redes")
+        self._log("=" * 70)
+        self._log(f"Total asignado: {len(self._ocupado) - len(self.rangos_excluidos)} redes")
@@ -0,0 +1,283 @@
+"""
+Estrategias de colocación para DiagonalManager.procesar_asignaciones()
+
+Cada estrategia recibe el manejador y sus solicitudes ya ordenadas
+(máscaras grandes primero) y registra las redes con los métodos del propio
+manejador. Todas respetan la misma regla que el sistema secuencial original:
+las direcciones se alinean respecto a la IP base y ningún combo contiene la
+IP base.
+
+    primer_ajuste  Primer hueco alineado desde el combo 1 (sistema secuencial original)
+    mejor_ajuste   Hueco libre más pequeño en el que cabe el combo alineado
+    buddy          Sistema buddy binario: se divide el menor bloque libre suficiente
+    jerarquica     Un bloque alineado por dominio (router) y sus combos dentro
+"""
+import heapq
+from collections import Counter, defaultdict
+from ip_utils import entero_a_ip
+
+ESTRATEGIA_SECUENCIAL = "secuencial"  # Nombre histórico de primer_ajuste
+ESTRATEGIA_PRIMER_AJUSTE = "primer_ajuste"
+ESTRATEGIA_MEJOR_AJUSTE = "mejor_ajuste"
+ESTRATEGIA_BUDDY = "buddy"
+ESTRATEGIA_JERARQUICA = "jerarquica"
+
+def _tamano(mascara):
+    return 1 << (32 - mascara)
+
+def _alinear(dm, direccion, tamano):
+    """Primera dirección >= direccion alineada a tamano respecto a la IP base"""
+    desplazamiento = direccion - dm.base_ip_int
+    return dm.base_ip_int + -(-desplazamiento // tamano) * tamano
+
+class EstrategiaAsignacion:
+    """Base: coloca cada solicitud por separado con colocar()"""
+
+    nombre = ""
+
+    def colocar(self, dm, mascara):
+        """Devuelve la dirección (entero) donde colocar un combo /mascara"""
+        raise NotImplementedError
+
+    def cantidades_a_colocar(self, dm):
+        """{mascara: bloques} que la estrategia coloca en el pool: lo que comprueba PoolDirecciones.verificar()"""
+        return dm.cantidades_por_mascara
+
+    def asignar(self, dm, solicitudes_ordenadas):
+        for mascara, descripcion, solicitud_id in solicitudes_ordenadas:
+            inicio = self.colocar(dm, mascara)
+            dm._agregar_espacio_ocupado(inicio, inicio + _tamano(mascara) - 1, mascara)
+            dm._registrar_asignacion(solicitud_id, entero_a_ip(inicio), mascara, descripcion)
+
+class PrimerAjuste(EstrategiaAsignacion):
+    """Primer combo libre de la diagonal, empezando en el combo 1"""
+
+    nombre = ESTRATEGIA_PRIMER_AJUSTE
+
+    def colocar(self, dm, mascara):
+        tamano = _tamano(mascara)
+        inicio = dm.base_ip_int + tamano  # Empezar desde el segundo combo
+        while True:
+            dm.pool.comprobar_rango(inicio, mascara)  # Acota la búsqueda al pool
+            if not dm._hay_solapamiento(inicio, inicio + tamano - 1):
+                return inicio
+            inicio += tamano
+
+class MejorAjuste(EstrategiaAsignacion):
+    """Hueco libre más pequeño que admite el combo alineado (el último hueco es ilimitado)"""
+
+    nombre = ESTRATEGIA_MEJOR_AJUSTE
+
+    def colocar(self, dm, mascara):
+        tamano = _tamano(mascara)
+        minimo = dm.base_ip_int + tamano
+        mejor = None  # (tamano_hueco, inicio)
+        cursor = dm.base_ip_int
+        for ocupado_inicio, ocupado_fin, _ in dm.espacio_ocupado:
+            if ocupado_inicio > cursor:
+                inicio = _alinear(dm, max(cursor, minimo), tamano)
+                if inicio + tamano - 1 < ocupado_inicio:
+                    hueco = ocupado_inicio - cursor
+                    if mejor is None or hueco < mejor[0]:
+                        mejor = (hueco, inicio)
+            cursor = max(cursor, ocupado_fin + 1)
+        inicio = mejor[1] if mejor is not None else _alinear(dm, max(cursor, minimo), tamano)
+        dm.pool.comprobar_rango(inicio, mascara)
+        return inicio
+
+class AsignadorBuddy:
+    """
+    Listas libres del sistema buddy: un conjunto y un montículo por prefijo.
+
+    Los bloques se alinean respecto a base dentro de una raíz /prefijo_raiz.
+    tomar() y liberar() recorren como mucho un nivel por bit de prefijo y cada
+    nivel cuesta O(log n) (montículo con borrado diferido), así que ambas
+    operaciones son logarítmicas. liberar() fusiona el bloque con su buddy
+    mientras este también esté libre.
+    """
+
+    def __init__(self, base, prefijo_raiz):
+        self.base = base
+        self.prefijo_raiz = prefijo_raiz
+        self.libres = defaultdict(set)  # {prefijo: {inicio}}
+        self.monticulos = defaultdict(list)  # {prefijo: [inicio]} (puede tener entradas ya retiradas)
+
+    def _agregar(self, inicio, prefijo):
+        self.libres[prefijo].add(inicio)
+        heapq.heappush(self.monticulos[prefijo], inicio)
+
+    def _sacar_menor(self, prefijo):
+        """Retira y devuelve el bloque libre más bajo de un prefijo, o None"""
+        libres = self.libres[prefijo]
+        monticulo = self.monticulos[prefijo]
+        while monticulo:
+            inicio = heapq.heappop(monticulo)
+            if inicio in libres:
+                libres.discard(inicio)
+                return inicio
+        return None
+
+    def tomar(self, mascara):
+        """Reserva el bloque /mascara más bajo posible; None si no hay espacio en la raíz"""
+        for prefijo in range(mascara, self.prefijo_raiz - 1, -1):
+            inicio = self._sacar_menor(prefijo)
+            if inicio is not None:
+                # Dividir hasta el tamaño pedido, dejando libre la mitad superior
+                for hijo in range(prefijo + 1, mascara + 1):
+                    self._agregar(inicio + _tamano(hijo), hijo)
+                return inicio
+        return None
+
+    def liberar(self, inicio, mascara):
+        """Devuelve un bloque y lo fusiona con su buddy mientras sea posible"""
+        while mascara > self.prefijo_raiz:
+            buddy = self.base + ((inicio - self.base) ^ _tamano(mascara))
+            if buddy not in self.libres[mascara]:
+                break
+            self.libres[mascara].discard(buddy)  # Su entrada del montículo se descarta al salir
+            inicio = min(inicio, buddy)
+            mascara -= 1
+        self._agregar(inicio, mascara)
+
+    def liberar_rango(self, inicio, fin):
+        """Marca libre [inicio, fin] como bloques alineados maximales"""
+        tamano_raiz = _tamano(self.prefijo_raiz)
+        while inicio <= fin:
+            desplazamiento = inicio - self.base
+            alineacion = desplazamiento & -desplazamiento if desplazamiento else tamano_raiz
+            tamano = min(alineacion, tamano_raiz, 1 << ((fin - inicio + 1).bit_length() - 1))
+            self.liberar(inicio, 32 - (tamano.bit_length() - 1))
+            inicio += tamano
+
+class Buddy(EstrategiaAsignacion):
+    """
+    Sistema buddy binario sobre un bloque raíz anclado en la IP base.
+
+    Cada combo toma el menor bloque libre que lo contiene y lo divide por
+    mitades; si no hay ninguno, la raíz dobla su tamaño. El primer bloque de
+    la unidad mínima se reserva para no usar la IP base.
+    """
+
+    nombre = ESTRATEGIA_BUDDY
+
+    def asignar(self, dm, solicitudes_ordenadas):
+        if not solicitudes_ordenadas:
+            return
+        unidad = max(mascara for mascara, _, _ in solicitudes_ordenadas)
+        total = _tamano(unidad) + sum(_tamano(mascara) for mascara, _, _ in solicitudes_ordenadas)
+        self.asignador = AsignadorBuddy(dm.base_ip_int, 32 - (total - 1).bit_length())
+        self._liberar_huecos(dm, dm.base_ip_int, dm.base_ip_int + _tamano(self.asignador.prefijo_raiz) - 1)
+
+        self.colocar(dm, unidad)  # Reserva de la IP base
+        super().asignar(dm, solicitudes_ordenadas)
+
+    def _liberar_huecos(self, dm, inicio, fin):
+        """Marca libre [inicio, fin] salvo lo que ya ocupe el manejador (rangos excluidos)"""
+        cursor = inicio
+        for ocupado_inicio, ocupado_fin, _ in dm.espacio_ocupado:
+            if ocupado_fin < inicio or ocupado_inicio > fin:
+                continue
+            if ocupado_inicio > cursor:
+                self.asignador.liberar_rango(cursor, ocupado_inicio - 1)
+            cursor = max(cursor, ocupado_fin + 1)
+        if cursor <= fin:
+            self.asignador.liberar_rango(cursor, fin)
+
+    def colocar(self, dm, mascara):
+        while True:
+            inicio = self.asignador.tomar(mascara)
+            if inicio is not None:
+                dm.pool.comprobar_rango(inicio, mascara)
+                return inicio
+            # Sin bloque suficiente: la raíz dobla su tamaño (su mitad nueva, salvo lo excluido, queda libre)
+            dm.pool.comprobar_rango(dm.base_ip_int, self.asignador.prefijo_raiz - 1)
+            tamano_raiz = _tamano(self.asignador.prefijo_raiz)
+            self.asignador.prefijo_raiz -= 1
+            self._liberar_huecos(dm, dm.base_ip_int + tamano_raiz, dm.base_ip_int + 2 * tamano_raiz - 1)
+
+class Jerarquica(EstrategiaAsignacion):
+    """
+    Reserva un bloque alineado por dominio y empaqueta dentro sus combos.
+
+    Cada bloque mide la suma de sus combos redondeada a potencia de 2, de
+    modo que un solo prefijo resume todas las redes del dominio. Los bloques
+    y las solicitudes sin dominio (enlaces WAN) se colocan juntos con la
+    estrategia de colocación indicada; dentro del bloque los combos van de
+    mayor a menor, con lo que quedan contiguos y alineados.
+    """
+
+    nombre = ESTRATEGIA_JERARQUICA
+
+    def __init__(self, colocacion=None):
+        self.colocacion = colocacion or PrimerAjuste()
+
+    @staticmethod
+    def _elementos(dm, solicitudes):
+        """
+        Lo que se coloca en el espacio global: un bloque por dominio (suma de
+        sus combos redondeada a potencia de 2) y cada solicitud compartida.
+
+        Returns:
+            tuple: ([(mascara, dominio, solicitud)] de mayor a menor máscara,
+                    {dominio: [solicitud]})
+        """
+        por_dominio = defaultdict(list)
+        compartidas = []
+        for solicitud in solicitudes:
+            dominio = dm.dominio_por_solicitud.get(solicitud[2])
+            if dominio is None:
+                compartidas.append(solicitud)
+            else:
+                por_dominio[dominio].append(solicitud)
+
+        elementos = []
+        for dominio, solicitudes_dominio in por_dominio.items():
+            total = sum(_tamano(mascara) for mascara, _, _ in solicitudes_dominio)
+            elementos.append((32 - (total - 1).bit_length(), dominio, None))
+        elementos.extend((solicitud[0], None, solicitud) for solicitud in compartidas)
+        elementos.sort(key=lambda x: x[0], reverse=True)
+        return elementos, por_dominio
+
+    def cantidades_a_colocar(self, dm):
+        return Counter(mascara for mascara, _, _ in self._elementos(dm, dm.solicitudes_pendientes)[0])
+
+    def asignar(self, dm, solicitudes_ordenadas):
+        # Fase 1: bloques de dominio y solicitudes compartidas en el espacio global
+        elementos, por_dominio = self._elementos(dm, solicitudes_ordenadas)
+
+        bloques = {}  # {dominio: (inicio, mascara)}
+        for mascara, dominio, solicitud in elementos:
+            inicio = self.colocacion.colocar(dm, mascara)
+            dm._agregar_espacio_ocupado(inicio, inicio + _tamano(mascara) - 1, mascara)
+            if solicitud is None:
+                bloques[dominio] = (inicio, mascara)
+                dm.bloques_por_dominio[dominio] = (entero_a_ip(inicio), mascara)
+                dm._log(f"   BLOQUE {dominio}: {entero_a_ip(inicio)}/{mascara} ({len(por_dominio[dominio])} combos)")
+            else:
+                dm._registrar_asignacion(solicitud[2], entero_a_ip(inicio), mascara, solicitud[1])
+
+        # Fase 2: sustituir cada bloque por sus combos, contiguos desde el inicio del bloque
+        for dominio, (inicio_bloque, mascara_bloque) in bloques.items():
+            dm._quitar_espacio_ocupado(inicio_bloque, inicio_bloque + _tamano(mascara_bloque) - 1, mascara_bloque)
+            inicio = inicio_bloque
+            for mascara, descripcion, solicitud_id in sorted(por_dominio[dominio], key=lambda x: x[0]):
+                dm._agregar_espacio_ocupado(inicio, inicio + _tamano(mascara) - 1, mascara)
+                dm._registrar_asignacion(solicitud_id, entero_a_ip(inicio), mascara, descripcion)
+                inicio += _tamano(mascara)
+
+ESTRATEGIAS_DISPONIBLES = {
+    ESTRATEGIA_SECUENCIAL: PrimerAjuste,
+    ESTRATEGIA_PRIMER_AJUSTE: PrimerAjuste,
+    ESTRATEGIA_MEJOR_AJUSTE: MejorAjuste,
+    ESTRATEGIA_BUDDY: Buddy,
+    ESTRATEGIA_JERARQUICA: Jerarquica
+}
+ESTRATEGIAS = tuple(ESTRATEGIAS_DISPONIBLES)
+
+def obtener_estrategia(estrategia):
+    """Devuelve una instancia de estrategia a partir de su nombre (o la propia instancia)"""
+    if isinstance(estrategia, EstrategiaAsignacion):
+        return estrategia
+    if estrategia not in ESTRATEGIAS_DISPONIBLES:
+        raise ValueError(f"Estrategia de asignación desconocida: {estrategia} (opciones: {', '.join(ESTRATEGIAS)})")
+    return ESTRATEGIAS_DISPONIBLES[estrategia]()
@@ -0,0 +1,104 @@
+"""
+Grabación y reproducción de respuestas del asistente interactivo
+
+GrabadorEntradas registra cada pregunta y respuesta de una ejecución (JSONL),
+marcando las respuestas que la validación rechazó. ReproductorEntradas
+devuelve solo las respuestas aceptadas, sin esperar al usuario: los bucles de
+reintento de la grabación se omiten. Si una respuesta grabada ya no valida, se
+registra en los fallos y la reproducción se detiene (el reintento leería la
+respuesta de la pregunta siguiente y desplazaría todas las demás).
+
+Uso:
+    python main.py --grabar respuestas.jsonl
+    python main.py --reproducir respuestas.jsonl
+"""
+import json
+import time
+
+class ReproduccionAgotada(EOFError):
+    """La ejecución pidió más respuestas de las grabadas"""
+
+class RespuestaRechazada(ReproduccionAgotada):
+    """Una respuesta grabada no pasó la validación y la reproducción no puede seguir"""
+
+class GrabadorEntradas:
+    """Lee de input() y guarda cada pregunta/respuesta en un archivo JSONL"""
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.entradas = []  # [{"pregunta", "respuesta", "valida"}]
+
+    def leer(self, mensaje):
+        respuesta = input(mensaje)
+        self.entradas.append({"pregunta": mensaje, "respuesta": respuesta, "valida": True})
+        return respuesta
+
+    def registrar_error(self, mensaje_error, respuestas_rechazadas=1):
+        for entrada in self.entradas[-respuestas_rechazadas:]:
+            entrada["valida"] = False
+            entrada["error"] = mensaje_error
+
+    def guardar(self):
+        with open(self.ruta, "w", encoding="utf-8") as f:
+            for entrada in self.entradas:
+                f.write(json.dumps(entrada, ensure_ascii=False) + "\n")
+        print(f"\n✅ {len(self.entradas)} respuestas grabadas en '{self.ruta}'.")
+
+class ReproductorEntradas:
+    """Devuelve las respuestas aceptadas de una grabación, a máxima velocidad"""
+
+    def __init__(self, ruta, mostrar=True):
+        self.ruta = ruta
+        self.mostrar = mostrar
+        with open(ruta, "r", encoding="utf-8") as f:
+            grabadas = [json.loads(linea) for linea in f if linea.strip()]
+        self.respuestas = [e for e in grabadas if e.get("valida", True)]
+        self.omitidas = len(grabadas) - len(self.respuestas)
+        self.posicion = 0
+        self.fallos = []  # [{"posicion", "pregunta", "respuesta", "error"}]
+        self.inicio = time.perf_counter()
+
+    def leer(self, mensaje):
+        if self.posicion >= len(self.respuestas):
+            raise ReproduccionAgotada(f"No quedan respuestas grabadas para: {mensaje.strip()}")
+
+        entrada = self.respuestas[self.posicion]
+        self.posicion += 1
+        if entrada["pregunta"] != mensaje:
+            self.fallos.append({
+                "posicion": self.posicion,
+                "pregunta": mensaje,
+                "respuesta": entrada["respuesta"],
+                "error": f"Pregunta distinta a la grabada: {entrada['pregunta'].strip()}"
+            })
+        if self.mostrar:
+            print(f"{mensaje}{entrada['respuesta']}")
+        return entrada["respuesta"]
+
+    def registrar_error(self, mensaje_error, respuestas_rechazadas=1):
+        inicio = max(0, self.posicion - respuestas_rechazadas)
+        for posicion in range(inicio, self.posicion):
+            entrada = self.respuestas[posicion]
+            self.fallos.append({
+                "posicion": posicion + 1,
+                "pregunta": entrada["pregunta"],
+                "respuesta": entrada["respuesta"],
+                "error": mensaje_error
+            })
+        raise RespuestaRechazada(f"Respuesta grabada rechazada en #{self.posicion}: {mensaje_error.strip()}")
+
+    def resumen(self):
+        """Muestra y devuelve el resultado de la reproducción"""
+        segundos = time.perf_counter() - self.inicio
+        print(f"\nREPRODUCCION DE '{self.ruta}'")
+        print("=" * 70)
+        print(f"   Respuestas usadas: {self.posicion}/{len(self.respuestas)} (omitidos {self.omitidas} reintentos grabados)")
+        print(f"   Fallos de validación: {len(self.fallos)}")
+        for fallo in self.fallos:
+            print(f"     #{fallo['posicion']}: {fallo['pregunta'].strip()} -> '{fallo['respuesta']}' | {fallo['error']}")
+        print(f"   Tiempo total: {segundos:.3f}s")
+        return {
+            "respuestas_usadas": self.posicion,
+            "fallos": self.fallos,
+            "segundos": segundos
+        }
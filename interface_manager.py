@@ -1,7 +1,9 @@
 """
 Gestión de interfaces para routers y switches según modo (simulación/físico)
 """
+from functools import lru_cache
 
+@lru_cache(maxsize=4096)
 def get_wan_interface(router_num, interface_index, modo_config):
     """
     Obtiene la interfaz WAN para un router según el modo y número de router
@@ -28,6 +30,7 @@ def get_wan_interface(router_num, interface_index, modo_config):
         else:
             raise ValueError(f"Máximo 5 routers soportados, recibido: {router_num}")
 
+@lru_cache(maxsize=4096)
 def get_lan_interface(router_num, interface_index, modo_config, es_etherchannel=False):
     """
     Obtiene la interfaz LAN para un router (hacia switches)
@@ -64,6 +67,7 @@ def get_lan_interface(router_num, interface_index, modo_config, es_etherchannel=
         else:
             raise ValueError(f"Máximo 5 routers soportados, recibido: {router_num}")
 
+@lru_cache(maxsize=4096)
 def get_switch_trunk_interface(switch_num, interface_index, modo_config, hacia_donde="router"):
     """
     Obtiene interfaz de trunk para switch
@@ -95,6 +99,41 @@ def get_switch_trunk_interface(switch_num, interface_index, modo_config, hacia_d
         else:
             raise ValueError(f"Máximo 5 switches soportados, recibido: {switch_num}")
 
+# Puertos por switch de acceso (índices 0..N-1 de get_switch_port)
+PUERTOS_SWITCH_SIMULACION = 25  # fa0/0-24
+PUERTOS_SWITCH_2960 = 26  # gi0/1-2 + fa0/1-24
+PUERTOS_SWITCH_3650 = 24  # gi1/0/1-24
+
+@lru_cache(maxsize=4096)
+def get_switch_port(switch_num, indice_puerto, modo_config):
+    """
+    Puerto n-ésimo de un switch de acceso, sin límite de switches por dominio
+    (mismo reparto que get_switch_trunk_interface; del 6 en adelante, modelo 2960)
+    
+    Args:
+        switch_num (int): Número del switch dentro del dominio
+        indice_puerto (int): Índice del puerto (0, 1, 2...)
+        modo_config (int): 1=Simulación, 2=Físico
+    
+    Returns:
+        str: Nombre de la interfaz
+    
+    Raises:
+        ValueError: Si el switch no tiene tantos puertos
+    """
+    if modo_config == 1:  # Simulación
+        if indice_puerto >= PUERTOS_SWITCH_SIMULACION:
+            raise ValueError(f"Switch {switch_num} excede interfaces disponibles ({PUERTOS_SWITCH_SIMULACION})")
+        return f"fa0/{indice_puerto}"
+    if 4 <= switch_num <= 5:  # Switches 4-5: gi1/0/x
+        if indice_puerto >= PUERTOS_SWITCH_3650:
+            raise ValueError(f"Switch {switch_num} solo soporta hasta {PUERTOS_SWITCH_3650} interfaces")
+        return f"gi1/0/{indice_puerto+1}"
+    if indice_puerto >= PUERTOS_SWITCH_2960:
+        raise ValueError(f"Switch {switch_num} excede interfaces disponibles ({PUERTOS_SWITCH_2960})")
+    return f"gi0/{indice_puerto+1}" if indice_puerto <= 1 else f"fa0/{indice_puerto-1}"
+
+@lru_cache(maxsize=4096)
 def get_switch_access_interface(switch_num, vlan_id, modo_config):
     """
     Obtiene interfaz de acceso para un switch según VLAN
@@ -2,48 +2,115 @@
 Utilidades para manejo de IPs y redes
 """
 import ipaddress
-from diagonal_manager import DiagonalManager
+from functools import lru_cache
 
-# Variable global para el manejador de diagonales
-diagonal_manager = None
-
-def inicializar_diagonal_manager(base_ip):
-    """Inicializa el manejador de diagonales"""
-    global diagonal_manager
-    diagonal_manager = DiagonalManager(base_ip)
-
-def calcular_rango_subred(base_ip, mascara, subredes_ocupadas, aleatorio=True):
-    """Función modificada para usar el sistema de diagonales"""
-    global diagonal_manager
-    
-    if diagonal_manager is None:
-        diagonal_manager = DiagonalManager(base_ip)
-    
-    # Obtener el siguiente combo de la diagonal correspondiente
-    red_combo = diagonal_manager.obtener_siguiente_combo(mascara)
-    
-    # Calcular el rango para compatibilidad con el código existente
-    red_obj = ipaddress.IPv4Network(f"{red_combo}/{mascara}", strict=False)
-    inicio_subred = int(red_obj.network_address)
-    fin_subred = int(red_obj.broadcast_address)
+@lru_cache(maxsize=65536)
+def obtener_ip_usable(red, mascara, offset):
+    """Obtiene IP usable de una red con offset específico (aritmética entera, sin recorrer hosts())"""
+    mascara = int(mascara)
+    tamano = 1 << (32 - mascara)
+    inicio = int(ipaddress.IPv4Address(red)) & ~(tamano - 1) & 0xFFFFFFFF
     
-    # Agregar a subredes ocupadas para compatibilidad
-    subredes_ocupadas.append((inicio_subred, fin_subred))
+    # Mismo criterio que IPv4Network.hosts(): /31 y /32 no reservan red ni broadcast
+    if mascara >= 31:
+        primer_host, num_hosts = inicio, tamano
+    else:
+        primer_host, num_hosts = inicio + 1, tamano - 2
     
-    return (str(red_obj.network_address), str(red_obj.broadcast_address))
-
-def obtener_ip_usable(red, mascara, offset):
-    """Obtiene IP usable de una red con offset específico"""
-    try:
-        red_obj = ipaddress.IPv4Network(f"{red}/{mascara}", strict=False)
-        return str(list(red_obj.hosts())[offset])
-    except IndexError:
+    if not -num_hosts <= offset < num_hosts:
         return None
+    return str(ipaddress.IPv4Address(primer_host + offset % num_hosts))
 
+@lru_cache(maxsize=None)
 def convertir_mascara_prefijo_a_decimal(mascara_prefijo):
     """Convierte máscara de prefijo a decimal"""
     return str(ipaddress.IPv4Network(f"0.0.0.0/{mascara_prefijo}").netmask)
 
+def convertir_mascara_decimal_a_prefijo(mascara_decimal):
+    """Convierte máscara decimal (255.255.255.0) a prefijo (24)"""
+    return bin(ip_a_entero(mascara_decimal)).count("1")
+
 def obtener_direccion_de_red(ip, mascara_prefijo):
     """Obtiene dirección de red de una IP con máscara"""
-    return str(ipaddress.IPv4Network(f"{ip}/{mascara_prefijo}", strict=False).network_address)
+    return entero_a_ip(red_entera(ip_a_entero(str(ip)), mascara_prefijo))
+
+def ip_a_entero(ip):
+    """Convierte una IP en texto a entero (más rápido que IPv4Address para datos ya validados)"""
+    a, b, c, d = ip.split(".")
+    return (int(a) << 24) | (int(b) << 16) | (int(c) << 8) | int(d)
+
+def entero_a_ip(valor):
+    """Convierte un entero a IP en texto"""
+    return f"{(valor >> 24) & 255}.{(valor >> 16) & 255}.{(valor >> 8) & 255}.{valor & 255}"
+
+def red_entera(direccion, mascara_prefijo):
+    """Dirección de red (entero) de una dirección entera con su prefijo"""
+    return direccion & ~((1 << (32 - int(mascara_prefijo))) - 1) & 0xFFFFFFFF
+
+# Por debajo de este tamaño el coste de crear arrays supera al del bucle en Python
+MIN_REDES_VECTORIZADO = 64
+
+def _cargar_numpy():
+    """Importa numpy solo si está instalado (dependencia opcional)"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+def _direcciones_en_bloque_numpy(np, redes, prefijos):
+    """Calcula red, primer/último host, máscara y broadcast con aritmética uint32 sobre arrays"""
+    redes = np.asarray(redes, dtype=np.uint64)
+    prefijos = np.asarray(prefijos, dtype=np.uint64)
+    mascaras = (np.uint64(0xFFFFFFFF) << (np.uint64(32) - prefijos)) & np.uint64(0xFFFFFFFF)
+    inicios = redes & mascaras
+    broadcasts = inicios | (~mascaras & np.uint64(0xFFFFFFFF))
+    sin_reserva = prefijos >= 31  # /31 y /32: mismo criterio que IPv4Network.hosts()
+    primeros = np.where(sin_reserva, inicios, inicios + np.uint64(1))
+    ultimos = np.where(sin_reserva, broadcasts, broadcasts - np.uint64(1))
+    columnas = [c.astype(np.uint32).tolist() for c in (inicios, primeros, ultimos, mascaras, broadcasts)]
+    return list(zip(*columnas))
+
+def _direcciones_en_bloque_python(redes, prefijos):
+    """Misma operación que la versión numpy, con enteros de Python"""
+    resultado = []
+    for red, prefijo in zip(redes, prefijos):
+        mascara = (0xFFFFFFFF << (32 - prefijo)) & 0xFFFFFFFF
+        inicio = red & mascara
+        broadcast = inicio | (~mascara & 0xFFFFFFFF)
+        if prefijo >= 31:
+            resultado.append((inicio, inicio, broadcast, mascara, broadcast))
+        else:
+            resultado.append((inicio, inicio + 1, broadcast - 1, mascara, broadcast))
+    return resultado
+
+def calcular_direcciones_en_bloque(redes, prefijos):
+    """
+    Calcula de una vez las direcciones de muchas redes.
+
+    Args:
+        redes: Secuencia de direcciones de red (enteros o texto)
+        prefijos: Secuencia de prefijos (enteros), en el mismo orden
+
+    Returns:
+        list: Tuplas de texto (red, primer_host, ultimo_host, mascara_decimal, broadcast)
+    """
+    redes = [ip_a_entero(r) if isinstance(r, str) else int(r) for r in redes]
+    prefijos = [int(p) for p in prefijos]
+    if len(redes) != len(prefijos):
+        raise ValueError("redes y prefijos deben tener la misma longitud")
+
+    np = _cargar_numpy() if len(redes) >= MIN_REDES_VECTORIZADO else None
+    if np is not None:
+        enteros = _direcciones_en_bloque_numpy(np, redes, prefijos)
+    else:
+        enteros = _direcciones_en_bloque_python(redes, prefijos)
+
+    # Formateo: un único paso de enteros a texto por dirección distinta
+    cache = {}
+    def texto(valor):
+        ip = cache.get(valor)
+        if ip is None:
+            ip = cache[valor] = entero_a_ip(valor)
+        return ip
+    return [tuple(texto(v) for v in fila) for fila in enteros]
@@ -0,0 +1,143 @@
+"""
+Procesamiento por lotes de especificaciones de topología (JSONL)
+
+Cada línea del archivo de entrada es una especificación (ver planificador.py).
+Cada trabajo pasa por asignación -> enrutamiento -> renderizado en un proceso
+del pool, con su propio ContextoPlanificacion, y sus resultados se escriben en
+<directorio_salida>/<indice>_<nombre_sesion>/ a medida que terminan.
+"""
+import contextlib
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+ARCHIVO_RESULTADOS = "resultados.jsonl"
+
+def _nombre_seguro(nombre):
+    """
+    nombre_sesion apto para una ruta dentro del directorio de salida: los
+    caracteres que validar_nombre_archivo rechaza (separadores incluidos) se
+    cambian por '_' y se quitan los puntos iniciales.
+    """
+    from config import INVALID_FILENAME_CHARS
+
+    limpio = "".join("_" if c in INVALID_FILENAME_CHARS or c == os.sep else c for c in str(nombre))
+    return limpio.lstrip(".") or "sesion"
+
+def _leer_especificaciones(ruta_jsonl):
+    """Lee el archivo línea a línea: (numero_linea, texto) sin cargarlo completo"""
+    with open(ruta_jsonl, "r", encoding="utf-8") as f:
+        for numero_linea, linea in enumerate(f, start=1):
+            linea = linea.strip()
+            if linea and not linea.startswith("#"):
+                yield numero_linea, linea
+
+def ejecutar_trabajo(numero_linea, linea, directorio_salida):
+    """
+    Ejecuta un trabajo completo en el proceso actual.
+
+    Returns:
+        dict: Resumen con estado, rutas generadas y tiempos por fase (segundos)
+    """
+    from planificador import planificar_sesion, generar_configuraciones
+    from session_manager import guardar_sesion, generar_archivo_final
+
+    resultado = {"linea": numero_linea, "ok": False, "tiempos": {}}
+    inicio_total = time.perf_counter()
+    registro = io.StringIO()
+    directorio_trabajo = None
+
+    try:
+        spec = json.loads(linea)
+        resultado["nombre_sesion"] = spec.get("nombre_sesion", f"trabajo{numero_linea}")
+        nombre = _nombre_seguro(resultado["nombre_sesion"])
+        directorio_trabajo = os.path.join(directorio_salida, f"{numero_linea:05d}_{nombre}")
+        os.makedirs(directorio_trabajo, exist_ok=True)
+
+        with contextlib.redirect_stdout(registro):
+            t0 = time.perf_counter()
+            estado = planificar_sesion(spec)
+            t1 = time.perf_counter()
+            generar_configuraciones(estado)
+            t2 = time.perf_counter()
+            ruta_sesion = os.path.join(directorio_trabajo, f"{nombre}.json")
+            ruta_config = os.path.join(directorio_trabajo, f"{nombre}_config.cisco")
+            guardar_sesion(ruta_sesion, estado)
+            generar_archivo_final(estado, ruta_config)
+            t3 = time.perf_counter()
+
+        resultado["tiempos"] = {
+            "asignacion": round(t1 - t0, 6),
+            "renderizado": round(t2 - t1, 6),
+            "escritura": round(t3 - t2, 6)
+        }
+        resultado["archivos"] = [ruta_sesion, ruta_config]
+        resultado["ok"] = True
+    except Exception as e:
+        resultado["error"] = f"{type(e).__name__}: {e}"
+        registro.write(f"❌ {resultado['error']}\n")
+    finally:
+        # El registro se escribe también si el trabajo falla a medias: es lo que más se necesita entonces
+        if directorio_trabajo is not None:
+            try:
+                with open(os.path.join(directorio_trabajo, "registro.log"), "w", encoding="utf-8") as f:
+                    f.write(registro.getvalue())
+            except OSError as e:
+                resultado["ok"] = False
+                resultado.setdefault("error", f"{type(e).__name__}: {e}")
+
+    resultado["tiempos"]["total"] = round(time.perf_counter() - inicio_total, 6)
+    return resultado
+
+def procesar_lote(ruta_jsonl, directorio_salida, max_workers=None):
+    """
+    Procesa todas las especificaciones de un archivo JSONL en un pool de procesos.
+
+    Los trabajos se envían con una ventana acotada (2 por proceso) para no leer
+    el archivo completo, y cada resultado se añade a resultados.jsonl en cuanto termina.
+
+    Returns:
+        dict: Totales {"ok": n, "error": n, "segundos": t}
+    """
+    os.makedirs(directorio_salida, exist_ok=True)
+    max_workers = max_workers or os.cpu_count() or 1
+    ventana = max_workers * 2
+    totales = {"ok": 0, "error": 0}
+    inicio = time.perf_counter()
+
+    print(f"\nPROCESANDO LOTE '{ruta_jsonl}' CON {max_workers} PROCESOS")
+    print("=" * 70)
+
+    ruta_resultados = os.path.join(directorio_salida, ARCHIVO_RESULTADOS)
+    with open(ruta_resultados, "w", encoding="utf-8") as salida, \
+         ProcessPoolExecutor(max_workers=max_workers) as executor:
+
+        def registrar(futuros_terminados):
+            for futuro in futuros_terminados:
+                resultado = futuro.result()
+                salida.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+                salida.flush()
+                if resultado["ok"]:
+                    totales["ok"] += 1
+                    print(f"   OK linea {resultado['linea']}: {resultado['nombre_sesion']} ({resultado['tiempos']['total']:.3f}s)")
+                else:
+                    totales["error"] += 1
+                    print(f"   ❌ linea {resultado['linea']}: {resultado['error']}")
+
+        pendientes = set()
+        for numero_linea, linea in _leer_especificaciones(ruta_jsonl):
+            if len(pendientes) >= ventana:
+                terminados, pendientes = wait(pendientes, return_when=FIRST_COMPLETED)
+                registrar(terminados)
+            pendientes.add(executor.submit(ejecutar_trabajo, numero_linea, linea, directorio_salida))
+
+        terminados, _ = wait(pendientes)
+        registrar(terminados)
+
+    totales["segundos"] = round(time.perf_counter() - inicio, 3)
+    print("=" * 70)
+    print(f"✅ Lote completado: {totales['ok']} correctos, {totales['error']} con error en {totales['segundos']}s")
+    print(f"   Resultados en '{ruta_resultados}'")
+    return totales
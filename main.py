@@ -6,15 +6,19 @@ Versión Modular
 Este es el archivo principal que integra todos los módulos del sistema.
 """
 
-# Importar todos los módulos necesarios
-from config import *
-from validaciones import validar_entrada
-from session_manager import guardar_sesion, cargar_sesion, revertir_paso_router, generar_archivo_final
-from session_init import iniciar_nueva_sesion, verificar_compatibilidad_sesion
-from router_config import configurar_router_individual
+# Solo se importa la configuración de consola; el resto de módulos se carga
+# bajo demanda en cada modo para mantener el arranque dentro del presupuesto
+# (medir con: python -X importtime main.py --regenerar <sesion.json>)
+import config  # noqa: F401
 
 def main():
     """Función principal del programa"""
+    from validaciones import validar_entrada
+    from session_manager import guardar_sesion, cargar_sesion, revertir_paso_router, generar_archivo_final
+    from session_init import iniciar_nueva_sesion, verificar_compatibilidad_sesion
+    from router_config import configurar_router_individual
+    from modelo_sesion import ModeloSesion
+    
     print("=" * 70)
     print("GENERADOR DE CONFIGURACIONES CISCO")
     print("=" * 70)
@@ -66,17 +70,118 @@ def main():
             estado = revertir_paso_router(estado, r_a_revertir)
             rango_inicio = r_a_revertir
     
-    # Configurar routers uno por uno
+    # Configurar routers uno por uno sobre el modelo tipado de la sesión
+    modelo = ModeloSesion.desde_estado(estado)
     for r_num in range(rango_inicio, num_routers + 1):
-        estado = configurar_router_individual(r_num, estado, nombre_sesion_json)
+        configurar_router_individual(r_num, modelo, nombre_sesion_json)
     
     # Generar archivo final
-    nombre_archivo_final = f"{estado['nombre_sesion']}_config.cisco"
+    nombre_archivo_final = f"{modelo.nombre}_config.cisco"
+    generar_archivo_final(modelo.a_estado(), nombre_archivo_final)
+
+def regenerar_desde_sesion(nombre_sesion_json, nombre_archivo_final=None):
+    """
+    Ruta rápida: regenera el archivo final desde una sesión guardada
+    sin cargar el asistente interactivo ni los generadores.
+    """
+    from session_manager import cargar_sesion, generar_archivo_final
+    
+    estado = cargar_sesion(nombre_sesion_json)
+    if not estado:
+        print("No se pudo cargar la sesion. Saliendo.")
+        return False
+    
+    nombre_archivo_final = nombre_archivo_final or f"{estado['nombre_sesion']}_config.cisco"
     generar_archivo_final(estado, nombre_archivo_final)
+    return True
 
-if __name__ == "__main__":
+def regenerar_por_dispositivo(nombre_sesion_json, directorio=None, empaquetar=None):
+    """
+    Ruta rápida: un archivo por dispositivo desde una sesión guardada
+    (main.py --por-dispositivo <sesion.json> [directorio] [gz|tar|tar.gz]).
+    """
+    from session_manager import cargar_sesion, generar_archivos_por_dispositivo
+    
+    estado = cargar_sesion(nombre_sesion_json)
+    if not estado:
+        print("No se pudo cargar la sesion. Saliendo.")
+        return None
+    
+    directorio = directorio or f"{estado['nombre_sesion']}_dispositivos"
+    return generar_archivos_por_dispositivo(estado, directorio, empaquetar)
+
+def main_grabando(ruta_respuestas):
+    """Ejecuta el asistente grabando cada pregunta y respuesta"""
+    from validaciones import establecer_fuente_entrada
+    from grabacion_entradas import GrabadorEntradas
+    
+    grabador = GrabadorEntradas(ruta_respuestas)
+    establecer_fuente_entrada(grabador)
+    try:
+        main()
+    finally:
+        establecer_fuente_entrada(None)
+        grabador.guardar()
+
+def main_reproduciendo(ruta_respuestas):
+    """Ejecuta el asistente con las respuestas grabadas y muestra el informe de tiempos/fallos"""
+    from validaciones import establecer_fuente_entrada
+    from grabacion_entradas import ReproductorEntradas, ReproduccionAgotada
+    
+    reproductor = ReproductorEntradas(ruta_respuestas)
+    establecer_fuente_entrada(reproductor)
     try:
         main()
+    except ReproduccionAgotada as e:
+        print(f"\n⚠️ {e}")
+    finally:
+        establecer_fuente_entrada(None)
+    return reproductor.resumen()
+
+def main_lotes(argumentos):
+    """Punto de entrada por lotes: main.py --lotes <specs.jsonl> <directorio_salida> [procesos]"""
+    from lotes import procesar_lote
+    
+    if len(argumentos) < 2:
+        print("Uso: python main.py --lotes <specs.jsonl> <directorio_salida> [procesos]")
+        return
+    
+    max_workers = int(argumentos[2]) if len(argumentos) > 2 else None
+    procesar_lote(argumentos[0], argumentos[1], max_workers)
+
+def main_servicio(argumentos):
+    """Punto de entrada del servicio: main.py --servicio [puerto] [--max-concurrentes N]"""
+    from servicio import iniciar_servicio, PUERTO_POR_DEFECTO, MAX_CONCURRENTES_POR_DEFECTO
+    
+    argumentos = list(argumentos)
+    max_concurrentes = MAX_CONCURRENTES_POR_DEFECTO
+    if "--max-concurrentes" in argumentos:
+        posicion = argumentos.index("--max-concurrentes")
+        if posicion + 1 >= len(argumentos):
+            print("Uso: python main.py --servicio [puerto] [--max-concurrentes N]")
+            return
+        max_concurrentes = int(argumentos[posicion + 1])
+        del argumentos[posicion:posicion + 2]
+    puerto = int(argumentos[0]) if argumentos else PUERTO_POR_DEFECTO
+    iniciar_servicio(puerto=puerto, max_concurrentes=max_concurrentes)
+
+if __name__ == "__main__":
+    import sys
+    try:
+        if len(sys.argv) > 2 and sys.argv[1] == "--regenerar":
+            regenerar_desde_sesion(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None)
+        elif len(sys.argv) > 2 and sys.argv[1] == "--por-dispositivo":
+            regenerar_por_dispositivo(sys.argv[2], *sys.argv[3:5])
+        elif len(sys.argv) > 2 and sys.argv[1] == "--grabar":
+            main_grabando(sys.argv[2])
+        elif len(sys.argv) > 2 and sys.argv[1] == "--reproducir":
+            main_reproduciendo(sys.argv[2])
+        elif len(sys.argv) > 1 and sys.argv[1] == "--lotes":
+            main_lotes(sys.argv[2:])
+        elif len(sys.argv) > 1 and sys.argv[1] == "--servicio":
+            main_servicio(sys.argv[2:])
+        else:
+            main()
     except KeyboardInterrupt:
         print("\n\nPrograma interrumpido por el usuario.")
     except Exception as e:
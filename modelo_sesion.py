@@ -0,0 +1,299 @@
+"""
+Modelo tipado en memoria de una sesión
+
+Clases con __slots__ que guardan direcciones y routers como enteros. El estado
+JSON de la sesión (dicts anidados con claves str(router_num), pares
+[red, mascara] y claves ip_r{n}) se convierte solo en el borde:
+ModeloSesion.desde_estado() al empezar a generar comandos y a_estado() al
+guardar (session_manager.guardar_sesion acepta el modelo directamente).
+
+Los generadores (router_config, router_commands y routing) leen solo el
+modelo: routers, VLANs y enlaces indexados por entero, sin convertir claves.
+"""
+from ip_utils import ip_a_entero, entero_a_ip, obtener_ip_usable
+from routing import ATRIBUTOS_ENLACE, costo_enlace
+
+# Secciones opcionales del JSON que se vuelven a escribir aunque estén vacías si la sesión ya las tenía
+SECCIONES_OPCIONALES = ("comandos_router", "comandos_switches", "gestion_switches", "bloques_por_router")
+
+def _par_de_clave(clave):
+    """(r1, r2) enteros de una clave "(r1, r2)" de todas_las_conexiones"""
+    r1, r2 = clave.strip("()").split(",")
+    return int(r1), int(r2)
+
+class Red:
+    """Red IPv4 como (dirección entera, prefijo)"""
+    __slots__ = ("direccion", "prefijo")
+
+    def __init__(self, direccion, prefijo):
+        self.direccion = direccion
+        self.prefijo = prefijo
+
+    @classmethod
+    def desde_lista(cls, par):
+        return cls(ip_a_entero(par[0]), int(par[1]))
+
+    def a_lista(self):
+        return [self.ip, self.prefijo]
+
+    @property
+    def ip(self):
+        return entero_a_ip(self.direccion)
+
+    @property
+    def tamano(self):
+        return 1 << (32 - self.prefijo)
+
+    @property
+    def broadcast(self):
+        return self.direccion + self.tamano - 1
+
+    @property
+    def primer_host(self):
+        """Mismo criterio que obtener_ip_usable(): /31 y /32 no reservan red ni broadcast"""
+        return self.direccion if self.prefijo >= 31 else self.direccion + 1
+
+    @property
+    def ultimo_host(self):
+        return self.broadcast if self.prefijo >= 31 else self.broadcast - 1
+
+    def contiene(self, ip):
+        return self.direccion <= ip <= self.broadcast
+
+    def __eq__(self, otra):
+        return isinstance(otra, Red) and self.direccion == otra.direccion and self.prefijo == otra.prefijo
+
+    def __hash__(self):
+        return hash((self.direccion, self.prefijo))
+
+    def __repr__(self):
+        return f"Red({self.ip}/{self.prefijo})"
+
+class Enlace:
+    """Enlace P2P entre dos routers (r1 < r2) con la IP de cada extremo, sus atributos y su coste"""
+    __slots__ = ("r1", "r2", "red", "ip_r1", "ip_r2", "atributos", "costo")
+
+    def __init__(self, r1, r2, red, ip_r1, ip_r2, atributos=None):
+        self.r1 = r1
+        self.r2 = r2
+        self.red = red
+        self.ip_r1 = ip_r1
+        self.ip_r2 = ip_r2
+        self.atributos = atributos or {}  # {"costo" / "ancho_banda"} (routing.ATRIBUTOS_ENLACE)
+        self.costo = costo_enlace(self.atributos)
+
+    def ip_de(self, router_num):
+        return self.ip_r1 if router_num == self.r1 else self.ip_r2
+
+    def otro_extremo(self, router_num):
+        return self.r2 if router_num == self.r1 else self.r1
+
+    @classmethod
+    def desde_dict(cls, datos):
+        return cls(
+            int(datos["r1"]), int(datos["r2"]),
+            Red(ip_a_entero(datos["red"]), int(datos["mascara"])),
+            ip_a_entero(datos["ip_r1"]), ip_a_entero(datos["ip_r2"]),
+            {clave: datos[clave] for clave in ATRIBUTOS_ENLACE if clave in datos}
+        )
+
+    @classmethod
+    def desde_lista(cls, clave, par):
+        """Formato antiguo [red, mascara]: el primer host es del router de menor número"""
+        r1, r2 = sorted(_par_de_clave(clave))
+        red, mascara = par
+        return cls(
+            r1, r2, Red.desde_lista(par),
+            ip_a_entero(obtener_ip_usable(red, mascara, 0)), ip_a_entero(obtener_ip_usable(red, mascara, -1))
+        )
+
+    def a_dict(self):
+        datos = {
+            "red": self.red.ip,
+            "mascara": self.red.prefijo,
+            "r1": self.r1,
+            "r2": self.r2,
+            "ip_r1": entero_a_ip(self.ip_r1),
+            "ip_r2": entero_a_ip(self.ip_r2)
+        }
+        datos.update(self.atributos)
+        return datos
+
+class Router:
+    """Recursos y comandos generados de un router"""
+    __slots__ = (
+        "numero", "vlans", "conexiones", "l2", "swc3", "wlc", "bloque",
+        "comandos", "comandos_switches", "gestion"
+    )
+
+    def __init__(self, numero):
+        self.numero = numero
+        self.vlans = {}  # {vlan_id: Red}
+        self.conexiones = {}  # {router_vecino: (Red, es_primer_router)}
+        self.l2 = {}
+        self.swc3 = None  # Red hacia el SWC3
+        self.wlc = None  # {"ip_servidor", "mascara_servidor", "vlan_nativa"}
+        self.bloque = None  # Red resumen del router (estrategia jerárquica)
+        self.comandos = None
+        self.comandos_switches = None
+        self.gestion = None  # {switch: ip de gestión} (ver network_config.direcciones_gestion)
+
+class ModeloSesion:
+    """Sesión completa con routers indexados por entero"""
+    __slots__ = (
+        "nombre", "ultimo_paso", "datos_iniciales", "vlans_con_combos", "vlans_nombres",
+        "redes_p2p", "subredes_ocupadas", "routers", "enlaces", "topologia_switches",
+        "areas_ospf", "secciones", "extras"
+    )
+
+    def __init__(self, nombre, datos_iniciales):
+        self.nombre = nombre
+        self.ultimo_paso = 0
+        self.datos_iniciales = datos_iniciales
+        self.vlans_con_combos = {}  # {vlan_id: [Red]}
+        self.vlans_nombres = {}  # {vlan_id: nombre}
+        self.redes_p2p = []  # [Red]
+        self.subredes_ocupadas = []
+        self.routers = {}  # {router_num: Router}
+        self.enlaces = {}  # {(r1, r2): Enlace}
+        self.topologia_switches = {}
+        self.areas_ospf = None  # routing.disenar_areas_ospf(), con claves enteras
+        self.secciones = set()  # SECCIONES_OPCIONALES presentes en el JSON de origen
+        self.extras = {}  # Claves del JSON que el modelo no interpreta (se conservan tal cual)
+
+    def router(self, numero):
+        if numero not in self.routers:
+            self.routers[numero] = Router(numero)
+        return self.routers[numero]
+
+    def enlace(self, r1, r2):
+        """Enlace entre dos routers (en cualquier orden) o None"""
+        return self.enlaces.get((r1, r2) if r1 < r2 else (r2, r1))
+
+    @classmethod
+    def desde_estado(cls, estado):
+        """Convierte el estado JSON (dicts anidados) al modelo tipado"""
+        calculada = estado.get("config_calculada", {})
+        progreso = estado.get("progreso_routers", {})
+        modelo = cls(estado.get("nombre_sesion"), dict(estado.get("datos_iniciales", {})))
+        modelo.ultimo_paso = estado.get("ultimo_paso_completado", 0)
+        modelo.secciones = {s for s in SECCIONES_OPCIONALES if s in progreso or s in calculada}
+
+        for vlan_id, combos in calculada.get("vlans_con_combos", []):
+            modelo.vlans_con_combos[int(vlan_id)] = [Red.desde_lista(c) for c in combos]
+        modelo.vlans_nombres = {int(k): v for k, v in calculada.get("vlans_nombres", {}).items()}
+        modelo.redes_p2p = [Red.desde_lista(r) for r in calculada.get("redes_p2p_disponibles", [])]
+        modelo.subredes_ocupadas = list(calculada.get("subredes_ocupadas", []))
+        for r_str, bloque in calculada.get("bloques_por_router", {}).items():
+            modelo.router(int(r_str)).bloque = Red.desde_lista(bloque)
+        if "areas_ospf" in calculada:
+            areas = calculada["areas_ospf"]
+            modelo.areas_ospf = {
+                "centros": list(areas["centros"]),
+                "area_router": {int(r): area for r, area in areas["area_router"].items()},
+                "area_enlace": {_par_de_clave(clave): area for clave, area in areas["area_enlace"].items()}
+            }
+
+        for r in range(1, int(modelo.datos_iniciales.get("num_routers", 0)) + 1):
+            modelo.router(r)
+        for r_str, vlans in progreso.get("vlans_por_router", {}).items():
+            modelo.router(int(r_str)).vlans = {int(v): Red.desde_lista(par) for v, par in vlans.items()}
+        for r_str, conexiones in progreso.get("conexiones_por_router", {}).items():
+            modelo.router(int(r_str)).conexiones = {
+                int(vecino): (Red.desde_lista(datos), bool(datos[2])) for vecino, datos in conexiones.items()
+            }
+        for r_str, l2 in progreso.get("l2_config_por_router", {}).items():
+            modelo.router(int(r_str)).l2 = l2
+        for r_str, datos in progreso.get("config_swc3", {}).items():
+            modelo.router(int(r_str)).swc3 = Red.desde_lista(datos["red_hacia_router"])
+        for r_str, datos in progreso.get("config_wlc", {}).items():
+            modelo.router(int(r_str)).wlc = datos
+        for r_str, comandos in progreso.get("comandos_router", {}).items():
+            modelo.router(int(r_str)).comandos = comandos
+        for r_str, switches in progreso.get("comandos_switches", {}).items():
+            modelo.router(int(r_str)).comandos_switches = switches
+        for r_str, gestion in progreso.get("gestion_switches", {}).items():
+            modelo.router(int(r_str)).gestion = gestion
+        modelo.topologia_switches = progreso.get("topologia_switches", {})
+
+        for clave, datos in progreso.get("todas_las_conexiones", {}).items():
+            enlace = Enlace.desde_dict(datos) if isinstance(datos, dict) else Enlace.desde_lista(clave, datos)
+            modelo.enlaces[(enlace.r1, enlace.r2)] = enlace
+
+        claves_progreso = {
+            "vlans_por_router", "conexiones_por_router", "l2_config_por_router", "config_swc3",
+            "config_wlc", "comandos_router", "comandos_switches", "gestion_switches",
+            "todas_las_conexiones", "topologia_switches"
+        }
+        claves_calculada = {
+            "vlans_con_combos", "vlans_nombres", "redes_p2p_disponibles", "subredes_ocupadas",
+            "bloques_por_router", "areas_ospf"
+        }
+        claves_estado = {"nombre_sesion", "ultimo_paso_completado", "datos_iniciales", "config_calculada", "progreso_routers"}
+        modelo.extras = {
+            "estado": {k: v for k, v in estado.items() if k not in claves_estado},
+            "progreso": {k: v for k, v in progreso.items() if k not in claves_progreso},
+            "calculada": {k: v for k, v in calculada.items() if k not in claves_calculada}
+        }
+        return modelo
+
+    def _seccion(self, nombre, valores):
+        """{str(router): valor} de los routers con valor, o None si la sección no debe escribirse"""
+        seccion = {str(r): v for r, v in valores if v is not None}
+        return seccion if seccion or nombre in self.secciones else None
+
+    def a_estado(self):
+        """Convierte el modelo al formato JSON de la sesión"""
+        routers = [self.routers[r] for r in sorted(self.routers)]
+        progreso = {
+            "vlans_por_router": {
+                str(r.numero): {str(v): red.a_lista() for v, red in r.vlans.items()} for r in routers
+            },
+            "conexiones_por_router": {
+                str(r.numero): {
+                    str(vecino): red.a_lista() + [es_primero] for vecino, (red, es_primero) in r.conexiones.items()
+                }
+                for r in routers
+            },
+            "l2_config_por_router": {str(r.numero): r.l2 for r in routers},
+            "todas_las_conexiones": {str(clave): enlace.a_dict() for clave, enlace in self.enlaces.items()},
+            "config_swc3": {str(r.numero): {"red_hacia_router": r.swc3.a_lista()} for r in routers if r.swc3},
+            "config_wlc": {str(r.numero): r.wlc for r in routers if r.wlc is not None},
+            "topologia_switches": self.topologia_switches
+        }
+        for nombre, atributo in (
+            ("comandos_router", "comandos"), ("comandos_switches", "comandos_switches"), ("gestion_switches", "gestion")
+        ):
+            seccion = self._seccion(nombre, ((r.numero, getattr(r, atributo)) for r in routers))
+            if seccion is not None:
+                progreso[nombre] = seccion
+        progreso.update(self.extras.get("progreso", {}))
+
+        calculada = {
+            "vlans_con_combos": [[v, [red.a_lista() for red in combos]] for v, combos in self.vlans_con_combos.items()],
+            "vlans_nombres": {str(v): nombre for v, nombre in self.vlans_nombres.items()},
+            "redes_p2p_disponibles": [red.a_lista() for red in self.redes_p2p],
+            "subredes_ocupadas": self.subredes_ocupadas
+        }
+        bloques = self._seccion(
+            "bloques_por_router", ((r.numero, r.bloque.a_lista() if r.bloque else None) for r in routers)
+        )
+        if bloques is not None:
+            calculada["bloques_por_router"] = bloques
+        if self.areas_ospf is not None:
+            calculada["areas_ospf"] = {
+                "centros": self.areas_ospf["centros"],
+                "area_router": {str(r): area for r, area in self.areas_ospf["area_router"].items()},
+                "area_enlace": {str(par): area for par, area in self.areas_ospf["area_enlace"].items()}
+            }
+        calculada.update(self.extras.get("calculada", {}))
+
+        estado = {
+            "nombre_sesion": self.nombre,
+            "ultimo_paso_completado": self.ultimo_paso,
+            "datos_iniciales": self.datos_iniciales,
+            "config_calculada": calculada,
+            "progreso_routers": progreso
+        }
+        estado.update(self.extras.get("estado", {}))
+        return estado
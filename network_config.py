@@ -2,16 +2,16 @@
 Configuración de redes y VLANs - Sistema secuencial mejorado
 """
 import ipaddress
-from ip_utils import obtener_direccion_de_red
+from ip_utils import obtener_direccion_de_red, obtener_ip_usable
 from vlan_utils import validar_vlan_personalizada
-from validaciones import validar_entrada
+from validaciones import validar_entrada, reportar_error
 
-def configurar_redes_entre_routers(num_redes, base_ip, subredes_ocupadas, aleatorio):
+def configurar_redes_entre_routers(contexto, num_redes, base_ip, subredes_ocupadas, aleatorio):
     """
     Configura redes punto a punto entre routers usando sistema secuencial.
-    Fase 1: Solo recopila las solicitudes de redes P2P
+    Fase 1: Solo recopila las solicitudes de redes P2P en el contexto de planificación
     """
-    from ip_utils import diagonal_manager
+    diagonal_manager = contexto.diagonal_manager
     
     print(f"\nRECOPILANDO {num_redes} SOLICITUDES DE REDES P2P (/30)")
     print("=" * 60)
@@ -22,26 +22,23 @@ def configurar_redes_entre_routers(num_redes, base_ip, subredes_ocupadas, aleato
         solicitudes_p2p.append(solicitud_id)
     
     # Guardar las solicitudes para procesamiento posterior
-    if not hasattr(diagonal_manager, 'solicitudes_p2p_guardadas'):
-        diagonal_manager.solicitudes_p2p_guardadas = []
-    diagonal_manager.solicitudes_p2p_guardadas.extend(solicitudes_p2p)
+    contexto.registrar_solicitudes_p2p(solicitudes_p2p)
     
     print(f"OK {num_redes} solicitudes P2P registradas para procesamiento")
     
     # Devolver lista vacía por ahora - se procesarán todas juntas después
     return []
 
-def configurar_vlans(num_vlans, base_ip, subredes_ocupadas):
+def configurar_vlans(contexto, num_vlans, base_ip, subredes_ocupadas):
     """
     Configura VLANs con sus subredes usando sistema secuencial.
-    Fase 1: Solo recopila todas las solicitudes de VLANs
+    Fase 1: Solo recopila todas las solicitudes de VLANs en el contexto de planificación
     """
-    from ip_utils import diagonal_manager
+    diagonal_manager = contexto.diagonal_manager
     
     print(f"\nRECOPILANDO SOLICITUDES PARA {num_vlans} VLANs")
     print("=" * 60)
     
-    vlans_info = []  # Información temporal de VLANs
     vlans_nombres = {}
     
     for i in range(num_vlans):
@@ -53,7 +50,8 @@ def configurar_vlans(num_vlans, base_ip, subredes_ocupadas):
             
             # Verificar que no se repita el ID
             if vlan_id in vlans_nombres:
-                print(f"❌ Error: Ya existe una VLAN con ID {vlan_id}. Intenta con otro número.")
+                # Se rechazan el ID y el nombre leídos por validar_vlan_personalizada
+                reportar_error(f"❌ Error: Ya existe una VLAN con ID {vlan_id}. Intenta con otro número.", 2)
                 continue
             break
         
@@ -71,24 +69,21 @@ def configurar_vlans(num_vlans, base_ip, subredes_ocupadas):
             solicitud_id = diagonal_manager.solicitar_combo(mascara_vlan, descripcion)
             solicitudes_combos.append(solicitud_id)
         
-        vlans_info.append((vlan_id, vlan_nombre, mascara_vlan, solicitudes_combos))
+        contexto.registrar_vlan(vlan_id, vlan_nombre, mascara_vlan, solicitudes_combos)
         print(f"OK VLAN {vlan_id} ({vlan_nombre}): {num_combos} combos /{mascara_vlan} registrados")
     
-    # Guardar info para procesamiento posterior
-    diagonal_manager.vlans_info_guardada = vlans_info
-    
-    print(f"\nOK Recopilacion completada: {len(vlans_info)} VLANs configuradas")
+    print(f"\nOK Recopilacion completada: {len(contexto.vlans_info)} VLANs configuradas")
     print("⏳ Las asignaciones se procesarán al finalizar la configuración...")
     
     # Devolver formato vacío por ahora - se procesará después
     return [], vlans_nombres
 
-def procesar_todas_las_asignaciones():
+def procesar_todas_las_asignaciones(contexto):
     """
     Procesa todas las asignaciones recopiladas de manera secuencial optimizada.
     Esta función debe llamarse después de recopilar TODAS las solicitudes.
     """
-    from ip_utils import diagonal_manager
+    diagonal_manager = contexto.diagonal_manager
     
     print(f"\nINICIANDO PROCESAMIENTO SECUENCIAL DE TODAS LAS ASIGNACIONES")
     print("=" * 80)
@@ -106,10 +101,10 @@ def procesar_todas_las_asignaciones():
     redes_p2p_disponibles = []
     
     # Procesar VLANs si existen
-    if hasattr(diagonal_manager, 'vlans_info_guardada'):
+    if contexto.vlans_info:
         print(f"\nCONVIRTIENDO RESULTADOS DE VLANs AL FORMATO REQUERIDO:")
         
-        for vlan_id, vlan_nombre, mascara_vlan, solicitudes_combos in diagonal_manager.vlans_info_guardada:
+        for vlan_id, vlan_nombre, mascara_vlan, solicitudes_combos in contexto.vlans_info:
             combos = []
             print(f"   VLAN {vlan_id} ({vlan_nombre}):")
             
@@ -123,10 +118,10 @@ def procesar_todas_las_asignaciones():
             vlans_con_combos.append([vlan_id, combos])
     
     # Procesar redes P2P si existen
-    if hasattr(diagonal_manager, 'solicitudes_p2p_guardadas'):
+    if contexto.solicitudes_p2p:
         print(f"\nCONVIRTIENDO RESULTADOS DE REDES P2P:")
         
-        for solicitud_id in diagonal_manager.solicitudes_p2p_guardadas:
+        for solicitud_id in contexto.solicitudes_p2p:
             resultado = diagonal_manager.obtener_combo_asignado(solicitud_id)
             if resultado:
                 red_asignada, mascara_real = resultado
@@ -139,37 +134,83 @@ def procesar_todas_las_asignaciones():
     
     return vlans_con_combos, redes_p2p_disponibles
 
+def crear_conexion_p2p(r1, r2, red, mascara, costo=None, ancho_banda=None):
+    """
+    Crea la entrada de todas_las_conexiones para un enlace P2P entre dos routers.
+    "costo" y "ancho_banda" (Mbps) solo se guardan si se indican (ver routing.costo_enlace).
+    """
+    r1, r2 = min(int(r1), int(r2)), max(int(r1), int(r2))
+    conexion = {
+        'red': red,
+        'mascara': mascara,
+        'r1': r1,
+        'r2': r2,
+        'ip_r1': obtener_ip_usable(red, mascara, 0),
+        'ip_r2': obtener_ip_usable(red, mascara, -1)
+    }
+    if costo is not None:
+        conexion['costo'] = costo
+    if ancho_banda is not None:
+        conexion['ancho_banda'] = ancho_banda
+    return conexion
+
+class AsignadorGestion:
+    """
+    Combos de gestión SSH de los dominios de switches, calculados por índice.
+
+    La red padre es el /8 de mgmt_base_ip; el combo que contiene la IP base se
+    omite y el dominio i recibe el combo i siguiente. Cada combo se obtiene
+    con aritmética sobre enteros, sin generar las subredes del /8.
+    """
+
+    def __init__(self, mgmt_base_ip, mgmt_prefijo_combo):
+        mgmt_prefijo_combo = int(mgmt_prefijo_combo)
+        red_padre = ipaddress.ip_network(f"{mgmt_base_ip.split('.')[0]}.0.0.0/8")
+        if not red_padre.prefixlen <= mgmt_prefijo_combo <= 30:
+            raise ValueError(f"Prefijo de combo de gestión /{mgmt_prefijo_combo} no válido (entre /8 y /30)")
+        self.prefijo = mgmt_prefijo_combo
+        self.tamano = 1 << (32 - mgmt_prefijo_combo)
+        self.primero = (int(ipaddress.ip_address(mgmt_base_ip)) // self.tamano + 1) * self.tamano
+        self.num_combos = (int(red_padre.broadcast_address) + 1 - self.primero) // self.tamano
+
+    def combo(self, indice):
+        """Combo del dominio `indice` (desde 0)"""
+        if not 0 <= indice < self.num_combos:
+            raise ValueError(f"No hay combo de gestión para el dominio {indice + 1} ({self.num_combos} disponibles)")
+        return ipaddress.ip_network((self.primero + indice * self.tamano, self.prefijo))
+
+def direcciones_gestion(combo, nombres_switches):
+    """
+    IPs de gestión de los switches de un combo: el switch i (desde 0) recibe
+    el host i + 1 y el último host es el gateway. Los switches que no caben
+    quedan fuera de "switches".
+
+    Returns:
+        dict: {"red", "mascara", "gateway", "switches": {nombre: ip}}
+    """
+    primero = int(combo.network_address)
+    ultimo_host = int(combo.broadcast_address) - 1
+    switches = {}
+    for indice, nombre in enumerate(nombres_switches):
+        if primero + 1 + indice >= ultimo_host:
+            break
+        switches[nombre] = str(ipaddress.ip_address(primero + 1 + indice))
+    return {
+        "red": str(combo.network_address), "mascara": combo.prefixlen,
+        "gateway": str(ipaddress.ip_address(ultimo_host)), "switches": switches
+    }
+
 def preparar_combos_gestion(mgmt_base_ip, mgmt_prefijo_combo, num_dominios):
-    """Prepara combos de gestión para switches (sin cambios)"""
+    """Combos de gestión de los primeros num_dominios dominios (ver AsignadorGestion)"""
     try:
-        red_padre_ip = mgmt_base_ip.split('.')
-        red_padre_ip[1] = red_padre_ip[2] = red_padre_ip[3] = '0'
-        red_padre = ipaddress.ip_network(f"{'.'.join(red_padre_ip)}/8", strict=False)
-        
-        if mgmt_prefijo_combo < red_padre.prefixlen:
-            print(f"❌ Error: El prefijo del combo de gestión (/{mgmt_prefijo_combo}) no puede ser más pequeño que el de la red padre /8.")
-            return []
-        
-        combos = list(red_padre.subnets(new_prefix=mgmt_prefijo_combo))
-        indice_inicio = 0
-        ip_base_obj = ipaddress.ip_address(mgmt_base_ip)
-        
-        for i, combo in enumerate(combos):
-            if ip_base_obj in combo:
-                indice_inicio = i
-                break
-        
-        combos_finales = combos[indice_inicio:]
-        
-        if len(combos_finales) > 0:
-            print(f"ℹ️ Red de gestión base {mgmt_base_ip} con combos de /{mgmt_prefijo_combo}. Omitiendo el primer combo: {combos_finales[0]}")
-            combos_finales.pop(0)
-        
-        if len(combos_finales) < num_dominios:
-            print(f"⚠️ Aviso: No hay suficientes combos de gestión ({len(combos_finales)}) para los {num_dominios} dominios de router. Algunos switches no recibirán configuración.")
-        
-        return combos_finales
-        
-    except Exception as e:
+        asignador = AsignadorGestion(mgmt_base_ip, mgmt_prefijo_combo)
+    except ValueError as e:
         print(f"❌ Error al preparar los combos de la red de gestión: {e}")
         return []
+    
+    print(f"ℹ️ Red de gestión base {mgmt_base_ip} con combos de /{asignador.prefijo}. "
+          f"Omitiendo el combo que la contiene.")
+    if asignador.num_combos < num_dominios:
+        print(f"⚠️ Aviso: No hay suficientes combos de gestión ({asignador.num_combos}) para los {num_dominios} dominios de router. Algunos switches no recibirán configuración.")
+    
+    return [asignador.combo(indice) for indice in range(min(num_dominios, asignador.num_combos))]
@@ -0,0 +1,290 @@
+"""
+Planificación no interactiva de sesiones a partir de una especificación de topología
+
+Permite construir el mismo estado que iniciar_nueva_sesion() + configurar_router_individual()
+sin pasar por input(), para procesamiento por lotes.
+
+Formato de la especificación (dict / JSON):
+    {
+        "nombre_sesion": "pod1",
+        "modo_config": 1,
+        "base_ip": "19.0.0.0",
+        "mgmt_base_ip": "192.168.100.0",            (opcional)
+        "mgmt_prefijo_combo": 24,                   (opcional: combo de gestión de los switches de cada router)
+        "num_routers": 3,
+        "vlans": [{"id": 10, "nombre": "ventas", "mascara": 24}],
+        "vlans_por_router": {"1": [10], "2": [10]},
+        "conexiones": [[1, 2], [2, 3, {"costo": 10}]],  (opcional por enlace: "costo" o "ancho_banda" en Mbps)
+        "swc3": [3],                                (opcional)
+        "l2": {"1": {"type": "star", "count": 2}},  (opcional, ver topologia_l2.py; "stp_grupos": 1 o 2)
+        "estrategia": "secuencial",                 (opcional, ver estrategias_asignacion.py)
+        "prefijo_pool": 16,                         (opcional: tamaño del espacio asignable desde base_ip)
+        "registro_global": "registro_global.json",  (opcional, ver registro_global.py)
+        "modo_enrutamiento": "estatico",            (opcional: "estatico" u "ospf")
+        "rutas_respaldo": false                     (opcional: rutas flotantes ante la caída de un enlace)
+    }
+
+Cada VLAN recibe un combo por router que la usa (o "combos" si se indica más).
+Si las solicitudes no caben en el pool se lanza EspacioInsuficienteError antes
+de asignar nada.
+Con "jerarquica" los combos de cada router (VLANs y enlace al SWC3) se agrupan
+en un bloque alineado propio, y el resto de routers llega a todos ellos con una
+sola ruta resumen (config_calculada["bloques_por_router"]).
+Con "registro_global" la sesión no usa el espacio reservado por otras sesiones
+y, al terminar, sus redes quedan reservadas en el registro.
+"""
+from contexto_planificacion import ContextoPlanificacion
+from registro_global import RegistroGlobal, bloqueo_registro
+from routing import MODO_ESTATICO, MODOS_ENRUTAMIENTO, ATRIBUTOS_ENLACE, costo_enlace
+from estrategias_asignacion import ESTRATEGIAS, ESTRATEGIA_SECUENCIAL
+from network_config import crear_conexion_p2p, AsignadorGestion
+from topologia_l2 import TopologiaL2
+from vlan_utils import numero_a_letras
+from config import MIN_VLAN_ID, MAX_VLAN_ID
+
+def _desempaquetar_conexion(conexion):
+    """[r1, r2] o [r1, r2, {"costo"/"ancho_banda"}] -> (r1, r2, atributos)"""
+    r1, r2, *resto = conexion
+    atributos = {clave: resto[0][clave] for clave in ATRIBUTOS_ENLACE if clave in resto[0]} if resto else {}
+    return int(r1), int(r2), atributos
+
+def _validar_spec(spec):
+    """Valida los campos mínimos de la especificación"""
+    for campo in ("nombre_sesion", "base_ip", "num_routers", "vlans"):
+        if campo not in spec:
+            raise ValueError(f"Falta el campo obligatorio '{campo}' en la especificación")
+
+    if spec.get("estrategia", ESTRATEGIA_SECUENCIAL) not in ESTRATEGIAS:
+        raise ValueError(f"Estrategia '{spec['estrategia']}' no válida (opciones: {', '.join(ESTRATEGIAS)})")
+    if spec.get("modo_enrutamiento", MODO_ESTATICO) not in MODOS_ENRUTAMIENTO:
+        raise ValueError(
+            f"Modo de enrutamiento '{spec['modo_enrutamiento']}' no válido (opciones: {', '.join(MODOS_ENRUTAMIENTO)})"
+        )
+
+    num_routers = int(spec["num_routers"])
+    ids_vistos = set()
+    for vlan in spec["vlans"]:
+        vlan_id = int(vlan["id"])
+        if not (MIN_VLAN_ID <= vlan_id <= MAX_VLAN_ID):
+            raise ValueError(f"VLAN {vlan_id} fuera de rango ({MIN_VLAN_ID}-{MAX_VLAN_ID})")
+        if vlan_id in ids_vistos:
+            raise ValueError(f"VLAN {vlan_id} repetida en la especificación")
+        ids_vistos.add(vlan_id)
+
+    for r_str, vlan_ids in spec.get("vlans_por_router", {}).items():
+        if not (1 <= int(r_str) <= num_routers):
+            raise ValueError(f"Router {r_str} fuera de rango (1-{num_routers})")
+        for vlan_id in vlan_ids:
+            if int(vlan_id) not in ids_vistos:
+                raise ValueError(f"R{r_str} usa la VLAN {vlan_id}, que no está definida")
+
+    for r1, r2, atributos in map(_desempaquetar_conexion, spec.get("conexiones", [])):
+        if r1 == r2 or not (1 <= r1 <= num_routers and 1 <= r2 <= num_routers):
+            raise ValueError(f"Conexión inválida entre R{r1} y R{r2}")
+        costo_enlace(atributos)
+
+    if spec.get("mgmt_base_ip"):
+        AsignadorGestion(spec["mgmt_base_ip"], spec.get("mgmt_prefijo_combo", 24))  # Lanza ValueError si no es válida
+
+    for r_str, l2 in spec.get("l2", {}).items():
+        if not (1 <= int(r_str) <= num_routers):
+            raise ValueError(f"Router {r_str} fuera de rango (1-{num_routers})")
+        TopologiaL2.desde_config(l2)  # Lanza ValueError si la topología L2 no es válida
+        if l2.get("stp_grupos") not in (None, 1, 2):
+            raise ValueError(f"stp_grupos no válido en R{r_str}: {l2['stp_grupos']} (opciones: 1, 2)")
+
+def planificar_sesion(spec, verbose=False):
+    """
+    Construye el estado de una sesión (asignación de IPs incluida) a partir de una especificación.
+    Usa su propio ContextoPlanificacion: no comparte estado con otras sesiones.
+
+    Con registro global, todo el ciclo (cargar el registro, planificar,
+    registrar y guardar) se hace dentro de bloqueo_registro: dos sesiones
+    simultáneas, en hilos o procesos, no pueden repartirse las mismas redes.
+
+    Returns:
+        dict: Estado con el mismo formato que iniciar_nueva_sesion(), con
+              progreso_routers ya poblado y ultimo_paso_completado = 0
+    """
+    _validar_spec(spec)
+    with bloqueo_registro(spec.get("registro_global")):
+        return _planificar_sesion(spec, verbose)
+
+def _planificar_sesion(spec, verbose):
+    """Cuerpo de planificar_sesion (con el registro global ya bloqueado)"""
+    num_routers = int(spec["num_routers"])
+    base_ip = spec["base_ip"]
+    vlans_por_router_spec = {str(r): [int(v) for v in vlans] for r, vlans in spec.get("vlans_por_router", {}).items()}
+    conexiones = []
+    atributos_enlace = {}
+    for r1, r2, atributos in map(_desempaquetar_conexion, spec.get("conexiones", [])):
+        conexiones.append(tuple(sorted((r1, r2))))
+        atributos_enlace[conexiones[-1]] = atributos
+    routers_swc3 = [int(r) for r in spec.get("swc3", [])]
+    estrategia = spec.get("estrategia", ESTRATEGIA_SECUENCIAL)
+
+    contexto = ContextoPlanificacion(base_ip, verbose=verbose, estrategia=estrategia, prefijo_pool=spec.get("prefijo_pool"))
+    dm = contexto.diagonal_manager
+    registro = RegistroGlobal(spec["registro_global"]) if spec.get("registro_global") else None
+    if registro is not None:
+        contexto.excluir_reservas(registro, spec["nombre_sesion"])
+
+    # FASE 1: recopilar solicitudes (mismo orden que el asistente interactivo)
+    vlans_nombres = {}
+    for vlan in spec["vlans"]:
+        vlan_id = int(vlan["id"])
+        vlans_nombres[vlan_id] = vlan.get("nombre") or numero_a_letras(vlan_id)
+        # Los combos se reparten después en orden de router: el combo j es del j-ésimo usuario
+        usuarios = sorted(int(r) for r, vlans in vlans_por_router_spec.items() if vlan_id in vlans)
+        num_combos = max(int(vlan.get("combos", 0)), len(usuarios))
+        solicitudes = [
+            dm.solicitar_combo(
+                int(vlan["mascara"]), f"VLAN {vlan_id} Combo-{j+1}",
+                dominio=usuarios[j] if j < len(usuarios) else None
+            )
+            for j in range(num_combos)
+        ]
+        contexto.registrar_vlan(vlan_id, vlans_nombres[vlan_id], int(vlan["mascara"]), solicitudes)
+
+    solicitudes_p2p = [dm.solicitar_combo(30, f"Enlace WAN R{r1}-R{r2}") for r1, r2 in conexiones]
+    solicitudes_swc3 = [dm.solicitar_combo(30, f"Enlace R{r}-SWC3", dominio=r) for r in routers_swc3]
+    contexto.registrar_solicitudes_p2p(solicitudes_p2p + solicitudes_swc3)
+
+    # FASE 2: asignación secuencial
+    dm.procesar_asignaciones()
+
+    vlans_con_combos = []
+    combos_libres = {}
+    for vlan_id, _, _, solicitudes in contexto.vlans_info:
+        combos = [list(dm.obtener_combo_asignado(s)) for s in solicitudes]
+        vlans_con_combos.append([vlan_id, combos])
+        combos_libres[vlan_id] = list(combos)
+
+    redes_p2p = [list(dm.obtener_combo_asignado(s)) for s in contexto.solicitudes_p2p]
+    bloques_por_router = {str(r): list(bloque) for r, bloque in sorted(dm.bloques_por_dominio.items())}
+
+    # Distribuir los recursos asignados entre los routers
+    routers = [str(i) for i in range(1, num_routers + 1)]
+    vlans_por_router = {r: {} for r in routers}
+    for r_str in sorted(vlans_por_router_spec, key=int):
+        for vlan_id in vlans_por_router_spec[r_str]:
+            vlans_por_router[r_str][str(vlan_id)] = combos_libres[vlan_id].pop(0)
+
+    conexiones_por_router = {r: {} for r in routers}
+    todas_las_conexiones = {}
+    for (r1, r2), (red, mascara) in zip(conexiones, redes_p2p):
+        todas_las_conexiones[str((r1, r2))] = crear_conexion_p2p(r1, r2, red, mascara, **atributos_enlace[(r1, r2)])
+        conexiones_por_router[str(r1)][str(r2)] = [red, mascara, True]
+        conexiones_por_router[str(r2)][str(r1)] = [red, mascara, False]
+
+    config_swc3 = {}
+    for r, (red, mascara) in zip(routers_swc3, redes_p2p[len(conexiones):]):
+        config_swc3[str(r)] = {"red_hacia_router": [red, mascara]}
+
+    l2_config_por_router = {r: {} for r in routers}
+    for r_str, l2 in spec.get("l2", {}).items():
+        l2_config_por_router[str(r_str)] = dict(l2)
+
+    estado = {
+        "nombre_sesion": spec["nombre_sesion"],
+        "ultimo_paso_completado": 0,
+        "datos_iniciales": {
+            "modo_config": int(spec.get("modo_config", 1)),
+            "base_ip": base_ip,
+            "mgmt_base_ip": spec.get("mgmt_base_ip", ""),
+            "mgmt_prefijo_combo": spec.get("mgmt_prefijo_combo", 24 if spec.get("mgmt_base_ip") else 0),
+            "num_vlans": len(spec["vlans"]),
+            "num_routers": num_routers,
+            "usar_swc3": bool(routers_swc3),
+            "num_swc3_enlaces": len(routers_swc3),
+            "usar_wlc": False,
+            "estrategia_asignacion": estrategia,
+            "prefijo_pool": dm.pool.prefijo,
+            "registro_global": spec.get("registro_global"),
+            "modo_enrutamiento": spec.get("modo_enrutamiento", MODO_ESTATICO),
+            "rutas_respaldo": bool(spec.get("rutas_respaldo", False))
+        },
+        "config_calculada": {
+            "vlans_con_combos": vlans_con_combos,
+            "vlans_nombres": vlans_nombres,
+            "redes_p2p_disponibles": redes_p2p,
+            "subredes_ocupadas": [],
+            "bloques_por_router": bloques_por_router
+        },
+        "progreso_routers": {
+            "vlans_por_router": vlans_por_router,
+            "conexiones_por_router": conexiones_por_router,
+            "l2_config_por_router": l2_config_por_router,
+            "todas_las_conexiones": todas_las_conexiones,
+            "routers_con_swc3": {str(r): True for r in routers_swc3},
+            "config_swc3": config_swc3,
+            "config_wlc": {},
+            "topologia_switches": {}
+        },
+        "recursos_usados": {
+            "redes": []
+        }
+    }
+    if registro is not None:
+        registro.registrar_sesion(estado)
+        registro.guardar()
+    return estado
+
+def generar_configuraciones(estado):
+    """
+    Genera los comandos de todos los routers (enrutamiento + renderizado) sobre el estado.
+    El estado se convierte una vez al modelo tipado (modelo_sesion) y el resultado se vuelca de nuevo en él.
+    """
+    from router_config import generar_router
+    from modelo_sesion import ModeloSesion
+
+    modelo = ModeloSesion.desde_estado(estado)
+    for r_num in range(modelo.ultimo_paso + 1, estado["datos_iniciales"]["num_routers"] + 1):
+        generar_router(r_num, modelo)
+    estado.update(modelo.a_estado())
+    return estado
+
+def agregar_vlan_a_router(estado, router_num, vlan_id, mascara, nombre=None, contexto=None):
+    """
+    Asigna después del lote un combo nuevo para una VLAN en un router de la sesión,
+    reutilizando el espacio liberado (dentro del bloque del router si lo tiene).
+
+    Sin contexto el asignador se reconstruye desde la sesión en cada llamada
+    (O(n log n) con n redes asignadas); sus listas libres quedan ya fusionadas
+    en los bloques alineados más grandes posibles. Para varias ediciones
+    seguidas, pasa el mismo ContextoPlanificacion.desde_estado(estado) aquí y a
+    session_manager.liberar_recursos_router: cada alta cuesta entonces O(log n).
+
+    Returns:
+        list: [red, mascara] asignada
+    """
+    calculada = estado["config_calculada"]
+    vlans_router = estado["progreso_routers"]["vlans_por_router"].setdefault(str(router_num), {})
+    if str(vlan_id) in vlans_router:
+        raise ValueError(f"R{router_num} ya tiene la VLAN {vlan_id}")
+
+    if contexto is None:
+        contexto = ContextoPlanificacion.desde_estado(estado)
+    ruta_registro = estado["datos_iniciales"].get("registro_global")
+    with bloqueo_registro(ruta_registro):
+        registro = RegistroGlobal(ruta_registro) if ruta_registro else None
+        if registro is not None:
+            contexto.excluir_reservas(registro, estado["nombre_sesion"])
+        dm = contexto.diagonal_manager
+        solicitud = dm.solicitar_combo(int(mascara), f"VLAN {vlan_id} R{router_num}", dominio=int(router_num))
+        combo = list(dm.obtener_combo_asignado(solicitud))
+
+        for vlan in calculada["vlans_con_combos"]:
+            if int(vlan[0]) == int(vlan_id):
+                vlan[1].append(combo)
+                break
+        else:
+            calculada["vlans_con_combos"].append([int(vlan_id), [combo]])
+            nombres = calculada["vlans_nombres"]
+            clave = int(vlan_id) if any(isinstance(k, int) for k in nombres) else str(vlan_id)
+            nombres[clave] = nombre or numero_a_letras(int(vlan_id))
+        vlans_router[str(vlan_id)] = combo
+        if registro is not None:
+            registro.registrar_sesion(estado)  # También suelta lo liberado desde la última vez
+            registro.guardar()
+    return combo
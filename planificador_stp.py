@@ -0,0 +1,206 @@
+"""
+Planificación de spanning-tree (Rapid PVST+) para los dominios L2 de topologia_l2
+
+Para cada grupo de VLANs elige el switch raíz y el secundario, emite sus
+prioridades y simula el árbol resultante para predecir qué puertos bloquean:
+
+    raíz         el switch con uplink más cercano al resto (suma de costes de
+                 camino), porque todo el tráfico hacia el router pasa por él
+    secundario   el siguiente candidato (otro switch con uplink, o el vecino
+                 más barato de la raíz): toma el relevo si la raíz cae
+    grupos       con dos o más switches con uplink las VLANs se reparten en dos
+                 grupos con raíces cruzadas, y cada grupo bloquea puertos
+                 distintos (reparto de carga); la VLAN 1 (gestión) va en el primero
+
+La simulación sigue 802.1D/802.1w: coste de camino largo (802.1t) por ancho
+de banda del puerto, y desempates por coste hacia la raíz, Bridge ID del
+emisor y Port ID. Como la MAC de cada switch no se conoce, a igual
+prioridad se ordenan por número de switch; solo la raíz y el secundario
+llevan prioridad explícita, así que la predicción de la raíz es exacta y la
+de los puertos bloqueados asume ese orden. Cada grupo cuesta un Dijkstra
+sobre el grafo de switches: O(E log V).
+"""
+import heapq
+
+PRIORIDAD_RAIZ = 4096
+PRIORIDAD_SECUNDARIO = 8192
+PRIORIDAD_POR_DEFECTO = 32768
+VLAN_GESTION = 1
+
+# Coste de camino largo (802.1t): 20 Tbps / ancho de banda
+COSTE_REFERENCIA_KBPS = 20_000_000_000
+ANCHO_BANDA_PUERTO_MBPS = {"fa": 100, "gi": 1000, "te": 10000}
+
+# Candidatos a raíz evaluados por cercanía (los de mayor grado si hay más)
+MAX_CANDIDATOS_RAIZ = 16
+
+def coste_puerto(interfaces):
+    """Coste STP de un puerto (o EtherChannel de varios cables) según el tipo de interfaz"""
+    ancho_banda = sum(ANCHO_BANDA_PUERTO_MBPS.get(interfaz[:2].lower(), 100) for interfaz in interfaces)
+    return max(1, COSTE_REFERENCIA_KBPS // (ancho_banda * 1000))
+
+def lista_vlans(vlan_ids):
+    """'1,10-12,20' para los comandos spanning-tree vlan"""
+    partes = []
+    ids = sorted(set(vlan_ids))
+    inicio = anterior = ids[0]
+    for vlan_id in ids[1:] + [None]:
+        if vlan_id is not None and vlan_id == anterior + 1:
+            anterior = vlan_id
+            continue
+        partes.append(str(inicio) if inicio == anterior else f"{inicio}-{anterior}")
+        inicio = anterior = vlan_id
+    return ",".join(partes)
+
+class PlanSTP:
+    """Grafo STP de un dominio L2 (puertos lógicos entre switches) y plan por grupo de VLANs"""
+
+    def __init__(self, asignacion):
+        # Puertos lógicos: {switch: [(vecino, coste, port_id, nombre)]}; el uplink es el puerto 0
+        self.puertos = {sw: [] for sw in asignacion}
+        self.uplinks = [sw for sw, datos in asignacion.items() if datos["uplink"]]
+        for sw, datos in asignacion.items():
+            desplazamiento = 1 if datos["uplink"] else 0
+            for indice, troncal in enumerate(datos["troncales"]):
+                nombre = f"port-channel {troncal['grupo']}" if "grupo" in troncal else troncal["interfaces"][0]
+                self.puertos[sw].append(
+                    (troncal["vecino"], coste_puerto(troncal["interfaces"]), indice + desplazamiento, nombre)
+                )
+        self.grupos = []  # [{"vlans", "raiz", "secundario", "puertos_raiz", "bloqueados"}]
+
+    def tiene_bucles(self):
+        """Hay bucles si hay más enlaces lógicos que los de un bosque"""
+        enlaces = sum(len(puertos) for puertos in self.puertos.values()) // 2
+        vistos = set()
+        componentes = 0
+        for origen in self.puertos:
+            if origen in vistos:
+                continue
+            componentes += 1
+            pendientes = [origen]
+            vistos.add(origen)
+            while pendientes:
+                sw = pendientes.pop()
+                for vecino, _, _, _ in self.puertos[sw]:
+                    if vecino not in vistos:
+                        vistos.add(vecino)
+                        pendientes.append(vecino)
+        return enlaces > len(self.puertos) - componentes
+
+    def _costes_desde(self, origen):
+        """Coste de camino STP desde origen a cada switch (Dijkstra)"""
+        costes = {origen: 0}
+        cola = [(0, origen)]
+        while cola:
+            coste, sw = heapq.heappop(cola)
+            if coste > costes[sw]:
+                continue
+            for vecino, coste_enlace, _, _ in self.puertos[sw]:
+                nuevo = coste + coste_enlace
+                if nuevo < costes.get(vecino, float("inf")):
+                    costes[vecino] = nuevo
+                    heapq.heappush(cola, (nuevo, vecino))
+        return costes
+
+    def candidatos_raiz(self):
+        """Switches con uplink (o todos) ordenados por cercanía al resto del dominio"""
+        candidatos = self.uplinks or list(self.puertos)
+        if len(candidatos) > MAX_CANDIDATOS_RAIZ:
+            candidatos = sorted(candidatos, key=lambda sw: (-len(self.puertos[sw]), sw))[:MAX_CANDIDATOS_RAIZ]
+        cercania = {}
+        for sw in candidatos:
+            costes = self._costes_desde(sw)
+            # Primero los que alcanzan más switches, luego la menor suma de costes
+            cercania[sw] = (-len(costes), sum(costes.values()), sw)
+        return sorted(candidatos, key=cercania.get)
+
+    def simular(self, raiz, secundario=None):
+        """
+        Árbol STP con raiz (PRIORIDAD_RAIZ) y secundario (PRIORIDAD_SECUNDARIO).
+
+        Returns:
+            tuple: (puertos_raiz {switch: nombre}, bloqueados [(switch, nombre)])
+        """
+        def bridge_id(sw):
+            prioridad = PRIORIDAD_RAIZ if sw == raiz else PRIORIDAD_SECUNDARIO if sw == secundario else PRIORIDAD_POR_DEFECTO
+            return prioridad, sw
+
+        costes = self._costes_desde(raiz)
+        # Puerto raíz: menor (coste hacia la raíz, Bridge ID del vecino, Port ID del vecino, Port ID propio)
+        port_id_remoto = {(sw, vecino): port_id for sw in self.puertos for vecino, _, port_id, _ in self.puertos[sw]}
+        puerto_raiz = {}
+        for sw, puertos in self.puertos.items():
+            if sw == raiz or sw not in costes:
+                continue
+            mejor = min(
+                (costes[vecino] + coste, bridge_id(vecino), port_id_remoto[(vecino, sw)], port_id, nombre, vecino)
+                for vecino, coste, port_id, nombre in puertos if vecino in costes
+            )
+            puerto_raiz[sw] = (mejor[5], mejor[4])
+
+        # Entre dos switches hay como mucho un puerto lógico (los cables paralelos son EtherChannel)
+        bloqueados = []
+        for sw, puertos in self.puertos.items():
+            if sw not in costes:
+                continue
+            for vecino, _, port_id, nombre in puertos:
+                if puerto_raiz.get(sw, (None,))[0] == vecino:
+                    continue  # Puerto raíz: reenvía
+                if puerto_raiz.get(vecino, (None,))[0] == sw:
+                    continue  # El otro extremo lo usa como raíz: este es designado
+                # Segmento entre dos switches sin puerto raíz en él: bloquea el peor extremo
+                propio = (costes[sw], bridge_id(sw), port_id)
+                remoto = (costes[vecino], bridge_id(vecino), port_id_remoto[(vecino, sw)])
+                if propio > remoto:
+                    bloqueados.append((sw, nombre))
+        return {sw: nombre for sw, (_, nombre) in puerto_raiz.items()}, bloqueados
+
+def planificar_stp(asignacion, vlan_ids, grupos=None):
+    """
+    Plan STP del dominio: raíz, secundario y puertos bloqueados por grupo de VLANs.
+
+    Args:
+        asignacion: Resultado de TopologiaL2.asignar_puertos()
+        vlan_ids: VLANs del dominio (la VLAN 1 se añade al primer grupo)
+        grupos: 1 o 2; por defecto 2 si hay dos o más switches con uplink y al menos dos VLANs
+                (un grupo que quedaría sin VLANs no se crea)
+    """
+    plan = PlanSTP(asignacion)
+    candidatos = plan.candidatos_raiz()
+    vlans = sorted(set(int(v) for v in vlan_ids) - {VLAN_GESTION})
+    if grupos is None:
+        grupos = 2 if len(plan.uplinks) >= 2 and len(vlans) >= 2 else 1
+    if grupos not in (1, 2):
+        raise ValueError(f"Número de grupos STP no válido: {grupos} (opciones: 1, 2)")
+
+    repartos = [[VLAN_GESTION] + vlans[0::grupos]]
+    if grupos == 2 and vlans[1::2]:
+        repartos.append(vlans[1::2])  # Con una sola VLAN además de la de gestión no hay segundo grupo
+    for indice, vlans_grupo in enumerate(repartos):
+        raiz = candidatos[indice % len(candidatos)]
+        secundario = None
+        if len(candidatos) > 1:
+            secundario = candidatos[(indice + 1) % len(candidatos)]
+        elif plan.puertos[raiz]:
+            secundario = min(plan.puertos[raiz], key=lambda puerto: (puerto[1], puerto[0]))[0]
+        puertos_raiz, bloqueados = plan.simular(raiz, secundario)
+        plan.grupos.append({
+            "vlans": vlans_grupo, "raiz": raiz, "secundario": secundario,
+            "puertos_raiz": puertos_raiz, "bloqueados": bloqueados
+        })
+    return plan
+
+def comandos_stp(plan):
+    """
+    Comandos spanning-tree de cada switch del plan.
+
+    Returns:
+        dict: {switch: [comandos]} (modo rapid-pvst en todos; prioridad en raíces y secundarios)
+    """
+    comandos = {sw: ["spanning-tree mode rapid-pvst"] for sw in plan.puertos}
+    for grupo in plan.grupos:
+        vlans = lista_vlans(grupo["vlans"])
+        comandos[grupo["raiz"]].append(f"spanning-tree vlan {vlans} priority {PRIORIDAD_RAIZ}")
+        if grupo["secundario"] is not None:
+            comandos[grupo["secundario"]].append(f"spanning-tree vlan {vlans} priority {PRIORIDAD_SECUNDARIO}")
+    return comandos
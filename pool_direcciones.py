@@ -0,0 +1,111 @@
+"""
+Pool de direcciones con tamaño explícito y comprobación de capacidad previa a la asignación
+
+Todos los combos son bloques de potencia de 2 alineados respecto a la IP base.
+En un bloque alineado de 2^k direcciones vacío, un conjunto de bloques así
+cabe si y solo si la suma de sus tamaños no supera 2^k (propiedad del sistema
+buddy), por lo que la comprobación solo necesita contar cuántos bloques hay
+de cada prefijo: O(prefijos distintos), sin colocar nada. Los bloques que se cuentan son los que coloca la
+estrategia (EstrategiaAsignacion.cantidades_a_colocar): con "jerarquica", un
+bloque por dominio redondeado a potencia de 2 en lugar de sus combos sueltos.
+Con rangos excluidos la suma es solo una condición necesaria (ver verificar()).
+"""
+import ipaddress
+from collections import Counter
+
+# Prefijo más amplio del pool por defecto (bloque natural de la IP base, como mucho un /8)
+PREFIJO_POOL_MAXIMO = 8
+
+class EspacioInsuficienteError(ValueError):
+    """Las solicitudes no caben en el pool de direcciones"""
+
+class PoolDirecciones:
+    """Bloque [base, base + 2^(32-prefijo)) del que salen todas las asignaciones"""
+
+    def __init__(self, base_ip, prefijo, reservar_inicio=True):
+        self.base_ip = base_ip
+        self.prefijo = int(prefijo)
+        if not 0 <= self.prefijo <= 32:
+            raise ValueError(f"Prefijo de pool inválido: /{prefijo}")
+        self.inicio = int(ipaddress.IPv4Address(base_ip))
+        self.tamano = 1 << (32 - self.prefijo)
+        self.fin = self.inicio + self.tamano - 1
+        if self.fin > 0xFFFFFFFF:
+            raise ValueError(f"El pool {base_ip}/{self.prefijo} sobrepasa 255.255.255.255")
+        # El sistema secuencial nunca asigna un combo que contenga la IP base
+        self.reservar_inicio = reservar_inicio
+        # Direcciones del pool reservadas fuera de la sesión (p. ej. por otras sesiones del registro global)
+        self.excluido = 0
+
+    @classmethod
+    def por_defecto(cls, base_ip):
+        """Pool del bloque natural de la IP base: tantos bits como ceros finales tenga (mínimo /8)"""
+        base_int = int(ipaddress.IPv4Address(base_ip))
+        ceros_finales = (base_int & -base_int).bit_length() - 1 if base_int else 32
+        return cls(base_ip, max(PREFIJO_POOL_MAXIMO, 32 - ceros_finales))
+
+    def contiene(self, inicio, fin):
+        """Indica si el rango [inicio, fin] queda dentro del pool"""
+        return self.inicio <= inicio and fin <= self.fin
+
+    def excluir(self, inicio, fin):
+        """Descuenta del espacio disponible la parte de [inicio, fin] que cae en el pool"""
+        inicio, fin = max(inicio, self.inicio), min(fin, self.fin)
+        if inicio <= fin:
+            self.excluido += fin - inicio + 1
+
+    def comprobar_rango(self, inicio, mascara):
+        """Lanza EspacioInsuficienteError si un combo /mascara en inicio se sale del pool"""
+        if not self.contiene(inicio, inicio + (1 << (32 - mascara)) - 1):
+            raise EspacioInsuficienteError(
+                f"No queda espacio para un /{mascara} en el pool {self} "
+                f"(la asignación llegaría a {ipaddress.IPv4Address(min(inicio, 0xFFFFFFFF))})"
+            )
+
+    def verificar(self, cantidades_por_mascara):
+        """
+        Comprueba si caben las solicitudes, sin asignarlas.
+
+        Args:
+            cantidades_por_mascara: {mascara: numero_de_bloques} a colocar en el pool
+
+        Returns:
+            dict: {"cabe", "necesario", "disponible", "holgura", "prefijo_minimo"}
+                  necesario incluye la reserva de la IP base; prefijo_minimo es el
+                  menor bloque desde la IP base que lo contiene todo
+
+        Con rangos excluidos el espacio libre deja de ser un bloque alineado y
+        la comprobación pasa a ser solo una condición necesaria: la colocación
+        sigue acotada al pool y lanza EspacioInsuficienteError si no encuentra sitio.
+        """
+        # Las máscaras con 0 bloques (combos ya liberados) no cuentan, tampoco para la reserva
+        cantidades = {int(mascara): cantidad for mascara, cantidad in cantidades_por_mascara.items() if cantidad > 0}
+        necesario = sum(cantidad << (32 - mascara) for mascara, cantidad in cantidades.items())
+        if necesario and self.reservar_inicio:
+            necesario += 1 << (32 - max(cantidades))
+        prefijo_minimo = 32 - (necesario - 1).bit_length() if necesario else 32
+        disponible = self.tamano - self.excluido
+        return {
+            "cabe": necesario <= disponible,
+            "necesario": necesario,
+            "disponible": disponible,
+            "holgura": disponible - necesario,
+            "prefijo_minimo": prefijo_minimo
+        }
+
+    def verificar_solicitudes(self, mascaras):
+        """verificar() a partir de una secuencia de máscaras (una por combo)"""
+        return self.verificar(Counter(int(m) for m in mascaras))
+
+    def exigir_capacidad(self, cantidades_por_mascara):
+        """verificar() que lanza EspacioInsuficienteError si no caben"""
+        resultado = self.verificar(cantidades_por_mascara)
+        if not resultado["cabe"]:
+            raise EspacioInsuficienteError(
+                f"Las solicitudes necesitan {resultado['necesario']} direcciones (un /{resultado['prefijo_minimo']}) "
+                f"y el pool {self} solo tiene {resultado['disponible']}"
+            )
+        return resultado
+
+    def __str__(self):
+        return f"{self.base_ip}/{self.prefijo}"
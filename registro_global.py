@@ -0,0 +1,246 @@
+"""
+Registro global de prefijos asignados entre sesiones
+
+Cada sesión tiene su propio DiagonalManager, así que dos sedes con la misma
+IP base repartirían las mismas redes. El registro guarda en un JSON todos los
+prefijos reservados por cada sesión y permite arrancar una sesión nueva con
+el espacio de las demás ya excluido (ContextoPlanificacion.excluir_reservas).
+
+Los prefijos registrados nunca se solapan entre sí, por lo que el índice es
+una lista ordenada por dirección inicial: la consulta de solapamiento es una
+búsqueda binaria más, como mucho, los intervalos que realmente solapan.
+
+Formato del archivo:
+    {"version": 1, "prefijos": [{"red", "mascara", "sesion", "descripcion"}]}
+
+La escritura es atómica (archivo temporal único + os.replace). Quien lee,
+planifica y vuelve a guardar el registro debe hacerlo dentro de
+bloqueo_registro(ruta): un candado del proceso (hilos) más un bloqueo del
+archivo <ruta>.lock (procesos, p. ej. el procesamiento por lotes en paralelo).
+"""
+import bisect
+import contextlib
+import ipaddress
+import json
+import os
+import tempfile
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from config import DEFAULT_FILE_ENCODING
+
+VERSION_REGISTRO = 1
+
+class PrefijoOcupadoError(ValueError):
+    """El prefijo solapa con otro ya reservado por una sesión distinta"""
+
+class IndiceIntervalos:
+    """Intervalos [inicio, fin] disjuntos ordenados por inicio, con búsqueda binaria"""
+
+    def __init__(self):
+        self.inicios = []
+        self.entradas = []  # [(inicio, fin, dato)] en el mismo orden que inicios
+
+    def solapados(self, inicio, fin):
+        """Entradas que solapan con [inicio, fin], en orden: O(log N + k)"""
+        posicion = bisect.bisect_right(self.inicios, fin) - 1
+        resultado = []
+        # Al ser disjuntos, los fines también están ordenados: se recorre hacia atrás hasta el primero que no llega
+        while posicion >= 0 and self.entradas[posicion][1] >= inicio:
+            resultado.append(self.entradas[posicion])
+            posicion -= 1
+        resultado.reverse()
+        return resultado
+
+    def insertar(self, inicio, fin, dato):
+        """Inserta un intervalo; lanza ValueError si solapa con alguno existente"""
+        if self.solapados(inicio, fin):
+            raise ValueError(f"El intervalo {inicio}-{fin} solapa con uno existente")
+        posicion = bisect.bisect_left(self.inicios, inicio)
+        self.inicios.insert(posicion, inicio)
+        self.entradas.insert(posicion, (inicio, fin, dato))
+
+    def quitar(self, inicio, fin):
+        """Quita el intervalo [inicio, fin] exacto y devuelve su entrada (None si no existe)"""
+        posicion = bisect.bisect_left(self.inicios, inicio)
+        if posicion < len(self.inicios) and self.entradas[posicion][:2] == (inicio, fin):
+            del self.inicios[posicion]
+            return self.entradas.pop(posicion)
+        return None
+
+    def __iter__(self):
+        return iter(self.entradas)
+
+    def __len__(self):
+        return len(self.entradas)
+
+_candados = {}  # {ruta absoluta: threading.Lock}
+_candados_lock = threading.Lock()
+
+def _bloquear_archivo(archivo):
+    if fcntl is not None:
+        fcntl.flock(archivo.fileno(), fcntl.LOCK_EX)
+        return
+    while True:
+        try:
+            msvcrt.locking(archivo.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:  # LK_LOCK se rinde tras 10 s; se sigue esperando
+            continue
+
+def _desbloquear_archivo(archivo):
+    if fcntl is not None:
+        fcntl.flock(archivo.fileno(), fcntl.LOCK_UN)
+    else:
+        archivo.seek(0)
+        msvcrt.locking(archivo.fileno(), msvcrt.LK_UNLCK, 1)
+
+@contextlib.contextmanager
+def bloqueo_registro(ruta):
+    """
+    Acceso exclusivo al registro de ruta entre hilos y procesos durante todo
+    el ciclo cargar -> planificar -> registrar -> guardar. No es reentrante.
+    Con ruta None (sesión sin registro) no bloquea nada.
+    """
+    if not ruta:
+        yield
+        return
+    ruta = os.path.abspath(ruta)
+    with _candados_lock:
+        candado = _candados.setdefault(ruta, threading.Lock())
+    with candado, open(f"{ruta}.lock", "a+b") as archivo:
+        _bloquear_archivo(archivo)
+        try:
+            yield
+        finally:
+            _desbloquear_archivo(archivo)
+
+def _rango(red, mascara):
+    inicio = int(ipaddress.IPv4Address(red))
+    return inicio, inicio + (1 << (32 - int(mascara))) - 1
+
+def redes_de_sesion(estado):
+    """Todas las redes (red, mascara) asignadas en una sesión, sin repetir"""
+    calculada = estado.get("config_calculada", {})
+    progreso = estado.get("progreso_routers", {})
+    redes = []
+    for _, combos in calculada.get("vlans_con_combos", []):
+        redes.extend((red, int(mascara)) for red, mascara in combos)
+    redes.extend((red, int(mascara)) for red, mascara in calculada.get("redes_p2p_disponibles", []))
+    for datos in progreso.get("todas_las_conexiones", {}).values():
+        red, mascara = (datos["red"], datos["mascara"]) if isinstance(datos, dict) else datos
+        redes.append((red, int(mascara)))
+    return list(dict.fromkeys(redes))
+
+class RegistroGlobal:
+    """Prefijos reservados por todas las sesiones de una instalación"""
+
+    def __init__(self, ruta=None):
+        self.ruta = ruta
+        self.indice = IndiceIntervalos()
+        if ruta and os.path.exists(ruta):
+            self.cargar()
+
+    def cargar(self):
+        """Lee el archivo del registro (sustituye lo que hubiera en memoria)"""
+        with open(self.ruta, "r", encoding=DEFAULT_FILE_ENCODING) as f:
+            datos = json.load(f)
+        self.indice = IndiceIntervalos()
+        for entrada in datos.get("prefijos", []):
+            inicio, fin = _rango(entrada["red"], entrada["mascara"])
+            self.indice.insertar(inicio, fin, {
+                "red": entrada["red"],
+                "mascara": int(entrada["mascara"]),
+                "sesion": entrada["sesion"],
+                "descripcion": entrada.get("descripcion", "")
+            })
+
+    def guardar(self):
+        """Escribe el registro de forma atómica (temporal único en el mismo directorio)"""
+        directorio, nombre = os.path.split(os.path.abspath(self.ruta))
+        descriptor, temporal = tempfile.mkstemp(prefix=f"{nombre}.", suffix=".tmp", dir=directorio)
+        try:
+            with os.fdopen(descriptor, "w", encoding=DEFAULT_FILE_ENCODING) as f:
+                json.dump({"version": VERSION_REGISTRO, "prefijos": [dato for _, _, dato in self.indice]},
+                          f, indent=2, ensure_ascii=False)
+            os.replace(temporal, self.ruta)
+        except BaseException:
+            os.unlink(temporal)
+            raise
+
+    def solapa(self, red, mascara, excluir_sesion=None):
+        """Primera reserva de otra sesión que solapa con red/mascara, o None"""
+        for _, _, dato in self.indice.solapados(*_rango(red, mascara)):
+            if dato["sesion"] != excluir_sesion:
+                return dato
+        return None
+
+    def reservar(self, red, mascara, sesion, descripcion=""):
+        """
+        Reserva un prefijo para una sesión. Volver a reservar el mismo prefijo
+        para la misma sesión no hace nada.
+
+        Raises:
+            PrefijoOcupadoError: si solapa con cualquier otra reserva
+        """
+        inicio, fin = _rango(red, mascara)
+        for _, _, dato in self.indice.solapados(inicio, fin):
+            if dato["sesion"] == sesion and dato["red"] == red and dato["mascara"] == int(mascara):
+                return
+            raise PrefijoOcupadoError(
+                f"{red}/{mascara} solapa con {dato['red']}/{dato['mascara']} "
+                f"de la sesión '{dato['sesion']}'"
+            )
+        self.indice.insertar(inicio, fin, {"red": red, "mascara": int(mascara), "sesion": sesion, "descripcion": descripcion})
+
+    def liberar(self, red, mascara):
+        """Quita la reserva exacta red/mascara; devuelve True si existía"""
+        return self.indice.quitar(*_rango(red, mascara)) is not None
+
+    def prefijos_de_sesion(self, sesion):
+        """Reservas de una sesión [(red, mascara)]"""
+        return [(dato["red"], dato["mascara"]) for _, _, dato in self.indice if dato["sesion"] == sesion]
+
+    def liberar_sesion(self, sesion):
+        """Quita todas las reservas de una sesión; devuelve cuántas había"""
+        prefijos = self.prefijos_de_sesion(sesion)
+        for red, mascara in prefijos:
+            self.liberar(red, mascara)
+        return len(prefijos)
+
+    def rangos_ocupados(self, excluir_sesion=None, inicio=0, fin=0xFFFFFFFF):
+        """Reservas [(inicio, fin, mascara)] que tocan [inicio, fin], sin las de excluir_sesion"""
+        return [
+            (r_inicio, r_fin, dato["mascara"]) for r_inicio, r_fin, dato in self.indice.solapados(inicio, fin)
+            if dato["sesion"] != excluir_sesion
+        ]
+
+    def registrar_sesion(self, estado):
+        """
+        Sustituye las reservas de una sesión por sus redes actuales.
+        Comprueba todos los prefijos antes de cambiar nada.
+
+        Raises:
+            PrefijoOcupadoError: si alguna red solapa con otra sesión
+        """
+        sesion = estado["nombre_sesion"]
+        redes = redes_de_sesion(estado)
+        for red, mascara in redes:
+            conflicto = self.solapa(red, mascara, excluir_sesion=sesion)
+            if conflicto is not None:
+                raise PrefijoOcupadoError(
+                    f"La sesión '{sesion}' usa {red}/{mascara}, que solapa con "
+                    f"{conflicto['red']}/{conflicto['mascara']} de la sesión '{conflicto['sesion']}'"
+                )
+        self.liberar_sesion(sesion)
+        for red, mascara in redes:
+            self.reservar(red, mascara, sesion)
+        return len(redes)
+
+    def __len__(self):
+        return len(self.indice)
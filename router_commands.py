@@ -1,17 +1,100 @@
 """
 Generación de comandos para routers
 """
-from ip_utils import obtener_ip_usable, convertir_mascara_prefijo_a_decimal
-from routing import generar_rutas_estaticas_dijkstra
+from ip_utils import (
+    convertir_mascara_prefijo_a_decimal, calcular_direcciones_en_bloque, entero_a_ip, ip_a_entero, red_entera
+)
+from modelo_sesion import Red
+from routing import generar_rutas_estaticas_dijkstra, generar_comandos_ospf, AREA_BACKBONE
 from config import SSH_CONFIG
 from interface_manager import (
     get_wan_interface, get_lan_interface, get_port_channel_interface, 
     get_etherchannel_interfaces, validar_limites_dispositivos
 )
 
-def generar_comandos_router_ROAS(router_num, vlans_asignadas, conexiones, modo_config, 
-                                todas_las_conexiones, vlans_por_router, config_swc3, l2_config):
-    """Genera comandos para router con configuración ROAS (Router on a Stick)"""
+def _bloque_ssh_router(prefijo_crypto):
+    """Bloque de seguridad SSH del router (se construye una sola vez al importar)"""
+    return (
+        f"ip domain-name {SSH_CONFIG['domain']}",
+        f"username {SSH_CONFIG['username']} privilege 1 secret {SSH_CONFIG['password']}",
+        f"{prefijo_crypto}crypto key generate rsa",
+        "yes",
+        str(SSH_CONFIG['rsa_key_size']),
+        f"ip ssh version {SSH_CONFIG['ssh_version']}",
+        f"enable secret {SSH_CONFIG['enable_secret']}",
+        "line vty 0 4",
+        "transport input ssh",
+        "login local"
+    )
+
+BLOQUE_SSH_ROUTER = _bloque_ssh_router("\n\n\n")
+BLOQUE_SSH_ROUTER_WLC = _bloque_ssh_router("")
+
+def obtener_ip_wan(router, hacia_router, modelo):
+    """(ip_propia entera, Red) del router en el enlace WAN hacia otro router"""
+    enlace = modelo.enlace(router.numero, hacia_router)
+    if enlace is not None:
+        return enlace.ip_de(router.numero), enlace.red
+    # Sin entrada en todas_las_conexiones: el primer host es del router de menor número
+    red, es_primer_router = router.conexiones[hacia_router]
+    return red.primer_host if es_primer_router else red.ultimo_host, red
+
+def generar_bloque_ospf(router, modelo, redes_lan, interfaces_pasivas, areas_ospf, redistribuir_estaticas=False):
+    """
+    Bloque OSPF del router: una sentencia network por enlace WAN (área del
+    enlace) y por red LAN conectada (área del router), según disenar_areas_ospf().
+
+    Args:
+        redes_lan: [Red] de VLANs, servidor WLC o enlace hacia SWC3
+    """
+    redes_con_area = []
+    for hacia_router in sorted(router.conexiones):
+        ip_propia, red = obtener_ip_wan(router, hacia_router, modelo)
+        par = (min(router.numero, hacia_router), max(router.numero, hacia_router))
+        redes_con_area.append((
+            entero_a_ip(red_entera(ip_propia, red.prefijo)), red.prefijo,
+            areas_ospf["area_enlace"].get(par, AREA_BACKBONE)
+        ))
+    area_lan = areas_ospf["area_router"].get(router.numero, AREA_BACKBONE)
+    redes_con_area.extend((red.ip, red.prefijo, area_lan) for red in redes_lan)
+    return generar_comandos_ospf(router.numero, redes_con_area, interfaces_pasivas, redistribuir_estaticas)
+
+def comandos_interfaces_wan(router, modelo, interfaz_de):
+    """Interfaces WAN del router, en orden de router vecino (interfaz_de(indice) da su nombre)"""
+    comandos = []
+    for idx, hacia_router in enumerate(sorted(router.conexiones)):
+        ip_propia, red = obtener_ip_wan(router, hacia_router, modelo)
+        comandos.extend([
+            f"int {interfaz_de(idx)}",
+            f"ip add {entero_a_ip(ip_propia)} {convertir_mascara_prefijo_a_decimal(red.prefijo)}",
+            "no shut"
+        ])
+    return comandos
+
+def calcular_direcciones_vlans(vlans):
+    """
+    Calcula en un solo paso las direcciones de todas las VLANs de un router.
+
+    Args:
+        vlans: {vlan_id: Red} (Router.vlans)
+
+    Returns:
+        list: (vlan_id, red, mascara_decimal, ip_gateway) en el orden de vlans
+    """
+    direcciones = calcular_direcciones_en_bloque(
+        [red.direccion for red in vlans.values()], [red.prefijo for red in vlans.values()]
+    )
+    return [
+        (vlan_id, red, mascara_decimal, ip_gateway)
+        for vlan_id, (red, _, ip_gateway, mascara_decimal, _) in zip(vlans, direcciones)
+    ]
+
+def generar_comandos_router_ROAS(router, modelo, modo_config, areas_ospf=None, rutas_respaldo=False):
+    """
+    Genera comandos para router con configuración ROAS (Router on a Stick).
+    Con areas_ospf (disenar_areas_ospf) se emite "router ospf" en lugar de rutas estáticas.
+    """
+    router_num = router.numero
     # Validar límites
     validar_limites_dispositivos(router_num=router_num)
     
@@ -22,36 +105,15 @@ def generar_comandos_router_ROAS(router_num, vlans_asignadas, conexiones, modo_c
     interfaz_hacia_switch = get_lan_interface(router_num, 0, modo_config)
     
     # Configurar interfaces WAN
-    conexiones_ordenadas = sorted(conexiones.items())
-    for idx, (hacia_router, connection_data) in enumerate(conexiones_ordenadas):
-        interfaz = get_wan_interface(router_num, idx, modo_config)
-        
-        # Obtener IP específica de este router desde todas_las_conexiones
-        conexion_key = str(tuple(sorted((router_num, int(hacia_router)))))
-        if conexion_key in todas_las_conexiones:
-            conn_info = todas_las_conexiones[conexion_key]
-            if isinstance(conn_info, dict):
-                # Nuevo formato con IPs específicas
-                ip_propia = conn_info[f'ip_r{router_num}']
-                mascara = conn_info['mascara']
-            else:
-                # Formato antiguo: usar lógica previa como fallback
-                red, mascara = conn_info
-                es_primer_router = router_num < int(hacia_router)
-                ip_propia = obtener_ip_usable(red, mascara, 0 if es_primer_router else -1)
-        else:
-            # Fallback usando connection_data local
-            red, mascara, es_primer_router = connection_data
-            ip_propia = obtener_ip_usable(red, mascara, 0 if es_primer_router else -1)
-        
-        comandos.extend([
-            f"int {interfaz}",
-            f"ip add {ip_propia} {convertir_mascara_prefijo_a_decimal(mascara)}",
-            "no shut"
-        ])
+    comandos.extend(comandos_interfaces_wan(
+        router, modelo, lambda idx: get_wan_interface(router_num, idx, modo_config)
+    ))
+    
+    # Direcciones de todas las VLANs en un solo cálculo (subinterfaces y pools)
+    direcciones_vlans = calcular_direcciones_vlans(router.vlans)
     
     # Configurar subinterfaces para VLANs
-    if vlans_asignadas:
+    if router.vlans:
         # IMPORTANTE: Levantar la interfaz principal ANTES de las subinterfaces
         comandos.extend([
             f"int {interfaz_hacia_switch}", 
@@ -59,52 +121,48 @@ def generar_comandos_router_ROAS(router_num, vlans_asignadas, conexiones, modo_c
             "exit"
         ])
         
-        for vlan_id, (red, mascara) in vlans_asignadas.items():
-            ip_gateway = obtener_ip_usable(red, mascara, -1)
+        for vlan_id, red, mascara_decimal, ip_gateway in direcciones_vlans:
             comandos.extend([
                 f"int {interfaz_hacia_switch}.{vlan_id}",
                 f"encapsulation dot1Q {vlan_id}",
-                f"ip add {ip_gateway} {convertir_mascara_prefijo_a_decimal(mascara)}",
+                f"ip add {ip_gateway} {mascara_decimal}",
                 "no shut"
             ])
     
     comandos.append("exit\n\n\n")
     
     # Configurar pools DHCP
-    if vlans_asignadas:
-        for vlan_id, (red, mascara) in vlans_asignadas.items():
-            ip_gateway = obtener_ip_usable(red, mascara, -1)
-            comandos.extend([
-                f"ip dhcp pool vlan{vlan_id}",
-                f"default-router {ip_gateway}",
-                f"network {red} {convertir_mascara_prefijo_a_decimal(mascara)}"
-            ])
+    for vlan_id, red, mascara_decimal, ip_gateway in direcciones_vlans:
+        comandos.extend([
+            f"ip dhcp pool vlan{vlan_id}",
+            f"default-router {ip_gateway}",
+            f"network {red} {mascara_decimal}"
+        ])
     
     # Configurar seguridad SSH
-    comandos.extend([
-        f"ip domain-name {SSH_CONFIG['domain']}",
-        f"username {SSH_CONFIG['username']} privilege 1 secret {SSH_CONFIG['password']}",
-        "\n\n\ncrypto key generate rsa",
-        "yes",
-        str(SSH_CONFIG['rsa_key_size']),
-        f"ip ssh version {SSH_CONFIG['ssh_version']}",
-        f"enable secret {SSH_CONFIG['enable_secret']}",
-        "line vty 0 4",
-        "transport input ssh",
-        "login local"
-    ])
+    comandos.extend(BLOQUE_SSH_ROUTER)
     
-    # Generar rutas estáticas
-    rutas = generar_rutas_estaticas_dijkstra(router_num, todas_las_conexiones, vlans_por_router, config_swc3)
-    if rutas:
-        comandos.extend(rutas)
+    if areas_ospf is not None:
+        comandos.extend(generar_bloque_ospf(
+            router, modelo, list(router.vlans.values()),
+            [f"{interfaz_hacia_switch}.{vlan_id}" for vlan_id in router.vlans],
+            areas_ospf
+        ))
+    else:
+        # Generar rutas estáticas
+        rutas = generar_rutas_estaticas_dijkstra(router_num, modelo, rutas_respaldo=rutas_respaldo)
+        if rutas:
+            comandos.extend(rutas)
     
     comandos.append("\nend")
     return comandos
 
-def generar_comandos_router_para_swc3(router_num, conexiones, swc3_config, modo_config, 
-                                     todas_las_conexiones, vlans_por_router, progreso):
-    """Genera comandos para router que se conecta a SWC3"""
+def generar_comandos_router_para_swc3(router, modelo, modo_config, areas_ospf=None, rutas_respaldo=False):
+    """
+    Genera comandos para router que se conecta a SWC3.
+    Con areas_ospf, las rutas estáticas hacia el SWC3 se mantienen y se redistribuyen en OSPF.
+    """
+    router_num = router.numero
     # Validar límites
     validar_limites_dispositivos(router_num=router_num)
     
@@ -112,77 +170,54 @@ def generar_comandos_router_para_swc3(router_num, conexiones, swc3_config, modo_
     
     # Configurar interfaz hacia SWC3
     interfaz_hacia_swc3 = get_lan_interface(router_num, 0, modo_config)
-    red_r_swc3, mascara_r_swc3 = swc3_config['red_hacia_router']
-    ip_router = obtener_ip_usable(red_r_swc3, mascara_r_swc3, 0)
-    ip_swc3 = obtener_ip_usable(red_r_swc3, mascara_r_swc3, -1)
-    mascara_decimal = convertir_mascara_prefijo_a_decimal(mascara_r_swc3)
+    red_swc3 = router.swc3
+    ip_swc3 = entero_a_ip(red_swc3.ultimo_host)
     
     comandos.extend([
         f"int {interfaz_hacia_swc3}",
-        f"ip add {ip_router} {mascara_decimal}",
+        f"ip add {entero_a_ip(red_swc3.primer_host)} {convertir_mascara_prefijo_a_decimal(red_swc3.prefijo)}",
         "no shut"
     ])
     
     # Configurar interfaces WAN
-    for idx, (hacia_router, connection_data) in enumerate(sorted(conexiones.items())):
-        interfaz = get_wan_interface(router_num, idx, modo_config)
-        
-        # Obtener IP específica desde todas_las_conexiones
-        conexion_key = str(tuple(sorted((router_num, int(hacia_router)))))
-        if conexion_key in todas_las_conexiones:
-            conn_info = todas_las_conexiones[conexion_key]
-            if isinstance(conn_info, dict):
-                ip_propia = conn_info[f'ip_r{router_num}']
-                mascara = conn_info['mascara']
-            else:
-                red, mascara = conn_info
-                es_primer_router = router_num < int(hacia_router)
-                ip_propia = obtener_ip_usable(red, mascara, 0 if es_primer_router else -1)
-        else:
-            red, mascara, es_primer_router = connection_data
-            ip_propia = obtener_ip_usable(red, mascara, 0 if es_primer_router else -1)
-        
-        comandos.extend([
-            f"int {interfaz}",
-            f"ip add {ip_propia} {convertir_mascara_prefijo_a_decimal(mascara)}",
-            "no shut"
-        ])
+    comandos.extend(comandos_interfaces_wan(
+        router, modelo, lambda idx: get_wan_interface(router_num, idx, modo_config)
+    ))
     
     comandos.append("exit\n\n\n")
     
     # Configurar seguridad SSH
-    comandos.extend([
-        f"ip domain-name {SSH_CONFIG['domain']}",
-        f"username {SSH_CONFIG['username']} privilege 1 secret {SSH_CONFIG['password']}",
-        "\n\n\ncrypto key generate rsa",
-        "yes",
-        str(SSH_CONFIG['rsa_key_size']),
-        f"ip ssh version {SSH_CONFIG['ssh_version']}",
-        f"enable secret {SSH_CONFIG['enable_secret']}",
-        "line vty 0 4",
-        "transport input ssh",
-        "login local"
-    ])
+    comandos.extend(BLOQUE_SSH_ROUTER)
     
     # Configurar rutas hacia VLANs vía SWC3
-    for vlan_id_str, (vlan_red, vlan_mascara) in vlans_por_router.get(str(router_num), {}).items():
-        comandos.append(f"ip route {vlan_red} {convertir_mascara_prefijo_a_decimal(vlan_mascara)} {ip_swc3}")
+    for _, vlan_red, mascara_decimal, _ in calcular_direcciones_vlans(router.vlans):
+        comandos.append(f"ip route {vlan_red} {mascara_decimal} {ip_swc3}")
     
-    # Generar rutas estáticas remotas
-    rutas_remotas = generar_rutas_estaticas_dijkstra(router_num, todas_las_conexiones, vlans_por_router, progreso['config_swc3'])
-    if rutas_remotas:
-        comandos.extend(rutas_remotas)
+    if areas_ospf is not None:
+        comandos.extend(generar_bloque_ospf(
+            router, modelo, [red_swc3], [interfaz_hacia_swc3], areas_ospf,
+            redistribuir_estaticas=bool(router.vlans)
+        ))
+    else:
+        # Generar rutas estáticas remotas
+        rutas_remotas = generar_rutas_estaticas_dijkstra(router_num, modelo, rutas_respaldo=rutas_respaldo)
+        if rutas_remotas:
+            comandos.extend(rutas_remotas)
     
     comandos.append("\nend")
     return comandos
 
-def generar_comandos_router_con_wlc(router_num, vlans_asignadas, conexiones, wlc_config, 
-                                   todas_las_conexiones, vlans_por_router, config_swc3):
-    """Genera comandos para router con WLC usando subinterfaces dot1Q"""
+def generar_comandos_router_con_wlc(router, modelo, modo_config=1, areas_ospf=None, rutas_respaldo=False):
+    """
+    Genera comandos para router con WLC usando subinterfaces dot1Q.
+    Con areas_ospf se emite "router ospf" en lugar de rutas estáticas.
+    """
+    router_num = router.numero
+    wlc_config = router.wlc
     comandos = ["en", "conf t", f"hostname R{router_num}"]
     
     # Configurar interfaz hacia servidor
-    servidor_interface = f"eth0/{len(conexiones)}/0"
+    servidor_interface = f"eth0/{len(router.conexiones)}/0"
     comandos.extend([
         f"int {servidor_interface}",
         f"ip add {wlc_config['ip_servidor']} {convertir_mascara_prefijo_a_decimal(wlc_config['mascara_servidor'])}",
@@ -190,40 +225,15 @@ def generar_comandos_router_con_wlc(router_num, vlans_asignadas, conexiones, wlc
     ])
     
     # Configurar interfaces WAN (conexiones entre routers)
-    conexiones_ordenadas = sorted(conexiones.items())
-    for idx, (hacia_router, connection_data) in enumerate(conexiones_ordenadas):
-        interfaz = f"eth0/{idx}/0"
-        
-        # Obtener IP específica desde todas_las_conexiones
-        conexion_key = str(tuple(sorted((router_num, int(hacia_router)))))
-        if conexion_key in todas_las_conexiones:
-            conn_info = todas_las_conexiones[conexion_key]
-            if isinstance(conn_info, dict):
-                ip_propia = conn_info[f'ip_r{router_num}']
-                mascara = conn_info['mascara']
-            else:
-                red, mascara = conn_info
-                es_primer_router = router_num < int(hacia_router)
-                ip_propia = obtener_ip_usable(red, mascara, 0 if es_primer_router else -1)
-        else:
-            red, mascara, es_primer_router = connection_data
-            ip_propia = obtener_ip_usable(red, mascara, 0 if es_primer_router else -1)
-        
-        comandos.extend([
-            f"int {interfaz}",
-            f"ip add {ip_propia} {convertir_mascara_prefijo_a_decimal(mascara)}",
-            "no shut"
-        ])
+    comandos.extend(comandos_interfaces_wan(router, modelo, lambda idx: f"eth0/{idx}/0"))
     
     # Configurar conexión a SWC3
-    if str(router_num) in config_swc3:
-        red_swc3, mascara_swc3 = config_swc3[str(router_num)]['red_hacia_router']
-        ip_router = obtener_ip_usable(red_swc3, mascara_swc3, 0)
+    if router.swc3 is not None:
         # Usar la segunda interfaz LAN disponible
         swc3_interface = get_lan_interface(router_num, 1, modo_config)
         comandos.extend([
             f"int {swc3_interface}",
-            f"ip add {ip_router} {convertir_mascara_prefijo_a_decimal(mascara_swc3)}",
+            f"ip add {entero_a_ip(router.swc3.primer_host)} {convertir_mascara_prefijo_a_decimal(router.swc3.prefijo)}",
             "no shut"
         ])
     
@@ -236,57 +246,55 @@ def generar_comandos_router_con_wlc(router_num, vlans_asignadas, conexiones, wlc
         "no shut"
     ])
     
+    # Direcciones de todas las VLANs en un solo cálculo (subinterfaces y pools)
+    direcciones_vlans = calcular_direcciones_vlans(router.vlans)
+    
     # Configurar subinterfaces para VLANs
-    for vlan_id_str, (red, mascara) in vlans_asignadas.items():
-        vlan_id = int(vlan_id_str)
-        ip_gateway = obtener_ip_usable(red, mascara, -1)
-        
+    for vlan_id, red, mascara_decimal, ip_gateway in direcciones_vlans:
         if vlan_id == wlc_config['vlan_nativa']:
             comandos.extend([
                 f"int {main_interface}.{vlan_id}",
                 f"encapsulation dot1Q {vlan_id} native",
-                f"ip add {ip_gateway} {convertir_mascara_prefijo_a_decimal(mascara)}",
+                f"ip add {ip_gateway} {mascara_decimal}",
                 "no shut"
             ])
         else:
             comandos.extend([
                 f"int {main_interface}.{vlan_id}",
                 f"encapsulation dot1Q {vlan_id}",
-                f"ip add {ip_gateway} {convertir_mascara_prefijo_a_decimal(mascara)}",
+                f"ip add {ip_gateway} {mascara_decimal}",
                 "no shut"
             ])
     
     comandos.append("exit")
     
     # Configurar pools DHCP para todas las VLANs
-    for vlan_id_str, (red, mascara) in vlans_asignadas.items():
-        vlan_id = int(vlan_id_str)
-        ip_gateway = obtener_ip_usable(red, mascara, -1)
-        pool_name = "native" if vlan_id == wlc_config['vlan_nativa'] else vlan_id_str
+    for vlan_id, red, mascara_decimal, ip_gateway in direcciones_vlans:
+        pool_name = "native" if vlan_id == wlc_config['vlan_nativa'] else vlan_id
         comandos.extend([
             f"ip dhcp pool {pool_name}",
-            f"network {red} {convertir_mascara_prefijo_a_decimal(mascara)}",
+            f"network {red} {mascara_decimal}",
             f"default-router {ip_gateway}"
         ])
     
     # Configurar seguridad SSH
-    comandos.extend([
-        f"ip domain-name {SSH_CONFIG['domain']}",
-        f"username {SSH_CONFIG['username']} privilege 1 secret {SSH_CONFIG['password']}",
-        "crypto key generate rsa",
-        "yes",
-        str(SSH_CONFIG['rsa_key_size']),
-        f"ip ssh version {SSH_CONFIG['ssh_version']}",
-        f"enable secret {SSH_CONFIG['enable_secret']}",
-        "line vty 0 4",
-        "transport input ssh",
-        "login local"
-    ])
+    comandos.extend(BLOQUE_SSH_ROUTER_WLC)
     
-    # Generar rutas estáticas
-    rutas = generar_rutas_estaticas_dijkstra(router_num, todas_las_conexiones, vlans_por_router, config_swc3)
-    if rutas:
-        comandos.extend(rutas)
+    if areas_ospf is not None:
+        mascara_servidor = int(wlc_config['mascara_servidor'])
+        redes_lan = [Red(red_entera(ip_a_entero(wlc_config['ip_servidor']), mascara_servidor), mascara_servidor)]
+        pasivas = [servidor_interface]
+        if router.swc3 is not None:
+            redes_lan.append(router.swc3)
+            pasivas.append(swc3_interface)
+        redes_lan.extend(router.vlans.values())
+        pasivas.extend(f"{main_interface}.{vlan_id}" for vlan_id in router.vlans)
+        comandos.extend(generar_bloque_ospf(router, modelo, redes_lan, pasivas, areas_ospf))
+    else:
+        # Generar rutas estáticas
+        rutas = generar_rutas_estaticas_dijkstra(router_num, modelo, rutas_respaldo=rutas_respaldo)
+        if rutas:
+            comandos.extend(rutas)
     
     comandos.append("end")
     return comandos
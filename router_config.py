@@ -7,83 +7,114 @@ from router_commands import (
     generar_comandos_router_con_wlc
 )
 from switch_commands import (
+    generar_comandos_switches_acceso,
     generar_comandos_switches_acceso_con_wlc
 )
+from routing import disenar_areas_ospf, MODO_OSPF, MODO_ESTATICO
+from network_config import AsignadorGestion, direcciones_gestion
 from config import ERROR_MESSAGES
 
-def configurar_router_individual(router_num, estado, nombre_sesion_json):
-    """Configura un router individual y actualiza el estado"""
+def obtener_areas_ospf(modelo):
+    """
+    Diseño de áreas OSPF de la sesión (None en modo estático). Se calcula una
+    vez a partir de la topología y se guarda en el modelo (config_calculada["areas_ospf"]).
+    """
+    if modelo.datos_iniciales.get("modo_enrutamiento", MODO_ESTATICO) != MODO_OSPF:
+        return None
+    if modelo.areas_ospf is None:
+        modelo.areas_ospf = disenar_areas_ospf(modelo.enlaces, modelo.routers)
+    return modelo.areas_ospf
+
+def obtener_combo_gestion(modelo, router_num):
+    """
+    Combo de gestión SSH del dominio de switches del router (el dominio i es
+    el router i), o None si la sesión no tiene red de gestión.
+    """
+    datos_iniciales = modelo.datos_iniciales
+    mgmt_base_ip = datos_iniciales.get("mgmt_base_ip")
+    mgmt_prefijo_combo = datos_iniciales.get("mgmt_prefijo_combo")
+    if not mgmt_base_ip or not mgmt_prefijo_combo:
+        return None
+    try:
+        return AsignadorGestion(mgmt_base_ip, mgmt_prefijo_combo).combo(router_num - 1)
+    except ValueError as e:
+        print(f"⚠️ Sin gestión SSH para los switches de R{router_num}: {e}")
+        return None
+
+def generar_comandos_dispositivos(router_num, modelo):
+    """
+    Genera los comandos del router y de sus switches a partir del modelo de la
+    sesión (modelo_sesion.ModeloSesion), sin interacción ni escritura a disco.
+    Las IPs de gestión de los switches quedan en Router.gestion.
+
+    Returns:
+        tuple: (comandos_router, comandos_switches)
+    """
     # Extraer datos relevantes
-    datos_iniciales = estado["datos_iniciales"]
-    progreso = estado["progreso_routers"]
+    datos_iniciales = modelo.datos_iniciales
     modo_config = int(datos_iniciales["modo_config"])
-    vlans_por_router = progreso["vlans_por_router"]
-    conexiones_por_router = progreso["conexiones_por_router"]
-    l2_config_por_router = progreso["l2_config_por_router"]
-    todas_las_conexiones = progreso["todas_las_conexiones"]
-    config_swc3 = progreso["config_swc3"]
-    config_wlc = progreso["config_wlc"]
-    topologia_switches = progreso.get("topologia_switches", {})
+    areas_ospf = obtener_areas_ospf(modelo)
+    rutas_respaldo = bool(datos_iniciales.get("rutas_respaldo", False))
+    mgmt_combo = obtener_combo_gestion(modelo, router_num)
 
     # Determinar tipo de configuración (ROAS, SWC3, WLC)
-    vlans_asignadas = vlans_por_router.get(str(router_num), {})
-    conexiones = conexiones_por_router.get(str(router_num), {})
-    l2_config = l2_config_por_router.get(str(router_num), {})
-    conectado_a_swc3 = str(router_num) in config_swc3
-    tiene_wlc = str(router_num) in config_wlc
+    router = modelo.router(router_num)
+    conectado_a_swc3 = router.swc3 is not None
+    tiene_wlc = router.wlc is not None
 
     comandos_router = []
     comandos_switches = {}
 
     if tiene_wlc:
-        wlc_config = config_wlc[str(router_num)]
         comandos_router = generar_comandos_router_con_wlc(
-            router_num, vlans_asignadas, conexiones, wlc_config,
-            todas_las_conexiones, vlans_por_router, config_swc3
+            router, modelo, modo_config=modo_config, areas_ospf=areas_ospf, rutas_respaldo=rutas_respaldo
         )
         # Generar comandos para switches con WLC
-        mgmt_combo = None  # Aquí podrías pasar la red de gestión si aplica
         comandos_switches = generar_comandos_switches_acceso_con_wlc(
-            router_num, vlans_asignadas, wlc_config,
-            topologia_switches, mgmt_combo,
+            router_num, router.vlans, router.wlc,
+            modelo.topologia_switches, mgmt_combo,
+            vlans_nombres=modelo.vlans_nombres,
             modo_config=modo_config
         )
     elif conectado_a_swc3:
-        swc3_config = config_swc3[str(router_num)]
-        progreso_actual = {"config_swc3": config_swc3}
         comandos_router = generar_comandos_router_para_swc3(
-            router_num, conexiones, swc3_config, modo_config,
-            todas_las_conexiones, vlans_por_router, progreso_actual
+            router, modelo, modo_config, areas_ospf=areas_ospf, rutas_respaldo=rutas_respaldo
         )
-        # Aquí podrías agregar comandos para switches si aplica
     else:
         comandos_router = generar_comandos_router_ROAS(
-            router_num, vlans_asignadas, conexiones, modo_config,
-            todas_las_conexiones, vlans_por_router, config_swc3, l2_config
+            router, modelo, modo_config, areas_ospf=areas_ospf, rutas_respaldo=rutas_respaldo
         )
-        # Aquí podrías agregar comandos para switches si aplica
 
-    # Guardar los comandos generados en el estado
-    progreso.setdefault("comandos_router", {})[str(router_num)] = comandos_router
-    progreso.setdefault("comandos_switches", {})[str(router_num)] = comandos_switches
-    estado["ultimo_paso_completado"] = router_num
+    # Switches de acceso (detrás del router o del SWC3) si el router tiene topología L2 definida
+    if not tiene_wlc and (router.l2.get("type") or router.l2.get("enlaces")):
+        comandos_switches = generar_comandos_switches_acceso(
+            router_num, router.vlans, router.l2, mgmt_combo,
+            vlans_nombres=modelo.vlans_nombres,
+            modo_config=modo_config, conectado_a_swc3=conectado_a_swc3
+        )
+
+    router.gestion = None
+    if mgmt_combo is not None and comandos_switches:
+        router.gestion = direcciones_gestion(mgmt_combo, list(comandos_switches))
+
+    return comandos_router, comandos_switches
+
+def generar_router(router_num, modelo):
+    """Genera los comandos de un router y de sus switches y los guarda en el modelo"""
+    router = modelo.router(router_num)
+    router.comandos, router.comandos_switches = generar_comandos_dispositivos(router_num, modelo)
+    modelo.ultimo_paso = router_num
+
+def configurar_router_individual(router_num, modelo, nombre_sesion_json):
+    """Configura un router individual del modelo de la sesión y guarda la sesión"""
+    generar_router(router_num, modelo)
 
     # Aquí podrías guardar la sesión si es necesario
     from session_manager import guardar_sesion
-    guardar_sesion(nombre_sesion_json, estado)
+    guardar_sesion(nombre_sesion_json, modelo)
 
     print(f"\n✅ Configuración de R{router_num} completada y guardada.")
-    return estado
-
-def revertir_paso_router(estado, router_num):
-    """Revierte la configuración de un router específico"""
-    progreso = estado["progreso_routers"]
-    for key in ["comandos_router", "comandos_switches"]:
-        if key in progreso and str(router_num) in progreso[key]:
-            del progreso[key][str(router_num)]
-    estado["ultimo_paso_completado"] = router_num - 1
-    print(f"\n🔄 Paso revertido. Listo para reconfigurar R{router_num}.")
-    return estado
+    return modelo
 
 def generar_archivo_final(estado, nombre_archivo_final):
     """Genera el archivo final de configuración Cisco"""
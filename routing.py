@@ -4,161 +4,237 @@ Algoritmos de enrutamiento
 import heapq
 import ipaddress
 from collections import deque
-from ip_utils import obtener_ip_usable, convertir_mascara_prefijo_a_decimal
+from ip_utils import obtener_ip_usable, convertir_mascara_prefijo_a_decimal, entero_a_ip
 
-def generar_rutas_estaticas_dijkstra(router_actual_num, todas_las_conexiones, vlans_por_router, config_swc3):
-    """Genera rutas estáticas usando algoritmo de Dijkstra para rutas óptimas"""
-    rutas_finales = set()
-    router_actual_num_str = str(router_actual_num)
-    
-    # Construir grafo con pesos (costo = 1 por salto)
-    grafo = {str(k): {} for k in vlans_por_router.keys()}
-    conexiones_info = {}  # Para almacenar info detallada de conexiones
-    
-    for conn_str, conn_data in todas_las_conexiones.items():
-        if isinstance(conn_data, list):
-            # Formato antiguo: convertir a nuevo formato
-            red, mascara = conn_data
-            r1, r2 = eval(conn_str)
-            ip_r1 = obtener_ip_usable(red, mascara, 0)
-            ip_r2 = obtener_ip_usable(red, mascara, -1)
-        else:
-            # Formato nuevo con IPs específicas
-            red, mascara = conn_data['red'], conn_data['mascara']
-            r1, r2 = conn_data['r1'], conn_data['r2']
-            ip_r1, ip_r2 = conn_data['ip_r1'], conn_data['ip_r2']
-        
-        # Agregar aristas bidireccionales con costo 1
-        grafo[str(r1)][str(r2)] = 1
-        grafo[str(r2)][str(r1)] = 1
-        
-        # Guardar info de conexión para obtener next-hop
-        conexiones_info[(str(r1), str(r2))] = {
-            'red': red, 'mascara': mascara, 
-            'ip_r1': ip_r1, 'ip_r2': ip_r2,
-            'r1': r1, 'r2': r2
-        }
-        conexiones_info[(str(r2), str(r1))] = {
-            'red': red, 'mascara': mascara,
-            'ip_r1': ip_r2, 'ip_r2': ip_r1,  # Invertir para la dirección opuesta
-            'r1': r2, 'r2': r1
-        }
-    
-    # Recopilar todas las redes destino
-    todas_las_redes = []
-    
-    # 1. VLANs de otros routers
-    for r_owner_str, vlan_data in vlans_por_router.items():
-        if r_owner_str != router_actual_num_str:
-            for vid, (net, mask) in vlan_data.items():
-                todas_las_redes.append({'net': net, 'mask': mask, 'owner': r_owner_str, 'tipo': 'VLAN'})
-    
-    # 2. Redes SWC3 de otros routers
-    for r_owner_str, data in config_swc3.items():
-        if r_owner_str != router_actual_num_str:
-            net, mask = data['red_hacia_router']
-            todas_las_redes.append({'net': net, 'mask': mask, 'owner': r_owner_str, 'tipo': 'SWC3'})
-    
-    # 3. NUEVO: Redes P2P que el router actual NO conoce directamente
-    for conn_str, conn_data in todas_las_conexiones.items():
-        if isinstance(conn_data, dict):
-            red, mascara = conn_data['red'], conn_data['mascara']
-            r1, r2 = conn_data['r1'], conn_data['r2']
-        else:
-            red, mascara = conn_data
-            r1, r2 = eval(conn_str)
-        
-        # Si el router actual NO está en esta conexión P2P, debe enrutar hacia ella
-        if router_actual_num not in [r1, r2]:
-            # Determinar cuál router está más cerca para enrutar
-            if str(r1) in grafo and str(r2) in grafo:
-                # Elegir el router con menor distancia usando Dijkstra temporal
-                dist_r1 = calcular_distancia_dijkstra(router_actual_num_str, str(r1), grafo)
-                dist_r2 = calcular_distancia_dijkstra(router_actual_num_str, str(r2), grafo)
-                router_destino = str(r1) if dist_r1 <= dist_r2 else str(r2)
-                todas_las_redes.append({'net': red, 'mask': mascara, 'owner': router_destino, 'tipo': 'P2P'})
-    
-    # Identificar redes directas del router actual
-    redes_directas = set()
-    
-    # VLANs propias
-    for net, mask in vlans_por_router.get(router_actual_num_str, {}).values():
-        redes_directas.add(net)
+# Modos de salida del enrutamiento (datos_iniciales["modo_enrutamiento"])
+MODO_ESTATICO = "estatico"
+MODO_OSPF = "ospf"
+MODOS_ENRUTAMIENTO = (MODO_ESTATICO, MODO_OSPF)
+
+PROCESO_OSPF = 1
+AREA_BACKBONE = 0
+
+# Coste de los enlaces entre routers (ver costo_enlace)
+COSTO_ENLACE_POR_DEFECTO = 1
+ANCHO_BANDA_REFERENCIA_MBPS = 100000  # Como "auto-cost reference-bandwidth 100000"
+ATRIBUTOS_ENLACE = ("costo", "ancho_banda")
+
+# Distancia administrativa de las rutas de respaldo (flotantes) ante la caída de un enlace
+DISTANCIA_RESPALDO = 200
+
+def _extremos_conexion(conn_str, conn_data):
+    """(r1, r2) enteros de una conexión en formato nuevo o antiguo"""
+    if isinstance(conn_data, dict):
+        return int(conn_data['r1']), int(conn_data['r2'])
+    r1, r2 = conn_str.strip("()").split(",")
+    return int(r1), int(r2)
+
+def costo_enlace(conn_data):
+    """
+    Coste de un enlace de todas_las_conexiones: "costo" explícito, o derivado de
+    "ancho_banda" (Mbps) como en OSPF (referencia / ancho de banda, mínimo 1),
+    o COSTO_ENLACE_POR_DEFECTO.
+    """
+    if isinstance(conn_data, dict):
+        if conn_data.get('costo') is not None:
+            costo = int(conn_data['costo'])
+            if costo < 1:
+                raise ValueError(f"Coste de enlace inválido: {costo} (debe ser >= 1)")
+            return costo
+        if conn_data.get('ancho_banda') is not None:
+            ancho_banda = float(conn_data['ancho_banda'])
+            if ancho_banda <= 0:
+                raise ValueError(f"Ancho de banda inválido: {conn_data['ancho_banda']} (debe ser > 0)")
+            return max(1, int(ANCHO_BANDA_REFERENCIA_MBPS // ancho_banda))
+    return COSTO_ENLACE_POR_DEFECTO
+
+def grafo_de_conexiones(enlaces, routers=()):
+    """
+    Grafo ponderado de los enlaces del modelo de sesión (modelo_sesion.Enlace).
+
+    Returns:
+        dict: {r: {vecino: (costo, ip_vecino)}} con routers e IPs enteros.
+              Entre dos routers con varios enlaces se queda el de menor coste.
+    """
+    vecinos = {r: {} for r in routers}
+    for enlace in enlaces:
+        for origen, destino, ip_destino in ((enlace.r1, enlace.r2, enlace.ip_r2), (enlace.r2, enlace.r1, enlace.ip_r1)):
+            actual = vecinos.setdefault(origen, {}).get(destino)
+            if actual is None or enlace.costo < actual[0]:
+                vecinos[origen][destino] = (enlace.costo, ip_destino)
+    return vecinos
+
+def caminos_minimos(origen, vecinos):
+    """
+    Dijkstra desde un router con todos los primeros saltos de igual coste (ECMP).
+
+    Returns:
+        tuple: (distancias {router: coste}, primeros_saltos {router: frozenset(vecinos de origen)})
+    """
+    distancias = {origen: 0}
+    primeros_saltos = {origen: frozenset()}
+    cola_prioridad = [(0, origen)]
+    visitados = set()
+    while cola_prioridad:
+        distancia_actual, nodo_actual = heapq.heappop(cola_prioridad)
+        if nodo_actual in visitados:
+            continue
+        visitados.add(nodo_actual)
+        saltos_actual = primeros_saltos[nodo_actual]
+        for vecino, (peso, _) in vecinos.get(nodo_actual, {}).items():
+            distancia_nueva = distancia_actual + peso
+            saltos = frozenset((vecino,)) if nodo_actual == origen else saltos_actual
+            distancia_vecino = distancias.get(vecino)
+            if distancia_vecino is None or distancia_nueva < distancia_vecino:
+                distancias[vecino] = distancia_nueva
+                primeros_saltos[vecino] = saltos
+                heapq.heappush(cola_prioridad, (distancia_nueva, vecino))
+            elif distancia_nueva == distancia_vecino and vecino not in visitados:
+                primeros_saltos[vecino] = primeros_saltos[vecino] | saltos
+    return distancias, primeros_saltos
+
+def caminos_sin_enlace(origen, vecinos, distancias, primeros_saltos, caido):
+    """
+    Reparación incremental del árbol de caminos mínimos de origen sin el enlace origen-caido.
+
+    Solo cambian los routers a los que todos los caminos mínimos llegaban por
+    caido (primeros_saltos == {caido}): se les da como distancia inicial la
+    mejor a través de un vecino no afectado y se ejecuta Dijkstra solo dentro
+    de ese subárbol. El resto conserva su distancia y pierde caido como salto.
+
+    Returns:
+        tuple: (distancias, primeros_saltos) solo de los routers afectados que
+               siguen alcanzables; para los demás vale el árbol original sin caido
+    """
+    afectados = {nodo for nodo, saltos in primeros_saltos.items() if saltos == frozenset((caido,))}
+    nuevas_distancias, nuevos_saltos = {}, {}
+    cola_prioridad = []
+    for nodo in afectados:
+        for vecino, (peso, _) in vecinos[nodo].items():
+            if vecino in afectados or (vecino == origen and nodo == caido):
+                continue
+            saltos = frozenset((nodo,)) if vecino == origen else primeros_saltos[vecino] - {caido}
+            distancia = distancias[vecino] + peso
+            if nodo not in nuevas_distancias or distancia < nuevas_distancias[nodo]:
+                nuevas_distancias[nodo], nuevos_saltos[nodo] = distancia, saltos
+            elif distancia == nuevas_distancias[nodo]:
+                nuevos_saltos[nodo] = nuevos_saltos[nodo] | saltos
+        if nodo in nuevas_distancias:
+            heapq.heappush(cola_prioridad, (nuevas_distancias[nodo], nodo))
+
+    visitados = set()
+    while cola_prioridad:
+        distancia_actual, nodo_actual = heapq.heappop(cola_prioridad)
+        if nodo_actual in visitados:
+            continue
+        visitados.add(nodo_actual)
+        for vecino, (peso, _) in vecinos[nodo_actual].items():
+            if vecino not in afectados or vecino in visitados:
+                continue
+            distancia_nueva = distancia_actual + peso
+            if vecino not in nuevas_distancias or distancia_nueva < nuevas_distancias[vecino]:
+                nuevas_distancias[vecino] = distancia_nueva
+                nuevos_saltos[vecino] = nuevos_saltos[nodo_actual]
+                heapq.heappush(cola_prioridad, (distancia_nueva, vecino))
+            elif distancia_nueva == nuevas_distancias[vecino]:
+                nuevos_saltos[vecino] = nuevos_saltos[vecino] | nuevos_saltos[nodo_actual]
+    return nuevas_distancias, nuevos_saltos
+
+def _mejor_camino(duenos, distancias, primeros_saltos):
+    """(distancia, primeros saltos) hacia el dueño o dueños más cercanos, o None si ninguno es alcanzable"""
+    alcanzables = [r for r in duenos if r in distancias]
+    if not alcanzables:
+        return None
+    distancia = min(distancias[r] for r in alcanzables)
+    saltos = set()
+    for r in alcanzables:
+        if distancias[r] == distancia:
+            saltos.update(primeros_saltos[r])
+    return distancia, saltos
+
+def generar_rutas_estaticas_dijkstra(router_actual, modelo, rutas_respaldo=False):
+    """
+    Genera rutas estáticas con un único Dijkstra desde el router actual (modelo_sesion.ModeloSesion).
+
+    Los enlaces pesan costo_enlace() ("costo" o "ancho_banda" del enlace,
+    1 por defecto). Si hay varios caminos de igual coste hacia una red se emite
+    una ruta por cada siguiente salto (ECMP).
+    Las VLANs y la red SWC3 de cada router remoto con bloque (estrategia
+    jerárquica, Router.bloque) se resumen en una sola ruta.
+
+    Con rutas_respaldo, cada red con un único siguiente salto recibe además una
+    ruta flotante (DISTANCIA_RESPALDO) por el mejor camino sin ese enlace
+    (caminos_sin_enlace), siempre que el nuevo vecino no devuelva el tráfico al
+    router actual con sus propias rutas: dist(vecino, red) < dist(vecino, router) + dist(router, red).
+    """
+    vecinos = grafo_de_conexiones(modelo.enlaces.values(), modelo.routers)
+    distancias, primeros_saltos = caminos_minimos(router_actual, vecinos)
+
+    # Redes destino: (Red, routers dueños a igual distancia)
+    destinos = []
+    for numero, router in modelo.routers.items():
+        if numero == router_actual:
+            continue
+        if router.bloque is not None:
+            # Bloque resumen: sustituye a las VLANs y la red SWC3 del router
+            destinos.append((router.bloque, (numero,)))
+            continue
+        destinos.extend((red, (numero,)) for red in router.vlans.values())
+        if router.swc3 is not None:
+            destinos.append((router.swc3, (numero,)))
     
-    # Conexiones P2P directas
-    for conn_str, conn_data in todas_las_conexiones.items():
-        if isinstance(conn_data, dict):
-            red = conn_data['red']
-            r1, r2 = conn_data['r1'], conn_data['r2']
-        else:
-            red = conn_data[0]
-            r1, r2 = eval(conn_str)
-        
-        if router_actual_num in [r1, r2]:
-            redes_directas.add(red)
+    # Redes P2P ajenas: se llega por el extremo más cercano (por ambos si empatan)
+    for (r1, r2), enlace in modelo.enlaces.items():
+        if router_actual not in (r1, r2):
+            destinos.append((enlace.red, (r1, r2)))
     
-    # Red SWC3 propia
-    if router_actual_num_str in config_swc3:
-        redes_directas.add(config_swc3[router_actual_num_str]['red_hacia_router'][0])
+    # Redes directas del router actual: VLANs, enlaces P2P y red SWC3 propias
+    propio = modelo.routers[router_actual]
+    redes_directas = {red.direccion for red in propio.vlans.values()}
+    redes_directas.update(e.red.direccion for (r1, r2), e in modelo.enlaces.items() if router_actual in (r1, r2))
+    if propio.swc3 is not None:
+        redes_directas.add(propio.swc3.direccion)
     
-    # Aplicar Dijkstra para cada red destino
-    for red_info in todas_las_redes:
-        if red_info['net'] in redes_directas:
-            continue  # Skip redes directas
-        
-        destino_router = red_info['owner']
-        
-        # Algoritmo de Dijkstra
-        distancias = {nodo: float('infinity') for nodo in grafo}
-        distancias[router_actual_num_str] = 0
-        predecesores = {}
-        cola_prioridad = [(0, router_actual_num_str)]
-        visitados = set()
-        
-        while cola_prioridad:
-            distancia_actual, nodo_actual = heapq.heappop(cola_prioridad)
-            
-            if nodo_actual in visitados:
-                continue
-            
-            visitados.add(nodo_actual)
-            
-            if nodo_actual == destino_router:
-                break  # Encontramos el camino más corto
-            
-            for vecino, peso in grafo.get(nodo_actual, {}).items():
-                distancia_nueva = distancia_actual + peso
-                
-                if distancia_nueva < distancias[vecino]:
-                    distancias[vecino] = distancia_nueva
-                    predecesores[vecino] = nodo_actual
-                    heapq.heappush(cola_prioridad, (distancia_nueva, vecino))
-        
-        # Reconstruir camino más corto
-        if destino_router in predecesores or destino_router == router_actual_num_str:
-            camino = []
-            nodo = destino_router
-            while nodo != router_actual_num_str:
-                camino.append(nodo)
-                nodo = predecesores.get(nodo)
-                if nodo is None:
-                    break
-            camino.append(router_actual_num_str)
-            camino.reverse()
-            
-            if len(camino) > 1:
-                siguiente_salto = camino[1]
-                
-                # Obtener next-hop IP correcta
-                conn_key = (router_actual_num_str, siguiente_salto)
-                if conn_key in conexiones_info:
-                    conn_info = conexiones_info[conn_key]
-                    next_hop_ip = conn_info['ip_r2']  # IP del siguiente salto
-                    
-                    ruta_cmd = f"ip route {red_info['net']} {convertir_mascara_prefijo_a_decimal(red_info['mask'])} {next_hop_ip}"
-                    rutas_finales.add(ruta_cmd)
+    rutas_finales = set()
+    reparaciones = {}  # {vecino caído: árbol reparado sin el enlace}
+    arboles_vecinos = {}  # {vecino: distancias desde él} para la condición sin bucles
+    for red, duenos in destinos:
+        if red.direccion in redes_directas:
+            continue
+        camino = _mejor_camino([r for r in duenos if r != router_actual], distancias, primeros_saltos)
+        if camino is None:
+            continue
+        distancia, saltos = camino
+        net, mascara_decimal = red.ip, convertir_mascara_prefijo_a_decimal(red.prefijo)
+        for salto in saltos:
+            rutas_finales.add(f"ip route {net} {mascara_decimal} {entero_a_ip(vecinos[router_actual][salto][1])}")
+        if not rutas_respaldo or len(saltos) != 1:
+            continue  # Con ECMP la caída de un enlace la cubren los demás saltos
+
+        caido = next(iter(saltos))
+        if caido not in reparaciones:
+            reparaciones[caido] = caminos_sin_enlace(router_actual, vecinos, distancias, primeros_saltos, caido)
+        distancias_rep, saltos_rep = reparaciones[caido]
+        distancias_sin, saltos_sin = {}, {}
+        for r in duenos:
+            if r in distancias_rep:
+                distancias_sin[r], saltos_sin[r] = distancias_rep[r], saltos_rep[r]
+            elif r in distancias and r != router_actual and primeros_saltos[r] != frozenset((caido,)):
+                distancias_sin[r], saltos_sin[r] = distancias[r], primeros_saltos[r] - {caido}
+        respaldo = _mejor_camino(duenos, distancias_sin, saltos_sin)
+        if respaldo is None:
+            continue
+        for alternativo in respaldo[1]:
+            if alternativo not in arboles_vecinos:
+                arboles_vecinos[alternativo] = caminos_minimos(alternativo, vecinos)[0]
+            desde_vecino = arboles_vecinos[alternativo]
+            distancia_vecino = min((desde_vecino[r] for r in duenos if r in desde_vecino), default=None)
+            if distancia_vecino is not None and distancia_vecino < desde_vecino[router_actual] + distancia:
+                rutas_finales.add(
+                    f"ip route {net} {mascara_decimal} {entero_a_ip(vecinos[router_actual][alternativo][1])} {DISTANCIA_RESPALDO}"
+                )
     
-    return sorted(list(rutas_finales))
+    return sorted(rutas_finales)
 
 def calcular_distancia_dijkstra(origen, destino, grafo):
     """Calcula la distancia más corta entre dos nodos usando Dijkstra"""
@@ -205,7 +281,7 @@ def generar_rutas_estaticas_completas(router_actual_num, todas_las_conexiones, v
             # Formato antiguo para compatibilidad
             net, mask = conn_data
             
-        r1, r2 = eval(conn_str)
+        r1, r2 = _extremos_conexion(conn_str, conn_data)
         grafo[str(r1)][str(r2)] = 1
         grafo[str(r2)][str(r1)] = 1
     
@@ -223,7 +299,7 @@ def generar_rutas_estaticas_completas(router_actual_num, todas_las_conexiones, v
             # Formato antiguo para compatibilidad
             net, mask = conn_data
             
-        r1, r2 = eval(conn_str)
+        r1, r2 = _extremos_conexion(conn_str, conn_data)
         todas_las_redes.append({'net': net, 'mask': mask, 'owner': str(r1)})
     
     for r_owner_str, data in config_swc3.items():
@@ -290,3 +366,105 @@ def generar_rutas_estaticas_completas(router_actual_num, todas_las_conexiones, v
                 rutas_finales.add(ruta_cmd)
     
     return sorted(list(rutas_finales))
+
+def disenar_areas_ospf(enlaces, routers):
+    """
+    Diseño de áreas OSPF a partir del grafo de routers.
+
+    En cada componente conexa el centro del grafo (mínima excentricidad, BFS
+    desde cada router) y sus vecinos forman el área 0. Cada vecino del centro
+    es ABR de un área con los routers que cuelgan de él en el árbol BFS; si
+    dos ramas se unen por un enlace que no pasa por el backbone, se fusionan
+    en una sola área para que todas sigan tocando el área 0. Con profundidad
+    1 (estrella, malla, cadenas de 3) todo queda en el área 0.
+
+    Args:
+        enlaces: Pares (r1, r2) enteros, como las claves de ModeloSesion.enlaces
+        routers: Routers (enteros)
+
+    Returns:
+        dict: {"centros": [r], "area_router": {r: area}, "area_enlace": {(r1, r2): area}}
+              area_router es el área de las redes LAN (VLANs, SWC3) del router
+    """
+    enlaces = list(enlaces)
+    vecinos = {r: set() for r in sorted(routers)}
+    for r1, r2 in enlaces:
+        vecinos.setdefault(r1, set()).add(r2)
+        vecinos.setdefault(r2, set()).add(r1)
+
+    def bfs(origen):
+        distancias = {origen: 0}
+        padres = {origen: None}
+        cola = deque([origen])
+        while cola:
+            nodo = cola.popleft()
+            for vecino in sorted(vecinos[nodo]):
+                if vecino not in distancias:
+                    distancias[vecino] = distancias[nodo] + 1
+                    padres[vecino] = nodo
+                    cola.append(vecino)
+        return distancias, padres
+
+    profundidad = {}
+    rama = {}  # {router: vecino del centro del que cuelga (él mismo si está a distancia 1)}
+    centros = []
+    pendientes = set(vecinos)
+    while pendientes:
+        componente = bfs(min(pendientes))[0]
+        pendientes -= set(componente)
+        centro = min(componente, key=lambda r: (max(bfs(r)[0].values()), r))
+        centros.append(centro)
+        distancias, padres = bfs(centro)
+        for router, distancia in distancias.items():
+            profundidad[router] = distancia
+            if distancia >= 1:
+                nodo = router
+                while padres[nodo] != centro:
+                    nodo = padres[nodo]
+                rama[router] = nodo
+
+    # Fusionar ramas unidas por enlaces fuera del backbone (unión-búsqueda sobre los ABR)
+    raiz = {abr: abr for abr in set(rama.values())}
+    def buscar(abr):
+        while raiz[abr] != abr:
+            raiz[abr] = raiz[raiz[abr]]
+            abr = raiz[abr]
+        return abr
+
+    def es_backbone(r1, r2):
+        return min(profundidad[r1], profundidad[r2]) == 0 or max(profundidad[r1], profundidad[r2]) <= 1
+
+    for r1, r2 in enlaces:
+        if not es_backbone(r1, r2):
+            a, b = buscar(rama[r1]), buscar(rama[r2])
+            raiz[max(a, b)] = min(a, b)  # El área toma el número del menor ABR
+
+    area_router = {}
+    for router in vecinos:
+        area_router[router] = AREA_BACKBONE if profundidad[router] <= 1 else buscar(rama[router])
+    area_enlace = {}
+    for r1, r2 in enlaces:
+        area_enlace[(r1, r2)] = AREA_BACKBONE if es_backbone(r1, r2) else buscar(rama[r1])
+    return {"centros": centros, "area_router": area_router, "area_enlace": area_enlace}
+
+def _wildcard(mascara):
+    return entero_a_ip((1 << (32 - int(mascara))) - 1)
+
+def generar_comandos_ospf(router_num, redes_con_area, interfaces_pasivas=(), redistribuir_estaticas=False):
+    """
+    Bloque "router ospf" de un router.
+
+    Args:
+        redes_con_area: [(red, mascara, area)] conectadas al router
+        interfaces_pasivas: interfaces hacia hosts (sin vecinos OSPF)
+        redistribuir_estaticas: anunciar las rutas estáticas locales (VLANs detrás de un SWC3)
+    """
+    router_id = f"{router_num}.{router_num}.{router_num}.{router_num}" if int(router_num) <= 255 else entero_a_ip(int(router_num))
+    comandos = [f"router ospf {PROCESO_OSPF}", f"router-id {router_id}"]
+    comandos.extend(f"passive-interface {interfaz}" for interfaz in interfaces_pasivas)
+    for red, mascara, area in redes_con_area:
+        comandos.append(f"network {red} {_wildcard(mascara)} area {area}")
+    if redistribuir_estaticas:
+        comandos.append("redistribute static subnets")
+    comandos.append("exit")
+    return comandos
@@ -0,0 +1,238 @@
+"""
+Servicio local de generación de configuraciones (HTTP + JSON)
+
+Mantiene un proceso de larga duración para no pagar en cada trabajo la
+importación de módulos ni la reconstrucción de tablas: las cachés de
+ip_utils e interface_manager, los bloques SSH precompilados y la caché de
+renderizado se conservan entre solicitudes.
+
+Rutas:
+    POST /configuracion   especificación -> {"nombre_sesion", "configuraciones": {dispositivo: texto}}
+    POST /sesion          especificación -> estado completo de la sesión
+    GET  /metricas        contadores, latencias y aciertos de caché
+    GET  /salud           comprobación de vida
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from planificador import planificar_sesion, generar_configuraciones
+from session_manager import iterar_dispositivos
+
+PUERTO_POR_DEFECTO = 8750
+MAX_CONCURRENTES_POR_DEFECTO = 4
+TAMANO_CACHE_RENDER = 256
+MUESTRAS_LATENCIA = 1024
+ESPERA_MAXIMA_SEGUNDOS = 5
+
+class CacheRenderizado:
+    """
+    Caché LRU de sesiones renderizadas, indexada por el hash de la especificación.
+    Un fallo en una clave que ya se está calculando espera a ese cálculo en
+    lugar de repetirlo (ver obtener_o_calcular).
+    """
+
+    def __init__(self, capacidad=TAMANO_CACHE_RENDER):
+        self.capacidad = capacidad
+        self._datos = OrderedDict()
+        self._en_curso = {}  # {clave: threading.Event} de los cálculos pendientes
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+
+    @staticmethod
+    def clave(spec):
+        return hashlib.sha256(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def obtener(self, clave):
+        with self._lock:
+            if clave in self._datos:
+                self._datos.move_to_end(clave)
+                self.aciertos += 1
+                return self._datos[clave]
+            self.fallos += 1
+            return None
+
+    def guardar(self, clave, valor):
+        with self._lock:
+            self._datos[clave] = valor
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.capacidad:
+                self._datos.popitem(last=False)
+
+    def obtener_o_calcular(self, clave, calcular):
+        """
+        Valor de la clave, calculándolo con calcular() si falta. Solo la primera
+        solicitud de una clave lo calcula; las simultáneas esperan su resultado
+        (si el cálculo falla, la siguiente en despertar lo intenta de nuevo).
+        """
+        while True:
+            with self._lock:
+                if clave in self._datos:
+                    self._datos.move_to_end(clave)
+                    self.aciertos += 1
+                    return self._datos[clave]
+                evento = self._en_curso.get(clave)
+                if evento is None:
+                    self.fallos += 1
+                    evento = self._en_curso[clave] = threading.Event()
+                    break
+            evento.wait()
+
+        try:
+            valor = calcular()
+            self.guardar(clave, valor)
+            return valor
+        finally:
+            with self._lock:
+                del self._en_curso[clave]
+            evento.set()
+
+class MetricasServicio:
+    """Contadores y latencias (ventana de las últimas MUESTRAS_LATENCIA solicitudes)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencias = deque(maxlen=MUESTRAS_LATENCIA)
+        self.solicitudes = 0
+        self.errores = 0
+        self.rechazadas = 0
+        self.en_curso = 0
+
+    def rechazar(self):
+        with self._lock:
+            self.rechazadas += 1
+
+    def iniciar(self):
+        with self._lock:
+            self.en_curso += 1
+
+    def registrar(self, segundos, error=False):
+        with self._lock:
+            self.en_curso -= 1
+            self.solicitudes += 1
+            self.errores += int(error)
+            self._latencias.append(segundos)
+
+    def resumen(self, cache):
+        with self._lock:
+            latencias = sorted(self._latencias)
+            resumen = {
+                "solicitudes": self.solicitudes,
+                "errores": self.errores,
+                "rechazadas": self.rechazadas,
+                "en_curso": self.en_curso,
+                "cache": {"aciertos": cache.aciertos, "fallos": cache.fallos}
+            }
+        if latencias:
+            def percentil(p):
+                return round(latencias[min(len(latencias) - 1, int(p * len(latencias)))] * 1000, 3)
+            resumen["latencia_ms"] = {
+                "p50": percentil(0.50),
+                "p95": percentil(0.95),
+                "max": round(latencias[-1] * 1000, 3),
+                "media": round(sum(latencias) / len(latencias) * 1000, 3)
+            }
+        return resumen
+
+def renderizar_spec(spec, cache):
+    """
+    Planifica y genera una especificación, reutilizando la caché de renderizado.
+    Las que usan registro_global no pasan por la caché: su resultado depende
+    del registro y lo modifica. Se planifican siempre, una a una por registro
+    (ver registro_global.bloqueo_registro).
+    """
+    if isinstance(spec, dict) and spec.get("registro_global"):
+        return generar_configuraciones(planificar_sesion(spec))
+    return cache.obtener_o_calcular(cache.clave(spec), lambda: generar_configuraciones(planificar_sesion(spec)))
+
+class ManejadorGeneracion(BaseHTTPRequestHandler):
+    """Atiende las solicitudes JSON del servicio"""
+
+    server_version = "GeneradorCisco/1.0"
+
+    def _responder(self, codigo, cuerpo):
+        datos = json.dumps(cuerpo, ensure_ascii=False).encode("utf-8")
+        self.send_response(codigo)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(datos)))
+        self.end_headers()
+        self.wfile.write(datos)
+
+    def log_message(self, formato, *args):
+        # El registro por solicitud se sustituye por /metricas
+        pass
+
+    def do_GET(self):
+        if self.path == "/salud":
+            self._responder(200, {"estado": "ok"})
+        elif self.path == "/metricas":
+            self._responder(200, self.server.metricas.resumen(self.server.cache))
+        else:
+            self._responder(404, {"error": f"Ruta no encontrada: {self.path}"})
+
+    def do_POST(self):
+        if self.path not in ("/configuracion", "/sesion"):
+            self._responder(404, {"error": f"Ruta no encontrada: {self.path}"})
+            return
+
+        servidor = self.server
+        if not servidor.limite.acquire(timeout=ESPERA_MAXIMA_SEGUNDOS):
+            servidor.metricas.rechazar()
+            self._responder(503, {"error": "Servicio ocupado, reintenta más tarde"})
+            return
+
+        inicio = time.perf_counter()
+        error = False
+        servidor.metricas.iniciar()
+        try:
+            longitud = int(self.headers.get("Content-Length", 0))
+            spec = json.loads(self.rfile.read(longitud) or b"{}")
+            estado = renderizar_spec(spec, servidor.cache)
+
+            if self.path == "/sesion":
+                self._responder(200, estado)
+            else:
+                configuraciones = {
+                    nombre: "\n".join(comandos)
+                    for _, nombre, comandos in iterar_dispositivos(estado["progreso_routers"])
+                }
+                self._responder(200, {"nombre_sesion": estado["nombre_sesion"], "configuraciones": configuraciones})
+        except (ValueError, KeyError, TypeError) as e:
+            error = True
+            self._responder(400, {"error": f"{type(e).__name__}: {e}"})
+        except Exception as e:
+            error = True
+            self._responder(500, {"error": f"{type(e).__name__}: {e}"})
+        finally:
+            servidor.limite.release()
+            servidor.metricas.registrar(time.perf_counter() - inicio, error)
+
+def crear_servidor(host="127.0.0.1", puerto=PUERTO_POR_DEFECTO, max_concurrentes=MAX_CONCURRENTES_POR_DEFECTO):
+    """Crea el servidor HTTP con su caché, métricas y límite de concurrencia"""
+    servidor = ThreadingHTTPServer((host, puerto), ManejadorGeneracion)
+    servidor.daemon_threads = True
+    servidor.cache = CacheRenderizado()
+    servidor.metricas = MetricasServicio()
+    servidor.limite = threading.BoundedSemaphore(max_concurrentes)
+    return servidor
+
+def iniciar_servicio(host="127.0.0.1", puerto=PUERTO_POR_DEFECTO, max_concurrentes=MAX_CONCURRENTES_POR_DEFECTO):
+    """Arranca el servicio y atiende solicitudes hasta Ctrl+C"""
+    servidor = crear_servidor(host, puerto, max_concurrentes)
+    print(f"✅ Servicio de generación escuchando en http://{host}:{puerto} (máx. {max_concurrentes} concurrentes)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\nServicio detenido por el usuario.")
+    finally:
+        servidor.server_close()
+
+if __name__ == "__main__":
+    import sys
+    puerto = int(sys.argv[1]) if len(sys.argv) > 1 else PUERTO_POR_DEFECTO
+    max_concurrentes = int(sys.argv[2]) if len(sys.argv) > 2 else MAX_CONCURRENTES_POR_DEFECTO
+    iniciar_servicio(puerto=puerto, max_concurrentes=max_concurrentes)
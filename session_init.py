@@ -2,8 +2,13 @@
 Inicialización y configuración inicial de sesiones - Sistema secuencial
 """
 from validaciones import validar_entrada, validar_nombre_archivo
-from network_config import configurar_vlans, configurar_redes_entre_routers, procesar_todas_las_asignaciones
-from ip_utils import inicializar_diagonal_manager
+from network_config import (
+    configurar_vlans, configurar_redes_entre_routers, procesar_todas_las_asignaciones, crear_conexion_p2p
+)
+from contexto_planificacion import ContextoPlanificacion
+from pool_direcciones import EspacioInsuficienteError
+from registro_global import RegistroGlobal, PrefijoOcupadoError, bloqueo_registro
+from config import ARCHIVO_REGISTRO_GLOBAL
 
 def iniciar_nueva_sesion():
     """Inicia una nueva sesión de configuración con sistema secuencial"""
@@ -14,8 +19,16 @@ def iniciar_nueva_sesion():
     modo_config = validar_entrada("Selecciona el tipo (1-Simulacion, 2-Fisico): ", "numero", ['1', '2'])
     base_ip = validar_entrada("IP base para las subredes de usuario (ej: 19.0.0.0): ", "ip")
     
-    # Inicializar el manejador de diagonales secuencial
-    inicializar_diagonal_manager(base_ip)
+    usar_registro = validar_entrada(
+        f"¿Reservar las redes en el registro global '{ARCHIVO_REGISTRO_GLOBAL}'? (s/n): ", "si_no"
+    )
+    ruta_registro = ARCHIVO_REGISTRO_GLOBAL if usar_registro else None
+    
+    # Contexto de planificación propio de esta sesión (asignador + solicitudes pendientes),
+    # sin el espacio que ya usan otras sesiones de esta instalación si hay registro
+    contexto = ContextoPlanificacion(base_ip)
+    if ruta_registro:
+        contexto.excluir_reservas(RegistroGlobal(ruta_registro), nombre_sesion)
     
     # Configuración de red de gestión
     print("\n--- Configuracion de Red de Gestion para Switches ---")
@@ -38,7 +51,7 @@ def iniciar_nueva_sesion():
     
     # Configurar VLANs (solo recopila solicitudes)
     subredes_ocupadas = []
-    vlans_con_combos_temp, vlans_nombres = configurar_vlans(num_vlans, base_ip, subredes_ocupadas)
+    vlans_con_combos_temp, vlans_nombres = configurar_vlans(contexto, num_vlans, base_ip, subredes_ocupadas)
     
     # Configurar SWC3
     usar_swc3 = validar_entrada("\n¿Deseas usar Switch Capa 3 en esta topologia? (s/n): ", "si_no")
@@ -53,13 +66,18 @@ def iniciar_nueva_sesion():
     
     # Calcular redes P2P necesarias
     total_redes_p2p = num_conexiones_wan + num_swc3_enlaces
-    redes_p2p_temp = configurar_redes_entre_routers(total_redes_p2p, base_ip, subredes_ocupadas, aleatorio=False)
+    redes_p2p_temp = configurar_redes_entre_routers(contexto, total_redes_p2p, base_ip, subredes_ocupadas, aleatorio=False)
     
     # FASE 2: PROCESAR TODAS LAS ASIGNACIONES DE MANERA SECUENCIAL
     print(f"\nFASE 2: PROCESAMIENTO SECUENCIAL OPTIMIZADO")
     print("=" * 60)
     
-    vlans_con_combos, redes_p2p_disponibles = procesar_todas_las_asignaciones()
+    try:
+        vlans_con_combos, redes_p2p_disponibles = procesar_todas_las_asignaciones(contexto)
+    except EspacioInsuficienteError as e:
+        print(f"❌ Error: {e}")
+        print("   Usa una IP base con más espacio libre o reduce las máscaras/combos solicitados.")
+        return None
     
     print(f"\nSISTEMA SECUENCIAL COMPLETADO")
     print("=" * 50)
@@ -80,7 +98,9 @@ def iniciar_nueva_sesion():
             "num_routers": num_routers,
             "usar_swc3": usar_swc3,
             "num_swc3_enlaces": num_swc3_enlaces,
-            "usar_wlc": usar_wlc
+            "usar_wlc": usar_wlc,
+            "prefijo_pool": contexto.diagonal_manager.pool.prefijo,
+            "registro_global": ruta_registro
         },
         "config_calculada": {
             "vlans_con_combos": vlans_con_combos,
@@ -103,6 +123,23 @@ def iniciar_nueva_sesion():
         }
     }
     
+    if ruta_registro is None:
+        return estado
+    
+    # Las preguntas pueden durar minutos: se relee el registro bajo bloqueo para
+    # no pisar lo que otra sesión haya guardado mientras tanto
+    try:
+        with bloqueo_registro(ruta_registro):
+            registro = RegistroGlobal(ruta_registro)
+            registro.registrar_sesion(estado)
+            registro.guardar()
+    except PrefijoOcupadoError as e:
+        print(f"❌ Error: {e}")
+        print("   Otra sesión reservó esas redes mientras se configuraba esta. Vuelve a crear la sesión.")
+        return None
+    except OSError as e:
+        print(f"⚠️ No se pudo actualizar el registro global '{ruta_registro}': {e}")
+    
     return estado
 
 def verificar_compatibilidad_sesion(estado):
@@ -123,7 +160,6 @@ def verificar_compatibilidad_sesion(estado):
         print("Sesion antigua detectada. Generados nombres automaticos para VLANs existentes.")
     
     # Compatibilidad: convertir conexiones de formato antiguo a nuevo
-    from ip_utils import obtener_ip_usable
     conexiones_convertidas = False
     
     for conn_key, conn_data in progreso["todas_las_conexiones"].items():
@@ -131,20 +167,9 @@ def verificar_compatibilidad_sesion(estado):
             # Formato antiguo: [red, mascara]
             red, mascara = conn_data
             r1, r2 = eval(conn_key)
-            ip_r1 = obtener_ip_usable(red, mascara, 0)
-            ip_r2 = obtener_ip_usable(red, mascara, -1)
             
             # Convertir a nuevo formato
-            progreso["todas_las_conexiones"][conn_key] = {
-                'red': red,
-                'mascara': mascara,
-                'r1': min(r1, r2),
-                'r2': max(r1, r2),
-                'ip_r1': ip_r1,
-                'ip_r2': ip_r2,
-                f'ip_r{r1}': ip_r1 if r1 < r2 else ip_r2,
-                f'ip_r{r2}': ip_r2 if r1 < r2 else ip_r1
-            }
+            progreso["todas_las_conexiones"][conn_key] = crear_conexion_p2p(r1, r2, red, mascara)
             conexiones_convertidas = True
     
     if conexiones_convertidas:
@@ -3,9 +3,15 @@ Gestión de sesiones: guardar, cargar y utilidades para el generador de comandos
 """
 import json
 import os
+import re
+
+# Buffer de escritura para archivos de configuración grandes
+TAMANO_BUFFER = 1 << 16
 
 def guardar_sesion(nombre_sesion_json, estado):
-    """Guarda el estado de la sesión en un archivo JSON"""
+    """Guarda el estado de la sesión (dict o modelo_sesion.ModeloSesion) en un archivo JSON"""
+    if not isinstance(estado, dict):
+        estado = estado.a_estado()
     with open(nombre_sesion_json, "w", encoding="utf-8") as f:
         json.dump(estado, f, indent=2, ensure_ascii=False)
 
@@ -18,27 +24,165 @@ def cargar_sesion(nombre_sesion_json):
         print(f"❌ Error al cargar la sesión: {e}")
         return None
 
-def revertir_paso_router(estado, router_num):
-    """Revierte la configuración de un router específico en la sesión"""
+def revertir_paso_router(estado, router_num, liberar_recursos=False):
+    """
+    Revierte la configuración de un router específico en la sesión.
+    Con liberar_recursos=True también devuelve al pool sus redes (ver liberar_recursos_router).
+    """
     progreso = estado["progreso_routers"]
-    for key in ["comandos_router", "comandos_switches"]:
+    for key in ["comandos_router", "comandos_switches", "gestion_switches"]:
         if key in progreso and str(router_num) in progreso[key]:
             del progreso[key][str(router_num)]
     estado["ultimo_paso_completado"] = router_num - 1
+    if liberar_recursos:
+        liberadas = liberar_recursos_router(estado, router_num)
+        print(f"♻️ {len(liberadas)} redes de R{router_num} devueltas al pool.")
     print(f"\n🔄 Paso revertido. Listo para reconfigurar R{router_num}.")
     return estado
 
-def generar_archivo_final(estado, nombre_archivo_final):
-    """Genera el archivo final de configuración Cisco"""
+def liberar_recursos_router(estado, router_num, contexto=None):
+    """
+    Quita de la sesión las redes propias de un router: sus combos de VLAN, el
+    enlace al SWC3 y los enlaces WAN hacia routers que aún no tienen comandos
+    generados (los ya configurados seguirían apuntando a ellos).
+
+    Sin contexto, la siguiente asignación reconstruye el asignador desde la sesión
+    y encuentra libres las redes quitadas. Con el ContextoPlanificacion que se
+    reutiliza entre ediciones (ver planificador.agregar_vlan_a_router), además
+    se devuelven a sus listas buddy, que las fusionan con sus buddies libres.
+
+    Returns:
+        list: Redes liberadas [[red, mascara]]
+    """
+    r_str = str(router_num)
+    calculada = estado["config_calculada"]
     progreso = estado["progreso_routers"]
-    with open(nombre_archivo_final, "w", encoding="utf-8") as f:
-        for r_num, comandos in progreso.get("comandos_router", {}).items():
-            f.write(f"! Configuración Router R{r_num}\n")
-            f.write("\n".join(comandos))
-            f.write("\n\n")
-        for r_num, switches in progreso.get("comandos_switches", {}).items():
-            for sw_name, sw_cmds in switches.items():
-                f.write(f"! Configuración Switch {sw_name}\n")
-                f.write("\n".join(sw_cmds))
-                f.write("\n\n")
+    liberadas = []
+
+    vlans = progreso.get("vlans_por_router", {}).get(r_str, {})
+    redes_vlans = [list(par) for par in vlans.values()]
+    for vlan in calculada.get("vlans_con_combos", []):
+        vlan[1] = [combo for combo in vlan[1] if list(combo) not in redes_vlans]
+    liberadas.extend(redes_vlans)
+    if r_str in progreso.get("vlans_por_router", {}):
+        progreso["vlans_por_router"][r_str] = {}
+
+    redes_p2p = []
+    if r_str in progreso.get("config_swc3", {}):
+        redes_p2p.append(list(progreso["config_swc3"].pop(r_str)["red_hacia_router"]))
+        progreso.get("routers_con_swc3", {}).pop(r_str, None)
+
+    configurados = progreso.get("comandos_router", {})
+    for vecino, datos in list(progreso.get("conexiones_por_router", {}).get(r_str, {}).items()):
+        if vecino in configurados:
+            continue
+        redes_p2p.append([datos[0], datos[1]])
+        del progreso["conexiones_por_router"][r_str][vecino]
+        progreso["conexiones_por_router"].get(vecino, {}).pop(r_str, None)
+        clave = str(tuple(sorted((int(router_num), int(vecino)))))
+        progreso.get("todas_las_conexiones", {}).pop(clave, None)
+
+    calculada["redes_p2p_disponibles"] = [
+        red for red in calculada.get("redes_p2p_disponibles", []) if list(red) not in redes_p2p
+    ]
+    liberadas.extend(redes_p2p)
+    if contexto is not None:
+        for red, mascara in liberadas:
+            contexto.diagonal_manager.liberar_red(red, int(mascara))
+    return liberadas
+
+def clave_natural(texto):
+    """Clave de ordenamiento numérico: 'R2' antes que 'R10', 'SW-2-1' antes que 'SW-10-1'"""
+    return [int(parte) if parte.isdigit() else parte for parte in re.split(r"(\d+)", str(texto))]
+
+def iterar_dispositivos(progreso):
+    """
+    Recorre los dispositivos de la sesión en orden numérico sin copiar las listas.
+
+    Yields:
+        tuple: (encabezado, nombre_archivo, comandos)
+    """
+    comandos_router = progreso.get("comandos_router", {})
+    for r_num in sorted(comandos_router, key=clave_natural):
+        yield f"! Configuración Router R{r_num}", f"R{r_num}", comandos_router[r_num]
+
+    comandos_switches = progreso.get("comandos_switches", {})
+    for r_num in sorted(comandos_switches, key=clave_natural):
+        switches = comandos_switches[r_num]
+        for sw_name in sorted(switches, key=clave_natural):
+            yield f"! Configuración Switch {sw_name}", sw_name, switches[sw_name]
+
+def _escribir_dispositivo(f, encabezado, comandos):
+    """Escribe un dispositivo línea a línea (sin unir la lista completa en memoria)"""
+    f.write(f"{encabezado}\n")
+    f.writelines(f"{comando}\n" for comando in comandos)
+    f.write("\n")
+
+def _abrir_salida(nombre_archivo, comprimir=False):
+    """Abre el archivo de salida con buffer amplio, comprimido con gzip si se pide"""
+    if comprimir or nombre_archivo.endswith(".gz"):
+        import gzip
+        return gzip.open(nombre_archivo, "wt", encoding="utf-8")
+    return open(nombre_archivo, "w", encoding="utf-8", buffering=TAMANO_BUFFER)
+
+def generar_archivo_final(estado, nombre_archivo_final, comprimir=False, validar=True):
+    """
+    Genera el archivo final de configuración Cisco en orden numérico de dispositivos.
+    Con validar=True antes se comprueba la coherencia de la sesión (ver validador_sesion.py)
+    y se avisa de los problemas encontrados; el archivo se genera igualmente.
+    """
+    if validar:
+        from validador_sesion import validar_sesion, mostrar_problemas
+        problemas = validar_sesion(estado)
+        if problemas:
+            mostrar_problemas(problemas)
+    progreso = estado["progreso_routers"]
+    with _abrir_salida(nombre_archivo_final, comprimir) as f:
+        for encabezado, _, comandos in iterar_dispositivos(progreso):
+            _escribir_dispositivo(f, encabezado, comandos)
     print(f"\n✅ Archivo final '{nombre_archivo_final}' generado correctamente.")
+
+def generar_archivos_por_dispositivo(estado, directorio, empaquetar=None, max_workers=None):
+    """
+    Genera un archivo .cisco por dispositivo, escritos en paralelo.
+
+    Args:
+        estado (dict): Sesión con los comandos generados
+        directorio (str): Directorio de salida (se crea si no existe)
+        empaquetar (str, optional): None, "gz" (cada archivo comprimido),
+            "tar" o "tar.gz" (paquete único junto al directorio)
+        max_workers (int, optional): Hilos de escritura
+
+    Returns:
+        list: Rutas generadas (o la ruta del paquete tar)
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    
+    if empaquetar not in (None, "gz", "tar", "tar.gz"):
+        raise ValueError(f"Formato de empaquetado no soportado: {empaquetar}")
+
+    os.makedirs(directorio, exist_ok=True)
+    extension = ".cisco.gz" if empaquetar == "gz" else ".cisco"
+
+    def escribir(dispositivo):
+        encabezado, nombre, comandos = dispositivo
+        ruta = os.path.join(directorio, f"{nombre}{extension}")
+        with _abrir_salida(ruta, comprimir=empaquetar == "gz") as f:
+            _escribir_dispositivo(f, encabezado, comandos)
+        return ruta
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        rutas = list(executor.map(escribir, iterar_dispositivos(estado["progreso_routers"])))
+
+    if empaquetar in ("tar", "tar.gz"):
+        import tarfile
+        ruta_paquete = f"{os.path.normpath(directorio)}.{empaquetar}"
+        modo = "w:gz" if empaquetar == "tar.gz" else "w"
+        with tarfile.open(ruta_paquete, modo) as tar:
+            for ruta in rutas:
+                tar.add(ruta, arcname=os.path.join(os.path.basename(os.path.normpath(directorio)), os.path.basename(ruta)))
+        print(f"\n✅ Paquete '{ruta_paquete}' generado con {len(rutas)} dispositivos.")
+        return [ruta_paquete]
+
+    print(f"\n✅ {len(rutas)} archivos de dispositivo generados en '{directorio}'.")
+    return rutas
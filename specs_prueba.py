@@ -0,0 +1,36 @@
+"""
+Especificaciones de topología compartidas por las pruebas (ver planificador.py)
+
+Cada prueba parte de una de estas topologías y cambia solo las claves que le
+importan; cada llamada devuelve un dict nuevo, así que modificarlo no afecta
+a otras pruebas.
+"""
+
+def spec_cadena(nombre_sesion, **cambios):
+    """
+    Tres routers en cadena (R1-R2-R3) con la VLAN 10 (/24) en R1 y R2 y la
+    VLAN 20 (/27) en R1 y R3.
+    """
+    spec = {
+        "nombre_sesion": nombre_sesion,
+        "base_ip": "19.0.0.0",
+        "num_routers": 3,
+        "vlans": [{"id": 10, "nombre": "ventas", "mascara": 24}, {"id": 20, "nombre": "rrhh", "mascara": 27}],
+        "vlans_por_router": {"1": [10, 20], "2": [10], "3": [20]},
+        "conexiones": [[1, 2], [2, 3]]
+    }
+    spec.update(cambios)
+    return spec
+
+def spec_minima(nombre_sesion, **cambios):
+    """Dos routers enlazados con la VLAN 10 (/24) en ambos"""
+    spec = {
+        "nombre_sesion": nombre_sesion,
+        "base_ip": "19.0.0.0",
+        "num_routers": 2,
+        "vlans": [{"id": 10, "nombre": "ventas", "mascara": 24}],
+        "vlans_por_router": {"1": [10], "2": [10]},
+        "conexiones": [[1, 2]]
+    }
+    spec.update(cambios)
+    return spec
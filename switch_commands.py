@@ -1,399 +1,175 @@
-def generar_config_base(sw_name, vlan_ids, vlans_nombres=None):
-    """Genera configuración base del switch"""
+"""
+Generación de comandos para switches de acceso
+
+Un único renderizador para todos los dominios L2 (detrás de un router ROAS,
+de un SWC3 o de un WLC): la topología y el reparto de puertos salen de
+topologia_l2, las prioridades STP de planificador_stp y las IPs de gestión
+de network_config.direcciones_gestion.
+"""
+from config import SSH_CONFIG
+from interface_manager import validar_limites_dispositivos
+from topologia_l2 import TopologiaL2, TIPO_SIMPLE, TIPO_SPANNING_TREE, rango_interfaces
+from planificador_stp import planificar_stp, comandos_stp
+from network_config import direcciones_gestion
+
+# Bloque de seguridad SSH de los switches (se construye una sola vez al importar)
+BLOQUE_SSH_SWITCH = (
+    f"ip domain-name {SSH_CONFIG['domain']}",
+    "crypto key generate rsa",
+    "yes",
+    str(SSH_CONFIG['rsa_key_size']),
+    f"ip ssh version {SSH_CONFIG['ssh_version']}",
+    "line vty 0 15",
+    "transport input ssh",
+    "login local",
+    f"username {SSH_CONFIG['username']} privilege 1 secret {SSH_CONFIG['password']}",
+    f"enable secret {SSH_CONFIG['enable_secret']}"
+)
+
+NOMBRE_VLAN_NATIVA = "native"
+
+def generar_config_base(sw_name, vlan_ids, vlans_nombres=None, vlan_nativa=None):
+    """Genera configuración base del switch (la VLAN nativa del WLC se llama 'native')"""
     comandos = ["en", "conf t", f"hostname {sw_name}"]
-    
+
     # Configurar VLANs
     for vlan_id in sorted(vlan_ids):
-        nombre_vlan = vlans_nombres.get(vlan_id, str(vlan_id)) if vlans_nombres else str(vlan_id)
+        if vlan_id == vlan_nativa:
+            nombre_vlan = NOMBRE_VLAN_NATIVA
+        else:
+            nombre_vlan = vlans_nombres.get(vlan_id, str(vlan_id)) if vlans_nombres else str(vlan_id)
         comandos.extend([
             f"vlan {vlan_id}",
             f"name {nombre_vlan}"
         ])
-    
+
     comandos.append("exit")
     return comandos
 
-def anadir_config_gestion(comandos, mgmt_hosts_iterator=None, mgmt_mask_decimal="", mgmt_gateway=""):
+def preparar_gestion(mgmt_combo, nombres_switches):
+    """
+    IPs de gestión de los switches (network_config.direcciones_gestion) y
+    máscara decimal del combo; (None, "") sin combo.
+    """
+    if not mgmt_combo:
+        return None, ""
+    return direcciones_gestion(mgmt_combo, nombres_switches), str(mgmt_combo.netmask)
+
+def ip_gestion(gestion, sw_name):
+    """IP de gestión del switch, o None (con aviso si el combo se ha agotado)"""
+    if gestion is None:
+        return None
+    mgmt_ip = gestion["switches"].get(sw_name)
+    if mgmt_ip is None:
+        print(f"⚠️ No hay más IPs de gestión disponibles en el combo para hostname {sw_name}.")
+    return mgmt_ip
+
+def anadir_config_gestion(comandos, mgmt_ip=None, mgmt_mask_decimal="", mgmt_gateway=""):
     """Añade configuración de gestión SSH"""
-    from config import SSH_CONFIG  # Import here to avoid circular imports
-    
-    if mgmt_hosts_iterator:
-        try:
-            mgmt_ip = str(next(mgmt_hosts_iterator))
-            comandos.extend([
-                "\n",
-                "int vlan 1",
-                f"ip address {mgmt_ip} {mgmt_mask_decimal}",
-                "no shutdown",
-                "exit",
-                f"ip default-gateway {mgmt_gateway}"
-            ])
-            
-            comandos.extend([
-                f"ip domain-name {SSH_CONFIG['domain']}",
-                "crypto key generate rsa",
-                "yes",
-                str(SSH_CONFIG['rsa_key_size']),
-                f"ip ssh version {SSH_CONFIG['ssh_version']}",
-                "line vty 0 15",
-                "transport input ssh",
-                "login local",
-                f"username {SSH_CONFIG['username']} privilege 1 secret {SSH_CONFIG['password']}",
-                f"enable secret {SSH_CONFIG['enable_secret']}"
-            ])
-        except StopIteration:
-            print(f"⚠️ No hay más IPs de gestión disponibles en el combo para {comandos[2]}.")
-    
+    if mgmt_ip:
+        comandos.extend([
+            "\n",
+            "int vlan 1",
+            f"ip address {mgmt_ip} {mgmt_mask_decimal}",
+            "no shutdown",
+            "exit",
+            f"ip default-gateway {mgmt_gateway}"
+        ])
+        comandos.extend(BLOQUE_SSH_SWITCH)
+
     return comandos
 
-def generar_comandos_switches_acceso(router_num, vlans_asignadas, l2_config, mgmt_combo, 
-                                   vlans_nombres=None, modo_config=1, conectado_a_swc3=False):
-    """Genera comandos para switches de acceso"""
-    from utils import validar_limites_dispositivos, get_switch_trunk_interface, get_switch_access_interface
-    
+def _comandos_troncal(interfaz, vlan_nativa=None):
+    """Troncal hacia router/SWC3, otro switch o AP (con VLAN nativa en dominios WLC)"""
+    comandos = [f"int {interfaz}", "switchport mode trunk"]
+    if vlan_nativa is not None:
+        comandos.append(f"switchport trunk native vlan {vlan_nativa}")
+    return comandos
+
+def generar_comandos_switches(router_num, vlans_asignadas, l2_config, mgmt_combo,
+                              vlans_nombres=None, modo_config=1, wlc_config=None):
+    """
+    Genera los comandos de todos los switches de un dominio L2 con cualquier
+    topología (topologia_l2.TopologiaL2): troncales, EtherChannel y puertos
+    de acceso se reparten en una sola pasada para todo el dominio.
+
+    Con wlc_config el dominio cuelga de un WLC: todas las troncales llevan la
+    VLAN nativa, cada switch hoja tiene un troncal para el AP y solo la
+    primera VLAN tiene puerto de acceso.
+
+    Returns:
+        dict: {nombre_switch: [comandos]}
+    """
     if not vlans_asignadas:
         return {}
-    
-    configs = {}
-    
+
     # Validar límites
     validar_limites_dispositivos(router_num=router_num)
-    
-    # Configurar gestión
-    mgmt_hosts_iterator = None
-    mgmt_gateway = ""
-    mgmt_mask_decimal = ""
-    
-    if mgmt_combo:
-        mgmt_hosts_iterator = mgmt_combo.hosts()
-        mgmt_gateway = str(list(mgmt_combo.hosts())[-1])
-        mgmt_mask_decimal = str(mgmt_combo.netmask)
 
     vlan_ids = [int(v_id) for v_id in vlans_asignadas.keys()]
-    tipo = l2_config.get("type", "simple")
-    
-    if tipo == "star":
-        num_switches = l2_config.get("count", 1)
-        for i in range(1, num_switches + 1):
-            sw_name = f"SW-{router_num}-{i}"
-            sw_cmds = generar_config_base(sw_name, vlan_ids, vlans_nombres)
-            puerto_hacia_arriba = get_switch_trunk_interface(i, 0, modo_config, "swc3" if conectado_a_swc3 else "router")
-            sw_cmds.extend([
-                f"int {puerto_hacia_arriba}",
-                "switchport mode trunk",
-                "exit"
-            ])
-            sw_cmds = anadir_config_gestion(sw_cmds, mgmt_hosts_iterator, mgmt_mask_decimal, mgmt_gateway)
-            sw_cmds.append("\nend")
-            configs[sw_name] = sw_cmds
-    
-    elif tipo == "etherchannel":
-        proto = l2_config.get("protocol", "lacp")
-        mode1 = "active" if proto == "lacp" else "desirable"
-        mode2 = "passive" if proto == "lacp" else "auto"
-        
-        # Switch 1 (conectado al router)
-        sw1_name = f"SW-{router_num}-1"
-        sw1_cmds = generar_config_base(sw1_name, vlan_ids, vlans_nombres)
-        
-        # EtherChannel hacia Switch 2 (fa0/1-3) + trunk hacia Switch 2 (fa0/4)
-        sw1_cmds.extend([
-            "int range fa0/1-3",
-            "switchport mode trunk",
-            f"channel-group 1 mode {mode1}",
-            "exit",
-            "int fa0/4",
-            "switchport mode trunk",
-            "exit"
-        ])
-        sw1_cmds = anadir_config_gestion(sw1_cmds, mgmt_hosts_iterator, mgmt_mask_decimal, mgmt_gateway)
-        sw1_cmds.append("\nend")
-        configs[sw1_name] = sw1_cmds
-        
-        # Switch 2 (conectado solo al Switch 1)
-        sw2_name = f"SW-{router_num}-2"
-        sw2_cmds = generar_config_base(sw2_name, vlan_ids, vlans_nombres)
-        
-        # Solo EtherChannel (fa0/1-3), NO hay conexión directa al router
-        sw2_cmds.extend([
-            "int range fa0/1-3",
-            "switchport mode trunk",
-            f"channel-group 1 mode {mode2}",
-            "exit"
-        ])
-        sw2_cmds = anadir_config_gestion(sw2_cmds, mgmt_hosts_iterator, mgmt_mask_decimal, mgmt_gateway)
-        sw2_cmds.append("\nend")
-        configs[sw2_name] = sw2_cmds
-    
-    elif tipo == "spanning_tree":
-        # Usar interfaces dinámicas para spanning tree
-        puerto_hacia_arriba = get_switch_trunk_interface(1, 0, modo_config, "swc3" if conectado_a_swc3 else "router")
-        
-        # Switch 1 (Root)
-        sw1_name = f"SW-{router_num}-1"
-        sw1_cmds = generar_config_base(sw1_name, vlan_ids, vlans_nombres)
-        trunk_int1 = get_switch_trunk_interface(1, 1, modo_config)
-        trunk_int2 = get_switch_trunk_interface(1, 2, modo_config)
-        sw1_cmds.extend([
-            "spanning-tree vlan 1 priority 4096",
-            f"int {puerto_hacia_arriba}",
-            "switchport mode trunk",
-            f"int {trunk_int1}",
-            "switchport mode trunk",
-            f"int {trunk_int2}",
-            "switchport mode trunk",
-            "exit"
-        ])
-        sw1_cmds = anadir_config_gestion(sw1_cmds, mgmt_hosts_iterator, mgmt_mask_decimal, mgmt_gateway)
-        sw1_cmds.append("\nend")
-        configs[sw1_name] = sw1_cmds
-        
-        # Switch 2
-        sw2_name = f"SW-{router_num}-2"
-        sw2_cmds = generar_config_base(sw2_name, vlan_ids, vlans_nombres)
-        trunk_int1 = get_switch_trunk_interface(2, 1, modo_config)
-        trunk_int3 = get_switch_trunk_interface(2, 3, modo_config)
-        sw2_cmds.extend([
-            f"int {trunk_int1}",
-            "switchport mode trunk",
-            f"int {trunk_int3}",
-            "switchport mode trunk",
-            "exit"
-        ])
-        sw2_cmds = anadir_config_gestion(sw2_cmds, mgmt_hosts_iterator, mgmt_mask_decimal, mgmt_gateway)
-        sw2_cmds.append("\nend")
-        configs[sw2_name] = sw2_cmds
-        
-        # Switch 3
-        sw3_name = f"SW-{router_num}-3"
-        sw3_cmds = generar_config_base(sw3_name, vlan_ids, vlans_nombres)
-        trunk_int2 = get_switch_trunk_interface(3, 2, modo_config)
-        trunk_int3 = get_switch_trunk_interface(3, 3, modo_config)
-        sw3_cmds.extend([
-            f"int {trunk_int2}",
-            "switchport mode trunk",
-            f"int {trunk_int3}",
-            "switchport mode trunk",
-            "exit"
-        ])
-        sw3_cmds = anadir_config_gestion(sw3_cmds, mgmt_hosts_iterator, mgmt_mask_decimal, mgmt_gateway)
-        sw3_cmds.append("\nend")
-        configs[sw3_name] = sw3_cmds
-    
-    else:  # simple o daisy_chain
-        num_switches = l2_config.get("count", 1)
-        for i in range(1, num_switches + 1):
-            puerto_hacia_arriba = get_switch_trunk_interface(i, 0, modo_config, "swc3" if conectado_a_swc3 else "router") if i == 1 else get_switch_trunk_interface(i, 0, modo_config)
-            sw_name = f"SW-{router_num}" if num_switches == 1 else f"SW-{router_num}-{i}"
-            sw_cmds = generar_config_base(sw_name, vlan_ids, vlans_nombres)
-            
-            sw_cmds.extend([
-                f"int {puerto_hacia_arriba}",
-                "switchport mode trunk"
-            ])
-            
-            if tipo == "daisy_chain" and i < num_switches:
-                puerto_siguiente = get_switch_trunk_interface(i, 1, modo_config)
-                sw_cmds.extend([
-                    f"int {puerto_siguiente}",
-                    "switchport mode trunk"
-                ])
-            
-            if tipo == "simple":
-                for vlan_id in vlan_ids:
-                    port = get_switch_access_interface(router_num, vlan_id, modo_config)
-                    sw_cmds.extend([
-                        f"int {port}",
-                        "switchport mode access",
-                        f"switchport access vlan {vlan_id}"
-                    ])
-            
-            sw_cmds = anadir_config_gestion(sw_cmds, mgmt_hosts_iterator, mgmt_mask_decimal, mgmt_gateway)
-            sw_cmds.append("\nend")
-            configs[sw_name] = sw_cmds
-    
-    return configs
+    if vlans_nombres:
+        # Las claves llegan como texto desde el JSON de la sesión
+        vlans_nombres = {int(v_id): nombre for v_id, nombre in vlans_nombres.items()}
+    vlan_nativa = wlc_config['vlan_nativa'] if wlc_config else None
+    vlans_acceso = vlan_ids[:1] if wlc_config else vlan_ids
+
+    topologia = TopologiaL2.desde_config(l2_config)
+    nombres = topologia.nombres(router_num)
+    asignacion = topologia.asignar_puertos(router_num, vlans_acceso, modo_config, puerto_ap=wlc_config is not None)
+    gestion, mgmt_mask_decimal = preparar_gestion(mgmt_combo, nombres.values())
+    mgmt_gateway = gestion["gateway"] if gestion else ""
+
+    # Raíz/secundario por grupo de VLANs si el dominio tiene bucles (ver planificador_stp.py)
+    stp = {}
+    plan_stp = planificar_stp(asignacion, vlan_ids, l2_config.get("stp_grupos"))
+    if topologia.tipo == TIPO_SPANNING_TREE or plan_stp.tiene_bucles():
+        stp = comandos_stp(plan_stp)
 
-def generar_comandos_switches_acceso_con_wlc(router_num, vlans_asignadas, wlc_config, 
-                                           topologia_switches, mgmt_combo, vlans_nombres=None, modo_config=1):
-    """Genera comandos para switches de acceso con WLC"""
-    from utils import validar_limites_dispositivos, get_switch_trunk_interface, get_switch_access_interface
-    from config import SSH_CONFIG
-    
-    if not vlans_asignadas:
-        return {}
-    
     configs = {}
-    
-    # Validar límites
-    validar_limites_dispositivos(router_num=router_num)
-    
-    # Configurar gestión
-    mgmt_hosts_iterator = None
-    mgmt_gateway = ""
-    mgmt_mask_decimal = ""
-    
-    if mgmt_combo:
-        mgmt_hosts_iterator = mgmt_combo.hosts()
-        mgmt_gateway = str(list(mgmt_combo.hosts())[-1])
-        mgmt_mask_decimal = str(mgmt_combo.netmask)
-    
-    def generar_config_base_wlc(sw_name, vlan_ids, vlan_nativa):
-        """Genera configuración base del switch con WLC"""
-        comandos = ["en", "conf t", f"hostname {sw_name}"]
-        
-        # Configurar VLANs
-        for vlan_id in sorted(vlan_ids):
-            if vlan_id == vlan_nativa:
-                nombre_vlan = "native"
+    for sw, puertos in asignacion.items():
+        sw_name = nombres[sw]
+        sw_cmds = generar_config_base(sw_name, vlan_ids, vlans_nombres, vlan_nativa)
+        sw_cmds.extend(stp.get(sw, []))
+
+        if puertos["uplink"]:
+            sw_cmds.extend(_comandos_troncal(puertos["uplink"], vlan_nativa))
+        for troncal in puertos["troncales"]:
+            if "grupo" in troncal:
+                sw_cmds.extend(_comandos_troncal(f"range {rango_interfaces(troncal['interfaces'])}", vlan_nativa))
+                sw_cmds.append(f"channel-group {troncal['grupo']} mode {troncal['modo']}")
             else:
-                nombre_vlan = vlans_nombres.get(vlan_id, str(vlan_id)) if vlans_nombres else str(vlan_id)
-            comandos.extend([
-                f"vlan {vlan_id}",
-                f"name {nombre_vlan}"
+                sw_cmds.extend(_comandos_troncal(troncal["interfaces"][0], vlan_nativa))
+        if "ap" in puertos:
+            sw_cmds.extend(_comandos_troncal(puertos["ap"], vlan_nativa))
+        for port, vlan_id in puertos["acceso"]:
+            sw_cmds.extend([
+                f"int {port}",
+                "switchport mode access",
+                f"switchport access vlan {vlan_id}"
             ])
-        
-        comandos.append("exit")
-        return comandos
-    
-    def anadir_config_gestion_local(comandos):
-        """Añade configuración de gestión SSH"""
-        if mgmt_hosts_iterator:
-            try:
-                mgmt_ip = str(next(mgmt_hosts_iterator))
-                comandos.extend([
-                    "int vlan 1",
-                    f"ip address {mgmt_ip} {mgmt_mask_decimal}",
-                    "no shutdown",
-                    "exit",
-                    f"ip default-gateway {mgmt_gateway}",
-                    f"ip domain-name {SSH_CONFIG['domain']}",
-                    "crypto key generate rsa",
-                    "yes",
-                    str(SSH_CONFIG['rsa_key_size']),
-                    f"ip ssh version {SSH_CONFIG['ssh_version']}",
-                    "line vty 0 15",
-                    "transport input ssh",
-                    "login local",
-                    f"username {SSH_CONFIG['username']} privilege 1 secret {SSH_CONFIG['password']}",
-                    f"enable secret {SSH_CONFIG['enable_secret']}"
-                ])
-            except StopIteration:
-                print(f"⚠️ No hay más IPs de gestión disponibles en el combo para {comandos[2]}.")
-        
-        return comandos
-    
-    vlan_ids = [int(v_id) for v_id in vlans_asignadas.keys()]
-    vlan_nativa = wlc_config['vlan_nativa']
-    count = topologia_switches["count"]
-    tipo = topologia_switches["type"]
-    
-    if count == 1:
-        # Un solo switch
-        sw_name = f"SW-{router_num}"
-        sw_cmds = generar_config_base_wlc(sw_name, vlan_ids, vlan_nativa)
-        
-        # Puerto hacia SWC3
-        puerto_swc3 = get_switch_trunk_interface(1, 0, modo_config, "swc3")
-        sw_cmds.extend([
-            f"int {puerto_swc3}",
-            "switchport mode trunk",
-            f"switchport trunk native vlan {vlan_nativa}"
-        ])
-        
-        # Puerto para AP
-        puerto_ap = get_switch_trunk_interface(1, 1, modo_config)
-        sw_cmds.extend([
-            f"int {puerto_ap}",
-            "switchport mode trunk",
-            f"switchport trunk native vlan {vlan_nativa}"
-        ])
-        
-        # Puerto para PC
-        puerto_pc = get_switch_access_interface(router_num, vlan_ids[0] if vlan_ids else vlan_nativa, modo_config)
-        sw_cmds.extend([
-            f"int {puerto_pc}",
-            f"switchport access vlan {vlan_ids[0] if vlan_ids else vlan_nativa}"
-        ])
-        
-        sw_cmds = anadir_config_gestion_local(sw_cmds)
-        sw_cmds.append("end")
+        sw_cmds.append("exit")
+
+        sw_cmds = anadir_config_gestion(sw_cmds, ip_gestion(gestion, sw_name), mgmt_mask_decimal, mgmt_gateway)
+        sw_cmds.append("\nend")
         configs[sw_name] = sw_cmds
-        
-    elif count == 2:
-        if tipo == "estrella":
-            # Dos switches conectados directamente al SWC3
-            for i in range(1, 3):
-                sw_name = f"SW-{router_num}-{i}"
-                sw_cmds = generar_config_base_wlc(sw_name, vlan_ids, vlan_nativa)
-                
-                # Puerto hacia SWC3
-                puerto_swc3 = get_switch_trunk_interface(i, 0, modo_config, "swc3")
-                sw_cmds.extend([
-                    f"int {puerto_swc3}",
-                    "switchport mode trunk",
-                    f"switchport trunk native vlan {vlan_nativa}"
-                ])
-                
-                # Puerto para AP/PC
-                puerto_device = get_switch_trunk_interface(i, 1, modo_config)
-                sw_cmds.extend([
-                    f"int {puerto_device}",
-                    "switchport mode trunk",
-                    f"switchport trunk native vlan {vlan_nativa}"
-                ])
-                
-                sw_cmds = anadir_config_gestion_local(sw_cmds)
-                sw_cmds.append("end")
-                configs[sw_name] = sw_cmds
-                
-        else:  # cadena
-            # Switch 1 conectado al SWC3
-            sw1_name = f"SW-{router_num}-1"
-            sw1_cmds = generar_config_base_wlc(sw1_name, vlan_ids, vlan_nativa)
-            
-            # Puerto hacia SWC3
-            puerto_swc3 = get_switch_trunk_interface(1, 0, modo_config, "swc3")
-            sw1_cmds.extend([
-                f"int {puerto_swc3}",
-                "switchport mode trunk",
-                f"switchport trunk native vlan {vlan_nativa}"
-            ])
-            
-            # Puerto hacia segundo switch
-            puerto_switch2 = get_switch_trunk_interface(1, 1, modo_config)
-            sw1_cmds.extend([
-                f"int {puerto_switch2}",
-                "switchport mode trunk",
-                f"switchport trunk native vlan {vlan_nativa}"
-            ])
-            
-            sw1_cmds = anadir_config_gestion_local(sw1_cmds)
-            sw1_cmds.append("end")
-            configs[sw1_name] = sw1_cmds
-            
-            # Switch 2 conectado al Switch 1
-            sw2_name = f"SW-{router_num}-2"
-            sw2_cmds = generar_config_base_wlc(sw2_name, vlan_ids, vlan_nativa)
-            
-            # Puerto hacia primer switch
-            puerto_switch1 = get_switch_trunk_interface(2, 0, modo_config)
-            sw2_cmds.extend([
-                f"int {puerto_switch1}",
-                "switchport mode trunk",
-                f"switchport trunk native vlan {vlan_nativa}"
-            ])
-            
-            # Puerto para AP
-            puerto_ap = get_switch_trunk_interface(2, 1, modo_config)
-            sw2_cmds.extend([
-                f"int {puerto_ap}",
-                "switchport mode trunk",
-                f"switchport trunk native vlan {vlan_nativa}"
-            ])
-            
-            sw2_cmds = anadir_config_gestion_local(sw2_cmds)
-            sw2_cmds.append("end")
-            configs[sw2_name] = sw2_cmds
-    
+
     return configs
+
+def generar_comandos_switches_acceso(router_num, vlans_asignadas, l2_config, mgmt_combo,
+                                   vlans_nombres=None, modo_config=1, conectado_a_swc3=False):
+    """Genera comandos para los switches de acceso de un router ROAS o de un SWC3"""
+    return generar_comandos_switches(router_num, vlans_asignadas, l2_config, mgmt_combo,
+                                     vlans_nombres=vlans_nombres, modo_config=modo_config)
+
+def generar_comandos_switches_acceso_con_wlc(router_num, vlans_asignadas, wlc_config,
+                                           topologia_switches, mgmt_combo, vlans_nombres=None, modo_config=1):
+    """
+    Genera comandos para switches de acceso con WLC. topologia_switches es
+    {"count", "type": "estrella" | "cadena"} (o cualquier l2_config); un
+    único switch se nombra SW-<router>.
+    """
+    l2_config = dict(topologia_switches)
+    if int(l2_config.get("count", 1)) == 1 and "enlaces" not in l2_config:
+        l2_config["type"] = TIPO_SIMPLE
+    return generar_comandos_switches(router_num, vlans_asignadas, l2_config, mgmt_combo,
+                                     vlans_nombres=vlans_nombres, modo_config=modo_config, wlc_config=wlc_config)
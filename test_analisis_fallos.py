@@ -0,0 +1,44 @@
+"""
+Script de prueba para verificar el análisis de puntos únicos de fallo
+"""
+import sys
+import os
+
+# Agregar el directorio actual al path para importar los módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from planificador import planificar_sesion
+from analisis_fallos import analizar_fallos, analizar_grafo
+from specs_prueba import spec_cadena
+
+SPEC = spec_cadena(
+    "fallos", num_routers=5,
+    vlans_por_router={"1": [10, 20], "2": [10], "3": [20], "4": [10], "5": [20]},
+    conexiones=[[1, 2], [2, 3], [1, 3], [3, 4], [4, 5]]
+)
+
+def test_puentes_y_articulaciones_con_impacto():
+    """Triángulo R1-R2-R3 con la cola R3-R4-R5: los enlaces de la cola son puentes y R3, R4 articulaciones"""
+    informe = analizar_fallos(planificar_sesion(SPEC))
+    assert informe["pares_totales"] == 36
+    # R3-R4 separa {R1, R2, R3} (4 VLANs) de {R4, R5} (2): 2 * 4 * 2 pares
+    assert [(f["enlace"], f["pares_cortados"]) for f in informe["enlaces"]] == [("R3-R4", 16), ("R4-R5", 10)]
+    # Sin R3 quedan {R1, R2} (3 VLANs) y {R4, R5} (2); sin R4, {R1, R2, R3} (4) y {R5} (1)
+    assert [(f["router"], f["pares_cortados"], f["vlans_locales"]) for f in informe["routers"]] == [("R3", 12, 1), ("R4", 8, 1)]
+
+def test_enlaces_paralelos_y_anillo_sin_fallos_unicos():
+    """Dos enlaces entre los mismos routers no son puente; un anillo no tiene puntos únicos"""
+    puentes, articulaciones = analizar_grafo([1, 2], [("a", 30, 1, 2), ("b", 30, 1, 2)], {1: 1, 2: 1})
+    assert puentes == [] and articulaciones == {}
+    anillo = [("red", 30, r, r % 6 + 1) for r in range(1, 7)]
+    assert analizar_grafo(range(1, 7), anillo, {r: 1 for r in range(1, 7)}) == ([], {})
+
+if __name__ == "__main__":
+    try:
+        test_puentes_y_articulaciones_con_impacto()
+        test_enlaces_paralelos_y_anillo_sin_fallos_unicos()
+        print("\n✅ PRUEBA COMPLETADA")
+    except Exception as e:
+        print(f"\n❌ Error en la prueba: {e}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,90 @@
+"""
+Script de prueba para verificar los archivos por dispositivo (main.py --por-dispositivo) en todos los formatos
+"""
+import sys
+import os
+import gzip
+import json
+import subprocess
+import tarfile
+import tempfile
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+
+# Agregar el directorio actual al path para importar los módulos
+sys.path.append(DIRECTORIO)
+
+from main import regenerar_por_dispositivo
+
+# Claves desordenadas a propósito: R10 y SW-10-10 deben ir después de R2 y SW-10-2
+ESTADO = {
+    "nombre_sesion": "orden",
+    "progreso_routers": {
+        "comandos_router": {"10": ["hostname R10"], "2": ["hostname R2"], "1": ["hostname R1", "end"]},
+        "comandos_switches": {
+            "10": {"SW-10-10": ["hostname SW-10-10"], "SW-10-2": ["hostname SW-10-2"]},
+            "2": {"SW-2-1": ["hostname SW-2-1"]}
+        }
+    }
+}
+ORDEN = ["R1", "R2", "R10", "SW-2-1", "SW-10-2", "SW-10-10"]
+
+def _contenido(nombre):
+    """Texto esperado del archivo de un dispositivo"""
+    if nombre.startswith("R"):
+        encabezado, comandos = f"! Configuración Router {nombre}", ESTADO["progreso_routers"]["comandos_router"][nombre[1:]]
+    else:
+        encabezado, comandos = f"! Configuración Switch {nombre}", ESTADO["progreso_routers"]["comandos_switches"][nombre.split("-")[1]][nombre]
+    return "".join(f"{linea}\n" for linea in [encabezado, *comandos]) + "\n"
+
+def _por_dispositivo(directorio_trabajo, *argumentos):
+    """Ejecuta main.py --por-dispositivo sobre la sesión de prueba"""
+    ruta_sesion = os.path.join(directorio_trabajo, "orden.json")
+    with open(ruta_sesion, "w", encoding="utf-8") as f:
+        json.dump(ESTADO, f)
+    subprocess.run(
+        [sys.executable, os.path.join(DIRECTORIO, "main.py"), "--por-dispositivo", ruta_sesion, *argumentos],
+        cwd=directorio_trabajo, capture_output=True, text=True, check=True
+    )
+
+def test_archivos_sueltos_y_gz():
+    """Sin empaquetar y con gz hay un archivo por dispositivo con sus comandos, en orden numérico"""
+    with tempfile.TemporaryDirectory() as directorio:
+        _por_dispositivo(directorio)  # Directorio por defecto: <sesion>_dispositivos
+        for nombre in ORDEN:
+            with open(os.path.join(directorio, "orden_dispositivos", f"{nombre}.cisco"), encoding="utf-8") as f:
+                assert f.read() == _contenido(nombre)
+
+        salida = os.path.join(directorio, "comprimidos")
+        _por_dispositivo(directorio, salida, "gz")
+        assert sorted(os.listdir(salida)) == sorted(f"{nombre}.cisco.gz" for nombre in ORDEN)
+        for nombre in ORDEN:
+            with gzip.open(os.path.join(salida, f"{nombre}.cisco.gz"), "rt", encoding="utf-8") as f:
+                assert f.read() == _contenido(nombre)
+
+        # Las rutas devueltas siguen el orden numérico de dispositivos
+        ruta_sesion = os.path.join(directorio, "orden.json")
+        rutas = regenerar_por_dispositivo(ruta_sesion, os.path.join(directorio, "otra"), "gz")
+        assert [os.path.basename(ruta) for ruta in rutas] == [f"{nombre}.cisco.gz" for nombre in ORDEN]
+
+def test_paquetes_tar_y_tar_gz():
+    """tar y tar.gz guardan los dispositivos en orden numérico dentro de la carpeta del directorio"""
+    for formato in ("tar", "tar.gz"):
+        with tempfile.TemporaryDirectory() as directorio:
+            salida = os.path.join(directorio, "paquete")
+            _por_dispositivo(directorio, salida, formato)
+            with tarfile.open(f"{salida}.{formato}", "r:*") as tar:
+                miembros = tar.getmembers()
+                assert [m.name for m in miembros] == [f"paquete/{nombre}.cisco" for nombre in ORDEN]
+                for miembro, nombre in zip(miembros, ORDEN):
+                    assert tar.extractfile(miembro).read().decode("utf-8") == _contenido(nombre)
+
+if __name__ == "__main__":
+    try:
+        test_archivos_sueltos_y_gz()
+        test_paquetes_tar_y_tar_gz()
+        print("\n✅ PRUEBA COMPLETADA")
+    except Exception as e:
+        print(f"\n❌ Error en la prueba: {e}")
+        import traceback
+        traceback.print_exc()
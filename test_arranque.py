@@ -0,0 +1,64 @@
+"""
+Script de prueba para verificar el presupuesto de arranque (importaciones diferidas)
+"""
+import sys
+import os
+import subprocess
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+
+# Módulos que no deben cargarse al importar main ni en la ruta rápida --regenerar
+MODULOS_DIFERIDOS = [
+    "routing", "router_commands", "router_config", "switch_commands",
+    "session_init", "network_config", "diagonal_manager", "validaciones",
+    "tarfile", "gzip", "concurrent.futures", "subprocess"
+]
+
+# Presupuesto acumulado de 'import main' medido con -X importtime (microsegundos)
+PRESUPUESTO_IMPORTACION_US = 50000
+
+def _ejecutar(codigo, *opciones):
+    return subprocess.run(
+        [sys.executable, *opciones, "-c", codigo],
+        cwd=DIRECTORIO, capture_output=True, text=True, check=True
+    )
+
+def test_importar_main_no_carga_generadores():
+    """Importar main solo carga config"""
+    salida = _ejecutar("import sys, main; print('\\n'.join(sys.modules))").stdout.split()
+    cargados = [m for m in MODULOS_DIFERIDOS if m in salida]
+    print(f"Módulos diferidos cargados: {cargados}")
+    assert cargados == []
+
+def test_ruta_rapida_regenerar_no_carga_generadores():
+    """La regeneración desde sesión guardada solo necesita session_manager"""
+    codigo = (
+        "import sys, main; from session_manager import generar_archivo_final; "
+        "print('\\n'.join(sys.modules))"
+    )
+    salida = _ejecutar(codigo).stdout.split()
+    assert "session_manager" in salida
+    assert [m for m in MODULOS_DIFERIDOS if m in salida] == []
+
+def test_presupuesto_importtime():
+    """El tiempo acumulado de 'import main' está dentro del presupuesto"""
+    resultado = _ejecutar("import main", "-X", "importtime")
+    for linea in resultado.stderr.splitlines():
+        partes = [p.strip() for p in linea.split("|")]
+        if len(partes) == 3 and partes[2] == "main":
+            acumulado = int(partes[1])
+            print(f"import main: {acumulado} us (presupuesto {PRESUPUESTO_IMPORTACION_US} us)")
+            assert acumulado < PRESUPUESTO_IMPORTACION_US
+            return
+    raise AssertionError("No se encontró 'main' en la salida de -X importtime")
+
+if __name__ == "__main__":
+    try:
+        test_importar_main_no_carga_generadores()
+        test_ruta_rapida_regenerar_no_carga_generadores()
+        test_presupuesto_importtime()
+        print("\n✅ PRUEBA COMPLETADA")
+    except Exception as e:
+        print(f"\n❌ Error en la prueba: {e}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,86 @@
+"""
+Script de prueba para verificar la generación de configuraciones delta
+"""
+import sys
+import os
+
+# Agregar el directorio actual al path para importar los módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config_diff import calcular_delta_dispositivo, calcular_delta_sesion
+
+ROUTER_ANTES = [
+    "en", "conf t", "hostname R1",
+    "int eth0/0/0", "ip add 19.0.0.5 255.255.255.252", "no shut",
+    "int fa0/0", "no shut", "exit",
+    "int fa0/0.10", "encapsulation dot1Q 10", "ip add 19.0.1.254 255.255.255.0", "no shut",
+    "int fa0/0.20", "encapsulation dot1Q 20", "ip add 19.0.2.254 255.255.255.0", "no shut",
+    "exit\n\n\n",
+    "ip dhcp pool vlan10", "default-router 19.0.1.254", "network 19.0.1.0 255.255.255.0",
+    "ip dhcp pool vlan20", "default-router 19.0.2.254", "network 19.0.2.0 255.255.255.0",
+    "ip domain-name cisco.com",
+    "\n\n\ncrypto key generate rsa", "yes", "1024",
+    "line vty 0 4", "transport input ssh", "login local",
+    "ip route 19.0.8.0 255.255.255.0 19.0.0.6",
+    "ip route 19.0.9.0 255.255.255.0 19.0.0.6",
+    "\nend"
+]
+
+def test_delta_sin_cambios():
+    """Una configuración idéntica no genera comandos"""
+    assert calcular_delta_dispositivo(ROUTER_ANTES, list(ROUTER_ANTES)) == []
+
+def test_delta_elimina_subinterfaz_pool_y_ruta():
+    """Se generan las formas "no" de lo eliminado"""
+    eliminar = {
+        "int fa0/0.20", "encapsulation dot1Q 20", "ip add 19.0.2.254 255.255.255.0",
+        "ip dhcp pool vlan20", "default-router 19.0.2.254", "network 19.0.2.0 255.255.255.0",
+        "ip route 19.0.9.0 255.255.255.0 19.0.0.6"
+    }
+    despues = [c for c in ROUTER_ANTES if c not in eliminar]
+    delta = calcular_delta_dispositivo(ROUTER_ANTES, despues)
+
+    print("\nDelta generado:")
+    for comando in delta:
+        print(f"   {comando}")
+
+    assert delta[0:2] == ["en", "conf t"] and delta[-1] == "end"
+    assert "no int fa0/0.20" in delta
+    assert "no ip dhcp pool vlan20" in delta
+    assert "no ip route 19.0.9.0 255.255.255.0 19.0.0.6" in delta
+    assert "int fa0/0.10" not in delta
+    assert "crypto key generate rsa" not in delta
+
+def test_delta_cambio_ip_interfaz():
+    """Un cambio de IP retira la anterior y aplica la nueva en el mismo bloque"""
+    despues = [c.replace("19.0.0.5", "19.0.0.9") for c in ROUTER_ANTES]
+    delta = calcular_delta_dispositivo(ROUTER_ANTES, despues)
+    assert delta == [
+        "en", "conf t",
+        "int eth0/0/0",
+        "no ip add 19.0.0.5 255.255.255.252",
+        "ip add 19.0.0.9 255.255.255.252",
+        "exit",
+        "end"
+    ]
+
+def test_delta_sesion_orden_numerico():
+    """Solo aparecen los dispositivos con cambios, en orden numérico"""
+    antes = {"progreso_routers": {"comandos_router": {"2": ROUTER_ANTES, "10": ROUTER_ANTES}}}
+    nuevo_r = ROUTER_ANTES[:-1] + ["ip route 19.0.10.0 255.255.255.0 19.0.0.6", "\nend"]
+    despues = {"progreso_routers": {"comandos_router": {"10": nuevo_r, "2": nuevo_r, "3": ROUTER_ANTES}}}
+    delta = calcular_delta_sesion(antes, despues)
+    assert list(delta) == ["R2", "R3", "R10"]
+    assert delta["R2"] == ["en", "conf t", "ip route 19.0.10.0 255.255.255.0 19.0.0.6", "end"]
+
+if __name__ == "__main__":
+    try:
+        test_delta_sin_cambios()
+        test_delta_elimina_subinterfaz_pool_y_ruta()
+        test_delta_cambio_ip_interfaz()
+        test_delta_sesion_orden_numerico()
+        print("\n✅ PRUEBA COMPLETADA")
+    except Exception as e:
+        print(f"\n❌ Error en la prueba: {e}")
+        import traceback
+        traceback.print_exc()
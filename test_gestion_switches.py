@@ -0,0 +1,69 @@
+"""
+Script de prueba para verificar la asignación de IPs de gestión de los switches
+"""
+import sys
+import os
+import ipaddress
+
+# Agregar el directorio actual al path para importar los módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from network_config import AsignadorGestion, direcciones_gestion, preparar_combos_gestion
+from planificador import planificar_sesion, generar_configuraciones
+from session_manager import revertir_paso_router
+from specs_prueba import spec_minima
+
+def test_combos_por_indice():
+    """El combo i sale por aritmética y coincide con el reparto del /8 omitiendo el de la IP base"""
+    asignador = AsignadorGestion("192.168.100.0", 24)
+    esperados = list(ipaddress.ip_network("192.0.0.0/8").subnets(new_prefix=24))
+    inicio = esperados.index(ipaddress.ip_network("192.168.100.0/24")) + 1
+    assert asignador.num_combos == len(esperados) - inicio
+    for indice in (0, 1, 500, asignador.num_combos - 1):
+        assert asignador.combo(indice) == esperados[inicio + indice]
+    assert preparar_combos_gestion("192.168.100.0", 24, 3) == esperados[inicio:inicio + 3]
+    try:
+        asignador.combo(asignador.num_combos)
+        assert False, "Debía lanzar ValueError"
+    except ValueError:
+        pass
+
+    # Un /29 tiene 6 hosts: el último es el gateway y caben 5 switches
+    gestion = direcciones_gestion(ipaddress.ip_network("10.0.0.8/29"), [f"SW-{i}" for i in range(1, 8)])
+    assert gestion["gateway"] == "10.0.0.14"
+    assert gestion["switches"] == {f"SW-{i}": f"10.0.0.{8 + i}" for i in range(1, 6)}
+
+def test_gestion_en_la_sesion():
+    """Cada dominio recibe el combo de su router; las IPs quedan en la sesión y en los comandos"""
+    spec = spec_minima(
+        "gestion", mgmt_base_ip="192.168.100.0", mgmt_prefijo_combo=24,
+        l2={"1": {"type": "ring", "count": 3}, "2": {"type": "simple"}}
+    )
+    estado = generar_configuraciones(planificar_sesion(spec))
+    progreso = estado["progreso_routers"]
+    gestion = progreso["gestion_switches"]
+    assert gestion["1"]["switches"] == {f"SW-1-{i}": f"192.168.101.{i}" for i in range(1, 4)}
+    assert gestion["2"] == {"red": "192.168.102.0", "mascara": 24, "gateway": "192.168.102.254",
+                            "switches": {"SW-2": "192.168.102.1"}}
+    comandos = progreso["comandos_switches"]["1"]["SW-1-3"]
+    assert "ip address 192.168.101.3 255.255.255.0" in comandos
+    assert "ip default-gateway 192.168.101.254" in comandos
+
+    revertir_paso_router(estado, 2)
+    assert "2" not in progreso["gestion_switches"]
+
+    # Sin red de gestión no hay configuración SSH ni asignaciones
+    spec.pop("mgmt_base_ip")
+    progreso = generar_configuraciones(planificar_sesion(spec))["progreso_routers"]
+    assert "gestion_switches" not in progreso
+    assert "int vlan 1" not in progreso["comandos_switches"]["1"]["SW-1-1"]
+
+if __name__ == "__main__":
+    try:
+        test_combos_por_indice()
+        test_gestion_en_la_sesion()
+        print("\n✅ PRUEBA COMPLETADA")
+    except Exception as e:
+        print(f"\n❌ Error en la prueba: {e}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,102 @@
+"""
+Script de prueba para verificar la grabación y reproducción de respuestas del asistente
+"""
+import sys
+import os
+import builtins
+import json
+import tempfile
+
+# Agregar el directorio actual al path para importar los módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from validaciones import validar_entrada, establecer_fuente_entrada
+from grabacion_entradas import GrabadorEntradas, ReproductorEntradas, ReproduccionAgotada, RespuestaRechazada
+
+def _asistente():
+    """Tres preguntas del asistente, como en iniciar_nueva_sesion()"""
+    return (
+        validar_entrada("Numero de routers: ", "numero_positivo"),
+        validar_entrada("IP base: ", "ip"),
+        validar_entrada("¿Usar SWC3? (s/n): ", "si_no")
+    )
+
+def _grabar(ruta, respuestas):
+    """Ejecuta el asistente respondiendo con `respuestas` a input() y guarda la grabación"""
+    pendientes = iter(respuestas)
+    leer_original = builtins.input
+    builtins.input = lambda mensaje="": next(pendientes)
+    grabador = GrabadorEntradas(ruta)
+    establecer_fuente_entrada(grabador)
+    try:
+        return _asistente()
+    finally:
+        establecer_fuente_entrada(None)
+        builtins.input = leer_original
+        grabador.guardar()
+
+def _reproducir(ruta, funcion=_asistente):
+    reproductor = ReproductorEntradas(ruta, mostrar=False)
+    establecer_fuente_entrada(reproductor)
+    try:
+        return funcion(), reproductor
+    finally:
+        establecer_fuente_entrada(None)
+
+def test_grabar_y_reproducir_omitiendo_rechazadas():
+    """Las respuestas rechazadas se graban marcadas y la reproducción las salta sin fallos"""
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "respuestas.jsonl")
+        resultado = _grabar(ruta, ["cero", "0", "3", "19.0.0.300", "19.0.0.0", "s"])
+        assert resultado == (3, "19.0.0.0", True)
+
+        with open(ruta, encoding="utf-8") as f:
+            grabadas = [json.loads(linea) for linea in f]
+        assert [e["respuesta"] for e in grabadas if not e["valida"]] == ["cero", "0", "19.0.0.300"]
+        assert all("error" in e for e in grabadas if not e["valida"])
+
+        reproducido, reproductor = _reproducir(ruta)
+        assert reproducido == resultado
+        assert reproductor.omitidas == 3
+        resumen = reproductor.resumen()
+        assert resumen["respuestas_usadas"] == 3 and resumen["fallos"] == []
+
+def test_reproduccion_informa_de_discrepancias():
+    """Las preguntas distintas a las grabadas quedan en fallos; una respuesta que ya no valida detiene la reproducción"""
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "respuestas.jsonl")
+        _grabar(ruta, ["3", "19.0.0.0", "n"])
+
+        # Otra versión del asistente: cambia el texto de una pregunta y pide una máscara donde había una IP
+        def asistente_cambiado():
+            return (
+                validar_entrada("Numero total de routers: ", "numero_positivo"),
+                validar_entrada("IP base: ", "mascara"),
+                validar_entrada("¿Usar SWC3? (s/n): ", "si_no")
+            )
+        reproductor = ReproductorEntradas(ruta, mostrar=False)
+        establecer_fuente_entrada(reproductor)
+        try:
+            asistente_cambiado()
+            assert False, "Debía detener la reproducción"
+        except RespuestaRechazada as e:
+            assert "#2" in str(e)  # No reintenta con la respuesta de la pregunta siguiente
+        finally:
+            establecer_fuente_entrada(None)
+        resumen = reproductor.resumen()
+        fallos = resumen["fallos"]
+        assert [(f["posicion"], f["respuesta"]) for f in fallos] == [(1, "3"), (2, "19.0.0.0")]
+        assert fallos[0]["error"].startswith("Pregunta distinta a la grabada")
+        assert "máscara" in fallos[1]["error"]
+        assert resumen["respuestas_usadas"] == 2
+        assert issubclass(RespuestaRechazada, ReproduccionAgotada)  # main_reproduciendo la captura igual
+
+if __name__ == "__main__":
+    try:
+        test_grabar_y_reproducir_omitiendo_rechazadas()
+        test_reproduccion_informa_de_discrepancias()
+        print("\n✅ PRUEBA COMPLETADA")
+    except Exception as e:
+        print(f"\n❌ Error en la prueba: {e}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,61 @@
+"""
+Script de prueba para verificar el cálculo de direcciones en bloque (numpy y Python puro)
+"""
+import sys
+import os
+import ipaddress
+import random
+
+import pytest
+
+# Agregar el directorio actual al path para importar los módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ip_utils import (
+    calcular_direcciones_en_bloque, obtener_direccion_de_red, _cargar_numpy, _direcciones_en_bloque_numpy,
+    _direcciones_en_bloque_python
+)
+
+def _redes_de_prueba(cantidad=2000, semilla=34):
+    """Direcciones al azar (sin alinear) con todos los prefijos, más los extremos del espacio IPv4"""
+    aleatorio = random.Random(semilla)
+    redes = [0, 0xFFFFFFFF, 0xFFFFFFFE, 1] + [aleatorio.getrandbits(32) for _ in range(cantidad)]
+    prefijos = [0, 32, 31, 30] + [aleatorio.randint(0, 32) for _ in range(cantidad)]
+    return redes, prefijos
+
+def test_python_coincide_con_ipaddress():
+    """La versión en Python puro da lo mismo que IPv4Network (hosts() para /31 y /32)"""
+    redes, prefijos = _redes_de_prueba(500)
+    filas = calcular_direcciones_en_bloque([str(ipaddress.IPv4Address(r)) for r in redes], prefijos)
+    for red, prefijo, fila in zip(redes, prefijos, filas):
+        objeto = ipaddress.IPv4Network((red, prefijo), strict=False)
+        hosts = (objeto[0], objeto[-1]) if prefijo >= 31 else (objeto[1], objeto[-2])
+        esperado = (objeto.network_address, hosts[0], hosts[1], objeto.netmask, objeto.broadcast_address)
+        assert fila == tuple(map(str, esperado)), (red, prefijo)
+
+def test_direccion_de_red():
+    """obtener_direccion_de_red (sobre red_entera) coincide con IPv4Network(strict=False)"""
+    redes, prefijos = _redes_de_prueba(500)
+    for red, prefijo in zip(redes, prefijos):
+        ip = str(ipaddress.IPv4Address(red))
+        assert obtener_direccion_de_red(ip, prefijo) == str(ipaddress.IPv4Network(f"{ip}/{prefijo}", strict=False).network_address)
+
+def test_numpy_coincide_con_python():
+    """_direcciones_en_bloque_numpy da exactamente lo mismo que la versión en Python (si numpy está instalado)"""
+    np = _cargar_numpy()
+    if np is None:
+        pytest.skip("numpy no está instalado")
+    redes, prefijos = _redes_de_prueba()
+    assert _direcciones_en_bloque_numpy(np, redes, prefijos) == _direcciones_en_bloque_python(redes, prefijos)
+
+if __name__ == "__main__":
+    try:
+        test_python_coincide_con_ipaddress()
+        test_direccion_de_red()
+        if _cargar_numpy() is not None:
+            test_numpy_coincide_con_python()
+        print("\n✅ PRUEBA COMPLETADA")
+    except Exception as e:
+        print(f"\n❌ Error en la prueba: {e}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,73 @@
+"""
+Script de prueba para verificar el procesamiento por lotes (JSONL con líneas correctas y erróneas)
+"""
+import sys
+import os
+import json
+import tempfile
+
+# Agregar el directorio actual al path para importar los módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from lotes import procesar_lote, ARCHIVO_RESULTADOS
+from specs_prueba import spec_minima
+
+SPEC = spec_minima("lote_ok")
+
+def test_lote_con_una_linea_erronea():
+    """Las líneas inválidas cuentan como error sin parar el lote y los trabajos fallidos dejan su registro.log"""
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta_jsonl = os.path.join(directorio, "lote.jsonl")
+        salida = os.path.join(directorio, "salida")
+        with open(ruta_jsonl, "w", encoding="utf-8") as f:
+            f.write(json.dumps(SPEC) + "\n")
+            f.write("# comentario\n\n")
+            f.write("{esto no es json\n")
+            f.write(json.dumps(dict(SPEC, nombre_sesion="lote_mal", num_routers=0)) + "\n")
+
+        totales = procesar_lote(ruta_jsonl, salida, max_workers=2)
+        assert (totales["ok"], totales["error"]) == (1, 2)
+
+        with open(os.path.join(salida, ARCHIVO_RESULTADOS), encoding="utf-8") as f:
+            resultados = {r["linea"]: r for r in map(json.loads, f)}
+        assert sorted(resultados) == [1, 4, 5]
+        assert resultados[1]["ok"] and all(os.path.exists(ruta) for ruta in resultados[1]["archivos"])
+        assert resultados[4]["error"].startswith("JSONDecodeError")
+        assert resultados[5]["error"].startswith("ValueError")
+
+        # La línea 4 no llega a tener directorio; la 5 falla al planificar y deja su registro
+        assert sorted(os.listdir(salida)) == ["00001_lote_ok", "00005_lote_mal", ARCHIVO_RESULTADOS]
+        for nombre in ("00001_lote_ok", "00005_lote_mal"):
+            assert os.path.exists(os.path.join(salida, nombre, "registro.log"))
+        with open(os.path.join(salida, "00005_lote_mal", "registro.log"), encoding="utf-8") as f:
+            assert resultados[5]["error"] in f.read()
+
+def test_nombres_de_sesion_no_salen_del_directorio():
+    """Un nombre_sesion con '..' o separadores se limpia antes de usarlo como ruta"""
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta_jsonl = os.path.join(directorio, "lote.jsonl")
+        salida = os.path.join(directorio, "salida")
+        with open(ruta_jsonl, "w", encoding="utf-8") as f:
+            f.write(json.dumps(dict(SPEC, nombre_sesion="../../fuera")) + "\n")
+            f.write(json.dumps(dict(SPEC, nombre_sesion="a/b\\c:d")) + "\n")
+
+        assert procesar_lote(ruta_jsonl, salida, max_workers=1)["ok"] == 2
+        assert sorted(os.listdir(directorio)) == ["lote.jsonl", "salida"]
+        assert sorted(os.listdir(salida)) == ["00001__.._fuera", "00002_a_b_c_d", ARCHIVO_RESULTADOS]
+        with open(os.path.join(salida, ARCHIVO_RESULTADOS), encoding="utf-8") as f:
+            resultados = [json.loads(linea) for linea in f]
+        # El resultado conserva el nombre original; los archivos quedan dentro de su directorio
+        assert sorted(r["nombre_sesion"] for r in resultados) == ["../../fuera", "a/b\\c:d"]
+        for resultado in resultados:
+            for ruta in resultado["archivos"]:
+                assert os.path.dirname(os.path.dirname(os.path.abspath(ruta))) == os.path.abspath(salida)
+
+if __name__ == "__main__":
+    try:
+        test_lote_con_una_linea_erronea()
+        test_nombres_de_sesion_no_salen_del_directorio()
+        print("\n✅ PRUEBA COMPLETADA")
+    except Exception as e:
+        print(f"\n❌ Error en la prueba: {e}")
+        import traceback
+        traceback.print_exc()
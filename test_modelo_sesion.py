@@ -0,0 +1,65 @@
+"""
+Script de prueba para verificar la conversión estado JSON <-> ModeloSesion
+"""
+import sys
+import os
+import json
+
+# Agregar el directorio actual al path para importar los módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from planificador import planificar_sesion, generar_configuraciones
+from modelo_sesion import ModeloSesion
+from ip_utils import ip_a_entero
+from specs_prueba import spec_cadena
+
+SPEC = spec_cadena("modelo", swc3=[3])
+
+def _normalizar(estado):
+    return json.loads(json.dumps(estado, sort_keys=True))
+
+def test_ida_y_vuelta_sin_cambios():
+    """desde_estado() + a_estado() reproduce el mismo JSON, antes y después de generar"""
+    for spec in (
+        SPEC,
+        dict(SPEC, modo_enrutamiento="ospf", conexiones=[[1, 2], [2, 3], [1, 3, {"ancho_banda": 10}]]),
+        dict(SPEC, estrategia_asignacion="jerarquica", mgmt_base_ip="192.168.100.0", l2={"1": {"type": "star", "count": 2}})
+    ):
+        estado = _normalizar(planificar_sesion(spec))
+        assert _normalizar(ModeloSesion.desde_estado(estado).a_estado()) == estado
+        generado = _normalizar(generar_configuraciones(estado))
+        assert _normalizar(ModeloSesion.desde_estado(generado).a_estado()) == generado
+
+def test_enlaces_y_routers_con_enteros():
+    """Routers, VLANs y enlaces usan claves enteras; las direcciones son enteros"""
+    estado = planificar_sesion(dict(SPEC, conexiones=[[1, 2], [2, 3], [1, 3, {"costo": 5}]]))
+    modelo = ModeloSesion.desde_estado(estado)
+    enlace = modelo.enlace(2, 1)
+    assert enlace is modelo.enlaces[(1, 2)]
+    assert enlace.ip_de(1) == enlace.red.direccion + 1 and enlace.ip_de(2) == enlace.red.direccion + 2
+    assert (modelo.enlaces[(1, 3)].costo, enlace.costo) == (5, 1)
+    red, mascara = estado["progreso_routers"]["vlans_por_router"]["1"]["10"]
+    assert (modelo.routers[1].vlans[10].direccion, modelo.routers[1].vlans[10].prefijo) == (ip_a_entero(red), mascara)
+    assert modelo.routers[3].swc3 is not None and modelo.routers[1].swc3 is None
+
+def test_conexiones_en_formato_antiguo():
+    """Un enlace [red, mascara] se convierte con el primer host para el router de menor número"""
+    estado = _normalizar(planificar_sesion(SPEC))
+    conexiones = estado["progreso_routers"]["todas_las_conexiones"]
+    nuevo = conexiones["(2, 3)"]
+    conexiones["(2, 3)"] = [nuevo["red"], nuevo["mascara"]]
+    modelo = ModeloSesion.desde_estado(estado)
+    assert modelo.enlaces[(2, 3)].a_dict() == nuevo
+    esperados = generar_configuraciones(planificar_sesion(SPEC))["progreso_routers"]["comandos_router"]
+    assert generar_configuraciones(estado)["progreso_routers"]["comandos_router"] == esperados
+
+if __name__ == "__main__":
+    try:
+        test_ida_y_vuelta_sin_cambios()
+        test_enlaces_y_routers_con_enteros()
+        test_conexiones_en_formato_antiguo()
+        print("\n✅ PRUEBA COMPLETADA")
+    except Exception as e:
+        print(f"\n❌ Error en la prueba: {e}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,65 @@
+"""
+Script de prueba para verificar el modo de enrutamiento OSPF
+"""
+import sys
+import os
+
+# Agregar el directorio actual al path para importar los módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from planificador import planificar_sesion, generar_configuraciones
+from routing import disenar_areas_ospf
+from trie_prefijos import interfaces_de_comandos
+from ip_utils import entero_a_ip, obtener_direccion_de_red
+from specs_prueba import spec_cadena
+
+SPEC = spec_cadena(
+    "ospf", num_routers=5, swc3=[5], modo_enrutamiento="ospf",
+    vlans_por_router={"1": [10], "2": [10], "3": [20], "4": [20], "5": [10, 20]},
+    conexiones=[[1, 2], [2, 3], [3, 4], [4, 5]]
+)
+
+def test_areas_de_una_cadena():
+    """En una cadena de 5 el centro es R3; los extremos quedan en el área de su ABR"""
+    areas = disenar_areas_ospf([tuple(par) for par in SPEC["conexiones"]], range(1, 6))
+    assert areas["centros"] == [3]
+    assert areas["area_router"] == {1: 2, 2: 0, 3: 0, 4: 0, 5: 4}
+    assert areas["area_enlace"] == {(1, 2): 2, (2, 3): 0, (3, 4): 0, (4, 5): 4}
+
+    # Una malla completa de profundidad 1 queda entera en el área 0
+    malla = [(a, b) for a in range(1, 5) for b in range(a + 1, 5)]
+    assert set(disenar_areas_ospf(malla, range(1, 5))["area_enlace"].values()) == {0}
+
+def test_comandos_ospf_sin_rutas_estaticas_remotas():
+    """Cada red conectada tiene su sentencia network; solo quedan las rutas hacia el SWC3"""
+    estado = generar_configuraciones(planificar_sesion(SPEC))
+    progreso = estado["progreso_routers"]
+    for r_str, comandos in progreso["comandos_router"].items():
+        assert f"router-id {r_str}.{r_str}.{r_str}.{r_str}" in comandos
+        for _, ip, mascara in interfaces_de_comandos(comandos):
+            red = obtener_direccion_de_red(ip, mascara)
+            wildcard = entero_a_ip((1 << (32 - mascara)) - 1)
+            assert any(c.startswith(f"network {red} {wildcard} area ") for c in comandos), (r_str, red)
+
+        rutas = [c for c in comandos if c.startswith("ip route ")]
+        if r_str in progreso["config_swc3"]:
+            assert len(rutas) == len(progreso["vlans_por_router"][r_str])
+            assert "redistribute static subnets" in comandos
+            assert all(ruta.split()[2] in {red for red, _ in progreso["vlans_por_router"][r_str].values()} for ruta in rutas)
+        else:
+            assert rutas == []
+
+    # Los extremos de la cadena anuncian sus VLANs en su propia área
+    red, mascara = progreso["vlans_por_router"]["1"]["10"]
+    wildcard = entero_a_ip((1 << (32 - mascara)) - 1)
+    assert f"network {red} {wildcard} area 2" in progreso["comandos_router"]["1"]
+
+if __name__ == "__main__":
+    try:
+        test_areas_de_una_cadena()
+        test_comandos_ospf_sin_rutas_estaticas_remotas()
+        print("\n✅ PRUEBA COMPLETADA")
+    except Exception as e:
+        print(f"\n❌ Error en la prueba: {e}")
+        import traceback
+        traceback.print_exc()
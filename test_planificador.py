@@ -0,0 +1,109 @@
+"""
+Script de prueba para verificar la planificación no interactiva (estrategia jerárquica)
+"""
+import sys
+import os
+import ipaddress
+import itertools
+
+# Agregar el directorio actual al path para importar los módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from planificador import planificar_sesion, generar_configuraciones, agregar_vlan_a_router
+from session_manager import revertir_paso_router, liberar_recursos_router
+from contexto_planificacion import ContextoPlanificacion
+
+SPEC = {
+    "nombre_sesion": "jerarquica",
+    "base_ip": "19.0.0.0",
+    "num_routers": 4,
+    "estrategia": "jerarquica",
+    "vlans": [{"id": v, "nombre": f"v{v}", "mascara": 22 + v % 9} for v in range(10, 80, 5)],
+    "vlans_por_router": {"1": list(range(10, 80, 5)), "2": [10, 15, 20], "3": [25, 30], "4": [35]},
+    "conexiones": [[1, 2], [2, 3], [3, 4], [1, 4]],
+    "swc3": [3]
+}
+
+def _red(par):
+    return ipaddress.IPv4Network(f"{par[0]}/{par[1]}")
+
+def test_combos_dentro_del_bloque_de_su_router():
+    """Cada VLAN y red SWC3 cae en el bloque de su router y nada se solapa"""
+    estado = planificar_sesion(SPEC)
+    bloques = estado["config_calculada"]["bloques_por_router"]
+    progreso = estado["progreso_routers"]
+    redes = []
+    for r_str, vlans in progreso["vlans_por_router"].items():
+        for par in vlans.values():
+            assert _red(par).subnet_of(_red(bloques[r_str]))
+            redes.append(_red(par))
+    red_swc3 = _red(progreso["config_swc3"]["3"]["red_hacia_router"])
+    assert red_swc3.subnet_of(_red(bloques["3"]))
+    redes.append(red_swc3)
+    redes.extend(_red((c["red"], c["mascara"])) for c in progreso["todas_las_conexiones"].values())
+    for a, b in itertools.combinations(redes, 2):
+        assert not a.overlaps(b), (a, b)
+
+def test_una_ruta_resumen_por_router_remoto():
+    """R2 llega a las 14 VLANs de R1 con una sola ruta"""
+    estado = generar_configuraciones(planificar_sesion(SPEC))
+    red_r1, mascara_r1 = estado["config_calculada"]["bloques_por_router"]["1"]
+    rutas_r2 = [c for c in estado["progreso_routers"]["comandos_router"]["2"] if c.startswith("ip route")]
+    hacia_r1 = [c for c in rutas_r2 if ipaddress.IPv4Address(c.split()[2]) in _red((red_r1, mascara_r1))]
+    assert hacia_r1 == [f"ip route {red_r1} {_red((red_r1, mascara_r1)).netmask} {hacia_r1[0].split()[-1]}"]
+
+def test_revertir_libera_y_reutiliza_el_bloque():
+    """Revertir R4 liberando recursos permite reasignar su VLAN dentro de su bloque"""
+    estado = generar_configuraciones(planificar_sesion(SPEC))
+    red_anterior = estado["progreso_routers"]["vlans_por_router"]["4"]["35"]
+    revertir_paso_router(estado, 4, liberar_recursos=True)
+    assert estado["progreso_routers"]["vlans_por_router"]["4"] == {}
+
+    combo = agregar_vlan_a_router(estado, 4, 35, red_anterior[1])
+    assert combo == red_anterior
+    assert _red(combo).subnet_of(_red(estado["config_calculada"]["bloques_por_router"]["4"]))
+
+def test_ediciones_con_contexto_reutilizado():
+    """Con el mismo contexto, liberar y volver a asignar no reconstruye las listas buddy"""
+    estado = generar_configuraciones(planificar_sesion(SPEC))
+    red_anterior = estado["progreso_routers"]["vlans_por_router"]["4"]["35"]
+    contexto = ContextoPlanificacion.desde_estado(estado)
+    dm = contexto.diagonal_manager
+    agregar_vlan_a_router(estado, 1, 99, 30, contexto=contexto)
+    asignadores = dm._asignadores
+
+    liberar_recursos_router(estado, 4, contexto)
+    combo = agregar_vlan_a_router(estado, 4, 35, red_anterior[1], contexto=contexto)
+    assert combo == red_anterior
+    assert dm._asignadores is asignadores
+    # Lo que queda ocupado coincide con reconstruir el asignador desde la sesión
+    assert dm.espacio_ocupado == ContextoPlanificacion.desde_estado(estado).diagonal_manager.espacio_ocupado
+
+def test_ecmp_y_costes_de_enlace():
+    """En el anillo R1 llega a R3 por R2 y por R4; encarecer el enlace R1-R4 deja solo R2"""
+    def saltos_hacia_r3(spec):
+        estado = generar_configuraciones(planificar_sesion(spec))
+        bloque_r3 = estado["config_calculada"]["bloques_por_router"]["3"][0]
+        comandos = estado["progreso_routers"]["comandos_router"]["1"]
+        conexiones = estado["progreso_routers"]["todas_las_conexiones"]
+        vecinos = {conexiones["(1, 2)"]["ip_r2"]: 2, conexiones["(1, 4)"]["ip_r2"]: 4}
+        return sorted(vecinos[c.split()[4]] for c in comandos if c.startswith(f"ip route {bloque_r3} "))
+
+    assert saltos_hacia_r3(SPEC) == [2, 4]
+    conexiones = [[1, 2], [2, 3], [3, 4], [1, 4, {"costo": 10}]]
+    assert saltos_hacia_r3(dict(SPEC, conexiones=conexiones)) == [2]
+    conexiones[3] = [1, 4, {"ancho_banda": 10000}]  # Coste 10 frente al coste por defecto 1
+    assert saltos_hacia_r3(dict(SPEC, conexiones=conexiones)) == [2]
+
+if __name__ == "__main__":
+    try:
+        test_combos_dentro_del_bloque_de_su_router()
+        test_una_ruta_resumen_por_router_remoto()
+        test_revertir_libera_y_reutiliza_el_bloque()
+        test_ediciones_con_contexto_reutilizado()
+        test_ecmp_y_costes_de_enlace()
+        print("\n✅ PRUEBA COMPLETADA")
+    except Exception as e:
+        print(f"\n❌ Error en la prueba: {e}")
+        import traceback
+        traceback.print_exc()
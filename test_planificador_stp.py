@@ -0,0 +1,72 @@
+"""
+Script de prueba para verificar el planificador de spanning-tree
+"""
+import sys
+import os
+import time
+
+# Agregar el directorio actual al path para importar los módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from topologia_l2 import TopologiaL2
+from planificador_stp import planificar_stp, comandos_stp
+from switch_commands import generar_comandos_switches_acceso
+from planificador import planificar_sesion, generar_configuraciones
+from specs_prueba import spec_minima
+
+def test_raiz_y_puertos_bloqueados():
+    """Anillo y malla con un uplink: SW-1 raíz y el puerto bloqueado es el del switch más lejano"""
+    anillo = TopologiaL2.desde_config({"type": "ring", "count": 4}).asignar_puertos(1, [10])
+    plan = planificar_stp(anillo, [10])
+    assert plan.tiene_bucles()
+    assert len(plan.grupos) == 1
+    grupo = plan.grupos[0]
+    assert (grupo["raiz"], grupo["secundario"]) == (1, 2)
+    assert grupo["bloqueados"] == [(3, "fa0/1")]
+    assert comandos_stp(plan)[1] == ["spanning-tree mode rapid-pvst", "spanning-tree vlan 1,10 priority 4096"]
+
+    malla = TopologiaL2.desde_config({"type": "mesh", "count": 4}).asignar_puertos(1, [10])
+    bloqueados = planificar_stp(malla, [10]).grupos[0]["bloqueados"]
+    assert sorted(bloqueados) == [(3, "fa0/1"), (4, "fa0/1"), (4, "fa0/2")]
+
+    # Una cadena no tiene bucles y no recibe comandos STP
+    cadena = {"type": "daisy_chain", "count": 3}
+    assert not planificar_stp(TopologiaL2.desde_config(cadena).asignar_puertos(1, [10]), [10]).tiene_bucles()
+    comandos = generar_comandos_switches_acceso(1, {"10": ["19.0.0.0", 24]}, cadena, None)
+    assert not any(c.startswith("spanning-tree") for cmds in comandos.values() for c in cmds)
+
+def test_raices_cruzadas_y_dominio_grande():
+    """Con dos uplinks las VLANs se reparten en dos grupos con raíz y secundario cruzados"""
+    l2 = {"enlaces": [[1, 2, 2], [2, 3], [3, 4], [4, 1]], "uplinks": [1, 3]}
+    asignacion = TopologiaL2.desde_config(l2).asignar_puertos(1, [10, 20, 30])
+    plan = planificar_stp(asignacion, [10, 20, 30])
+    assert [g["vlans"] for g in plan.grupos] == [[1, 10, 30], [20]]
+    assert [(g["raiz"], g["secundario"]) for g in plan.grupos] == [(1, 3), (3, 1)]
+    assert plan.grupos[0]["bloqueados"] != plan.grupos[1]["bloqueados"]
+    assert planificar_stp(asignacion, [10, 20, 30], grupos=1).grupos[0]["vlans"] == [1, 10, 20, 30]
+
+    # stp_grupos 2 con una sola VLAN de datos: el segundo grupo quedaría vacío y no se crea
+    spec = spec_minima(
+        "stp", num_routers=1, vlans_por_router={"1": [10]}, conexiones=[],
+        l2={"1": {"type": "ring", "count": 4, "stp_grupos": 2}}
+    )
+    switches = generar_configuraciones(planificar_sesion(spec))["progreso_routers"]["comandos_switches"]["1"]
+    assert "spanning-tree vlan 1,10 priority 4096" in switches["SW-1-1"]
+    assert not any("priority" in c for c in switches["SW-1-3"] + switches["SW-1-4"])
+
+    # Un anillo de 300 switches se planifica en mucho menos de un segundo
+    inicio = time.perf_counter()
+    grande = TopologiaL2.desde_config({"type": "ring", "count": 300}).asignar_puertos(1, [10, 20], 3)
+    plan = planificar_stp(grande, [10, 20])
+    assert time.perf_counter() - inicio < 1
+    assert plan.grupos[0]["raiz"] == 1 and len(plan.grupos[0]["bloqueados"]) == 1
+
+if __name__ == "__main__":
+    try:
+        test_raiz_y_puertos_bloqueados()
+        test_raices_cruzadas_y_dominio_grande()
+        print("\n✅ PRUEBA COMPLETADA")
+    except Exception as e:
+        print(f"\n❌ Error en la prueba: {e}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,82 @@
+"""
+Script de prueba para verificar el registro global de prefijos entre sesiones
+"""
+import sys
+import os
+import ipaddress
+import itertools
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+# Agregar el directorio actual al path para importar los módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from planificador import planificar_sesion
+from registro_global import RegistroGlobal, PrefijoOcupadoError, redes_de_sesion
+from estrategias_asignacion import ESTRATEGIAS
+from specs_prueba import spec_cadena
+
+def _spec(nombre, ruta_registro, estrategia):
+    return spec_cadena(nombre, swc3=[3], estrategia=estrategia, registro_global=ruta_registro)
+
+def test_sesiones_no_comparten_redes():
+    """Dos sedes con la misma IP base no repiten redes con ninguna estrategia"""
+    for estrategia in ESTRATEGIAS:
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "registro.json")
+            redes = []
+            for nombre in ("sede_a", "sede_b"):
+                estado = planificar_sesion(_spec(nombre, ruta, estrategia))
+                redes.extend(ipaddress.IPv4Network(f"{red}/{mascara}") for red, mascara in redes_de_sesion(estado))
+            for a, b in itertools.combinations(redes, 2):
+                assert not a.overlaps(b), (estrategia, a, b)
+            assert len(RegistroGlobal(ruta)) == len(redes)
+
+            # Volver a planificar una sede sustituye sus reservas en lugar de duplicarlas
+            planificar_sesion(_spec("sede_a", ruta, estrategia))
+            assert len(RegistroGlobal(ruta)) == len(redes)
+
+def test_reservas_y_solapamientos():
+    """reservar() rechaza solapamientos con otras sesiones y liberar() los deshace"""
+    registro = RegistroGlobal()
+    registro.reservar("10.0.0.0", 24, "a")
+    registro.reservar("10.0.2.0", 23, "a")
+    registro.reservar("10.0.0.0", 24, "a")  # Idempotente
+    assert len(registro) == 2
+    assert registro.solapa("10.0.3.128", 25)["red"] == "10.0.2.0"
+    assert registro.solapa("10.0.1.0", 24) is None
+    assert registro.solapa("10.0.0.0", 16, excluir_sesion="a") is None
+    try:
+        registro.reservar("10.0.0.0", 22, "b")
+        assert False, "Debía rechazar el solapamiento"
+    except PrefijoOcupadoError:
+        pass
+    assert registro.liberar("10.0.2.0", 23)
+    registro.reservar("10.0.2.0", 24, "b")
+    assert [dato["sesion"] for _, _, dato in registro.indice] == ["a", "b"]
+
+def test_sesiones_simultaneas():
+    """Sesiones planificadas a la vez (hilos y procesos) no repiten redes ni pierden reservas"""
+    for ejecutor in (ThreadPoolExecutor, ProcessPoolExecutor):
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "registro.json")
+            specs = [_spec(f"sede_{i}", ruta, "secuencial") for i in range(6)]
+            with ejecutor(max_workers=3) as pool:
+                estados = list(pool.map(planificar_sesion, specs))
+            redes = [ipaddress.IPv4Network(f"{red}/{mascara}") for estado in estados for red, mascara in redes_de_sesion(estado)]
+            for a, b in itertools.combinations(redes, 2):
+                assert not a.overlaps(b), (ejecutor.__name__, a, b)
+            assert len(RegistroGlobal(ruta)) == len(redes)
+            # Cada guardado usa su propio temporal y no deja restos
+            assert sorted(os.listdir(directorio)) == ["registro.json", "registro.json.lock"]
+
+if __name__ == "__main__":
+    try:
+        test_sesiones_no_comparten_redes()
+        test_reservas_y_solapamientos()
+        test_sesiones_simultaneas()
+        print("\n✅ PRUEBA COMPLETADA")
+    except Exception as e:
+        print(f"\n❌ Error en la prueba: {e}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,195 @@
+"""
+Script de prueba para verificar el servicio HTTP de generación (caché, límite de concurrencia y métricas)
+"""
+import sys
+import os
+import json
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+# Agregar el directorio actual al path para importar los módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import servicio
+from specs_prueba import spec_minima
+
+SPEC = spec_minima("servicio")
+
+def _arrancar(max_concurrentes=4):
+    """Servidor en un puerto libre, atendiendo en un hilo; devuelve (servidor, url)"""
+    servidor = servicio.crear_servidor(puerto=0, max_concurrentes=max_concurrentes)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, f"http://127.0.0.1:{servidor.server_address[1]}"
+
+def _parar(servidor):
+    servidor.shutdown()
+    servidor.server_close()
+
+def _pedir(url, ruta, spec=None):
+    """(codigo, cuerpo JSON) de un GET, o de un POST si hay spec"""
+    datos = None if spec is None else json.dumps(spec).encode("utf-8")
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url + ruta, data=datos), timeout=30) as respuesta:
+            return respuesta.status, json.loads(respuesta.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+def _metricas(url):
+    """/metricas cuando ya no hay solicitudes en curso (se anotan después de enviar la respuesta)"""
+    for _ in range(100):
+        metricas = _pedir(url, "/metricas")[1]
+        if metricas["en_curso"] == 0:
+            return metricas
+        time.sleep(0.01)
+    raise AssertionError(f"Solicitudes que no terminan: {metricas}")
+
+class _PlanificacionContada:
+    """Sustituye servicio.planificar_sesion contando llamadas (con una pausa para solapar solicitudes)"""
+
+    def __init__(self, pausa=0.0):
+        self.original = servicio.planificar_sesion
+        self.pausa = pausa
+        self.llamadas = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, spec):
+        with self._lock:
+            self.llamadas += 1
+        time.sleep(self.pausa)
+        return self.original(spec)
+
+    def __enter__(self):
+        servicio.planificar_sesion = self
+        return self
+
+    def __exit__(self, *_):
+        servicio.planificar_sesion = self.original
+
+def test_cache_y_metricas():
+    """La segunda solicitud igual sale de la caché; /metricas cuenta solicitudes, errores y latencias"""
+    servidor, url = _arrancar()
+    try:
+        assert _pedir(url, "/salud") == (200, {"estado": "ok"})
+        with _PlanificacionContada() as planificacion:
+            codigo, primera = _pedir(url, "/configuracion", SPEC)
+            assert codigo == 200
+            assert sorted(primera["configuraciones"])[:2] == ["R1", "R2"]
+            assert _pedir(url, "/configuracion", SPEC) == (200, primera)
+            assert planificacion.llamadas == 1
+
+        assert _pedir(url, "/metricas")[0] == 200
+        metricas = _metricas(url)
+        assert metricas["solicitudes"] == 2 and metricas["errores"] == 0
+        assert metricas["cache"] == {"aciertos": 1, "fallos": 1}
+        assert set(metricas["latencia_ms"]) == {"p50", "p95", "max", "media"}
+        assert _pedir(url, "/otra")[0] == 404
+    finally:
+        _parar(servidor)
+
+def test_errores_400():
+    """Especificaciones inválidas o JSON mal formado responden 400 y cuentan como error"""
+    servidor, url = _arrancar()
+    try:
+        codigo, cuerpo = _pedir(url, "/sesion", dict(SPEC, num_routers=0))
+        assert codigo == 400 and cuerpo["error"].startswith("ValueError")
+        codigo, _ = _pedir(url, "/sesion", {"base_ip": "19.0.0.0"})
+        assert codigo == 400
+        peticion = urllib.request.Request(url + "/sesion", data=b"{no es json")
+        try:
+            urllib.request.urlopen(peticion, timeout=30)
+            assert False, "Debía responder 400"
+        except urllib.error.HTTPError as e:
+            assert e.code == 400
+        assert _metricas(url)["errores"] == 3
+    finally:
+        _parar(servidor)
+
+def test_limite_de_concurrencia_503():
+    """Con todas las plazas ocupadas más de ESPERA_MAXIMA_SEGUNDOS la solicitud se rechaza con 503"""
+    espera = servicio.ESPERA_MAXIMA_SEGUNDOS
+    servicio.ESPERA_MAXIMA_SEGUNDOS = 0.1
+    servidor, url = _arrancar(max_concurrentes=1)
+    try:
+        servidor.limite.acquire()  # Ocupa la única plaza
+        try:
+            assert _pedir(url, "/configuracion", SPEC)[0] == 503
+        finally:
+            servidor.limite.release()
+        assert _pedir(url, "/configuracion", SPEC)[0] == 200
+        metricas = _metricas(url)
+        assert metricas["rechazadas"] == 1 and metricas["solicitudes"] == 1
+    finally:
+        servicio.ESPERA_MAXIMA_SEGUNDOS = espera
+        _parar(servidor)
+
+def test_fallos_simultaneos_planifican_una_vez():
+    """Varias solicitudes simultáneas de la misma especificación se resuelven con una sola planificación"""
+    servidor, url = _arrancar(max_concurrentes=4)
+    try:
+        with _PlanificacionContada(pausa=0.3) as planificacion:
+            respuestas = [None] * 4
+            def pedir(i):
+                respuestas[i] = _pedir(url, "/configuracion", SPEC)
+            hilos = [threading.Thread(target=pedir, args=(i,)) for i in range(4)]
+            for hilo in hilos:
+                hilo.start()
+            for hilo in hilos:
+                hilo.join()
+        assert planificacion.llamadas == 1
+        assert all(r == respuestas[0] and r[0] == 200 for r in respuestas)
+        assert _pedir(url, "/metricas")[1]["cache"] == {"aciertos": 3, "fallos": 1}
+    finally:
+        _parar(servidor)
+
+def test_registro_global_sin_cache():
+    """Las especificaciones con registro global se planifican siempre y ven el registro actualizado"""
+    servidor, url = _arrancar()
+    try:
+        with tempfile.TemporaryDirectory() as directorio:
+            spec = dict(SPEC, registro_global=os.path.join(directorio, "registro.json"))
+            with _PlanificacionContada() as planificacion:
+                _, primera = _pedir(url, "/sesion", spec)
+                _, segunda = _pedir(url, "/sesion", dict(spec, nombre_sesion="otra"))
+                assert _pedir(url, "/sesion", spec)[0] == 200
+                assert planificacion.llamadas == 3
+            # La segunda sede no reutiliza las redes de la primera
+            assert primera["config_calculada"]["vlans_con_combos"] != segunda["config_calculada"]["vlans_con_combos"]
+        assert _pedir(url, "/metricas")[1]["cache"] == {"aciertos": 0, "fallos": 0}
+    finally:
+        _parar(servidor)
+
+def test_opciones_de_linea_de_comandos():
+    """main.py --servicio pasa el puerto y --max-concurrentes al servidor"""
+    from main import main_servicio
+
+    llamadas = []
+    iniciar_original = servicio.iniciar_servicio
+    servicio.iniciar_servicio = lambda **opciones: llamadas.append(opciones)
+    try:
+        main_servicio([])
+        main_servicio(["9000", "--max-concurrentes", "2"])
+        main_servicio(["--max-concurrentes", "8"])
+    finally:
+        servicio.iniciar_servicio = iniciar_original
+    assert llamadas == [
+        {"puerto": servicio.PUERTO_POR_DEFECTO, "max_concurrentes": servicio.MAX_CONCURRENTES_POR_DEFECTO},
+        {"puerto": 9000, "max_concurrentes": 2},
+        {"puerto": servicio.PUERTO_POR_DEFECTO, "max_concurrentes": 8}
+    ]
+
+if __name__ == "__main__":
+    try:
+        test_cache_y_metricas()
+        test_errores_400()
+        test_limite_de_concurrencia_503()
+        test_fallos_simultaneos_planifican_una_vez()
+        test_registro_global_sin_cache()
+        test_opciones_de_linea_de_comandos()
+        print("\n✅ PRUEBA COMPLETADA")
+    except Exception as e:
+        print(f"\n❌ Error en la prueba: {e}")
+        import traceback
+        traceback.print_exc()
@@ -7,7 +7,11 @@ import os
 # Agregar el directorio actual al path para importar los módulos
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+import ipaddress
+
 from diagonal_manager import DiagonalManager
+from pool_direcciones import EspacioInsuficienteError
+from benchmark_asignacion import comparar_estrategias, mostrar_comparativa, ESTRATEGIAS_COMPARADAS
 
 def test_sistema_secuencial():
     """Prueba el sistema secuencial con el ejemplo del usuario"""
@@ -51,25 +55,121 @@ def test_sistema_secuencial():
     
     return dm
 
-def comparar_con_sistema_anterior():
-    """Muestra la comparación con el sistema anterior"""
-    
+# Solicitudes del ejemplo: (mascara, descripcion, dominio)
+SOLICITUDES_EJEMPLO = [
+    (30, "Enlace WAN R1-R2", None),
+    (30, "Enlace WAN R1-R3", None),
+    (30, "Enlace WAN R2-R3", None),
+    (30, "Enlace WAN R3-R4", None),
+    (30, "Enlace WAN R4-R5", None),
+    (28, "VLAN 3 Dominio R1", 1),
+    (28, "VLAN 3 Dominio R5", 5),
+    (23, "VLAN 4 Dominio R1", 1),
+    (23, "VLAN 4 Dominio R5", 5),
+    (22, "VLAN 2 Dominio R1", 1)
+]
+
+def _rangos_por_mascara(redes):
+    """Agrupa [(red, mascara)] en texto 'inicio-fin' por máscara"""
+    por_mascara = {}
+    for red, mascara in redes:
+        red_obj = ipaddress.IPv4Network(f"{red}/{mascara}")
+        por_mascara.setdefault(mascara, []).append(f"{red_obj.network_address}-{red_obj.broadcast_address}")
+    return por_mascara
+
+def comparar_con_sistema_anterior(dm=None):
+    """Calcula y muestra la comparación con el sistema anterior y con las demás estrategias"""
+    if dm is None:
+        dm = DiagonalManager("19.0.0.0", verbose=False)
+        for mascara, descripcion, dominio in SOLICITUDES_EJEMPLO:
+            dm.solicitar_combo(mascara, descripcion, dominio=dominio)
+        dm.procesar_asignaciones()
+
+    # Sistema anterior: cada combo se asigna en el momento, en orden de solicitud
+    anterior = DiagonalManager(dm.base_ip, verbose=False)
+    redes_anteriores = [
+        (anterior.obtener_siguiente_combo(mascara), mascara) for mascara, _, _ in dm.solicitudes_pendientes
+    ]
+    redes_nuevas = [dm.obtener_combo_asignado(sol_id) for _, _, sol_id in dm.solicitudes_pendientes]
+
     print("\nCOMPARACION: SISTEMA ANTERIOR vs SISTEMA MEJORADO")
     print("=" * 80)
-    
-    print("SISTEMA ANTERIOR (problematico):")
-    print("   /30: 19.0.0.4-7, 19.0.0.8-11, 19.0.0.12-15, 19.0.0.48-51, 19.0.0.52-55")
-    print("   /28: 19.0.0.16-31, 19.0.0.32-47")
-    print("   /23: 19.0.2.0-3.255, 19.0.8.0-9.255")
-    print("   /22: 19.0.4.0-7.255")
-    print("   Problema: /30 intercalados, desperdicia espacio")
-    
-    print("\nSISTEMA MEJORADO (secuencial):")
-    print("   /30: 19.0.0.4-7, 19.0.0.8-11, 19.0.0.12-15, 19.0.0.16-19, 19.0.0.20-23")
-    print("   /28: 19.0.0.32-47, 19.0.0.48-63")  
-    print("   /23: 19.0.2.0-3.255, 19.0.4.0-5.255")
-    print("   /22: 19.0.8.0-11.255")
-    print("   Beneficio: TODAS las /30 consecutivas, uso eficiente del espacio")
+    for titulo, redes in (("SISTEMA ANTERIOR", redes_anteriores), ("SISTEMA MEJORADO (secuencial)", redes_nuevas)):
+        print(f"\n{titulo}:")
+        for mascara, rangos in sorted(_rangos_por_mascara(redes).items(), reverse=True):
+            print(f"   /{mascara}: {', '.join(rangos)}")
+
+    solicitudes = [(m, d, dm.dominio_por_solicitud.get(s)) for m, d, s in dm.solicitudes_pendientes]
+    resultados = comparar_estrategias(dm.base_ip, solicitudes, repeticiones=1)
+    mostrar_comparativa("ejemplo", resultados)
+    return resultados
+
+def test_comparacion_estrategias():
+    """Todas las estrategias asignan el ejemplo sin solapes y el secuencial compacta las /30"""
+    resultados = comparar_con_sistema_anterior()
+    assert [r["estrategia"] for r in resultados] == list(ESTRATEGIAS_COMPARADAS)
+    primer_ajuste = resultados[0]
+    assert primer_ajuste["marca_maxima"] == "19.0.11.255"
+    assert all(r["direcciones_asignadas"] == primer_ajuste["direcciones_asignadas"] for r in resultados)
+
+def test_capacidad_del_pool():
+    """La comprobación previa calcula el prefijo mínimo y rechaza lo que no cabe, sin asignar"""
+    dm = DiagonalManager("19.0.0.0", verbose=False, prefijo_pool=20)
+    for mascara, descripcion, dominio in SOLICITUDES_EJEMPLO:
+        dm.solicitar_combo(mascara, descripcion, dominio=dominio)
+    capacidad = dm.verificar_capacidad()
+    assert capacidad["cabe"] and capacidad["prefijo_minimo"] == 20
+    assert capacidad["necesario"] == 5 * 4 + 2 * 16 + 2 * 512 + 1024 + 4
+    assert capacidad["holgura"] == 4096 - capacidad["necesario"]
+
+    dm_pequeno = DiagonalManager("19.0.0.0", verbose=False, prefijo_pool=21)
+    for mascara, descripcion, dominio in SOLICITUDES_EJEMPLO:
+        dm_pequeno.solicitar_combo(mascara, descripcion, dominio=dominio)
+    try:
+        dm_pequeno.procesar_asignaciones()
+    except EspacioInsuficienteError:
+        assert dm_pequeno.combos_asignados == {}
+    else:
+        raise AssertionError("Se esperaba EspacioInsuficienteError")
+
+    # Jerárquica: se cuentan los bloques de dominio redondeados (2 x /25 + reserva), no los combos sueltos
+    dm_jerarquica = DiagonalManager("10.0.0.0", verbose=False, estrategia="jerarquica", prefijo_pool=24)
+    for dominio in (1, 2):
+        dm_jerarquica.solicitar_combo(26, f"R{dominio} /26", dominio=dominio)
+        dm_jerarquica.solicitar_combo(27, f"R{dominio} /27", dominio=dominio)
+    assert dm_jerarquica.verificar_capacidad("secuencial")["necesario"] == 2 * (64 + 32) + 32
+    capacidad = dm_jerarquica.verificar_capacidad()
+    assert not capacidad["cabe"] and capacidad["necesario"] == 3 * 128
+
+    # Una /30 liberada no deja su máscara en la reserva: vuelve a ser del tamaño del /27
+    dm_liberado = DiagonalManager("10.0.0.0", verbose=False, prefijo_pool=24)
+    dm_liberado.solicitar_combo(27, "/27")
+    enlace = dm_liberado.solicitar_combo(30, "/30")
+    assert dm_liberado.verificar_capacidad()["necesario"] == 32 + 4 + 4
+    dm_liberado.liberar_combo(enlace)
+    assert dm_liberado.verificar_capacidad()["necesario"] == 32 + 32
+
+def test_liberar_y_reutilizar_tras_el_lote():
+    """Tras el lote se asigna y libera en el momento, y los buddies libres se fusionan"""
+    dm = DiagonalManager("19.0.0.0", verbose=False, prefijo_pool=20)
+    ids = [dm.solicitar_combo(mascara, descripcion) for mascara, descripcion, _ in SOLICITUDES_EJEMPLO]
+    dm.procesar_asignaciones()
+
+    nueva = dm.solicitar_combo(24, "VLAN nueva")
+    assert dm.obtener_combo_asignado(nueva) == ("19.0.1.0", 24)
+
+    # Liberar las dos /28 y las /30 devuelve 19.0.0.0/26 salvo la IP base
+    for solicitud_id in ids[:7]:
+        dm.liberar_combo(solicitud_id)
+    assert dm.solicitar_combo(27, "reutiliza") in dm.combos_asignados
+    assert dm.obtener_combo_asignado(dm.siguiente_id - 1) == ("19.0.0.32", 27)
+
+    # Liberando todo, el asignador global queda con un solo bloque por prefijo
+    for solicitud_id in list(dm.combos_asignados):
+        dm.liberar_combo(solicitud_id)
+    libres = dm._asignador_de(None).libres
+    assert all(len(bloques) <= 1 for bloques in libres.values())
+    assert sum(len(bloques) << (32 - prefijo) for prefijo, bloques in libres.items()) == 4096 - 1
 
 if __name__ == "__main__":
     try:
@@ -77,7 +177,8 @@ if __name__ == "__main__":
         dm = test_sistema_secuencial()
         
         # Mostrar comparación
-        comparar_con_sistema_anterior()
+        comparar_con_sistema_anterior(dm)
+        test_liberar_y_reutilizar_tras_el_lote()
         
         print(f"\nSISTEMA SECUENCIAL FUNCIONANDO CORRECTAMENTE!")
         print("   Asignacion optimizada implementada")
@@ -0,0 +1,69 @@
+"""
+Script de prueba para verificar el motor de topologías L2 de switches de acceso
+"""
+import sys
+import os
+
+# Agregar el directorio actual al path para importar los módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from topologia_l2 import TopologiaL2
+from planificador import planificar_sesion, generar_configuraciones
+from switch_commands import generar_comandos_switches_acceso_con_wlc
+
+def test_anillo_de_muchos_switches_sin_puertos_repetidos():
+    """Un anillo de 30 switches en modo físico: cada switch usa 2 troncales (+ uplink en SW-1) distintas"""
+    topologia = TopologiaL2.desde_config({"type": "ring", "count": 30})
+    asignacion = topologia.asignar_puertos(1, [10, 20], modo_config=2)
+    assert len(asignacion) == 30
+    for sw, puertos in asignacion.items():
+        interfaces = [i for t in puertos["troncales"] for i in t["interfaces"]]
+        assert len(interfaces) == 2 and len(set(interfaces)) == 2
+        assert (puertos["uplink"] is not None) == (sw == 1)
+        assert puertos["uplink"] not in interfaces
+    assert asignacion[30]["troncales"][0]["interfaces"] == ["gi0/1"]  # Switches > 5 con el modelo 2960
+
+def test_etherchannel_y_acceso_en_la_sesion():
+    """El dominio personalizado agrupa cables en channel-groups y no pisa los puertos de acceso"""
+    l2 = {"type": "simple", "enlaces": [[1, 2, 3], [2, 3]], "uplinks": [1]}
+    puertos = TopologiaL2.desde_config(l2).asignar_puertos(1, [10], modo_config=1)
+    assert puertos[1]["troncales"][0] == {"vecino": 2, "interfaces": ["fa0/1", "fa0/2", "fa0/3"], "grupo": 1, "modo": "active"}
+    assert puertos[2]["troncales"][0]["modo"] == "passive"
+
+    spec = {
+        "nombre_sesion": "l2", "base_ip": "19.0.0.0", "num_routers": 1,
+        "vlans": [{"id": 2, "nombre": "datos", "mascara": 24}], "vlans_por_router": {"1": [2]},
+        "l2": {"1": {"type": "simple", "count": 2}}
+    }
+    switches = generar_configuraciones(planificar_sesion(spec))["progreso_routers"]["comandos_switches"]["1"]
+    assert list(switches) == ["SW-1-1", "SW-1-2"]
+    comandos = switches["SW-1-1"]
+    # fa0/2 es el puerto de acceso de la VLAN 2: las troncales no lo usan
+    assert comandos[comandos.index("int fa0/2") + 2] == "switchport access vlan 2"
+    assert "name datos" in comandos
+
+def test_dominio_wlc_con_cualquier_numero_de_switches():
+    """Los dominios WLC usan el mismo motor: VLAN nativa en troncales y AP en cada hoja"""
+    vlans = {"10": ["19.0.0.0", 24], "99": ["19.0.1.0", 24]}
+    wlc = {"vlan_nativa": 99}
+    cadena = generar_comandos_switches_acceso_con_wlc(1, vlans, wlc, {"count": 4, "type": "cadena"}, None)
+    assert list(cadena) == [f"SW-1-{i}" for i in range(1, 5)]
+    assert all(c.count("switchport trunk native vlan 99") == 2 for c in cadena.values())
+    assert "name native" in cadena["SW-1-4"]
+
+    estrella = generar_comandos_switches_acceso_con_wlc(1, vlans, wlc, {"count": 6, "type": "estrella"}, None)
+    assert len(estrella) == 6 and all("int fa0/1" in c for c in estrella.values())
+
+    unico = generar_comandos_switches_acceso_con_wlc(1, vlans, wlc, {"count": 1, "type": "estrella"}, None)["SW-1"]
+    assert unico[unico.index("int fa0/10") + 2] == "switchport access vlan 10"
+
+if __name__ == "__main__":
+    try:
+        test_anillo_de_muchos_switches_sin_puertos_repetidos()
+        test_etherchannel_y_acceso_en_la_sesion()
+        test_dominio_wlc_con_cualquier_numero_de_switches()
+        print("\n✅ PRUEBA COMPLETADA")
+    except Exception as e:
+        print(f"\n❌ Error en la prueba: {e}")
+        import traceback
+        traceback.print_exc()
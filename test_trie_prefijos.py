@@ -0,0 +1,61 @@
+"""
+Script de prueba para verificar el índice de prefijos (propietarios y prefijo más largo)
+"""
+import sys
+import os
+import ipaddress
+import random
+
+# Agregar el directorio actual al path para importar los módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from planificador import planificar_sesion, generar_configuraciones
+from trie_prefijos import TriePrefijos, IndicePlan
+from ip_utils import obtener_ip_usable
+from specs_prueba import spec_cadena
+
+SPEC = spec_cadena("trie", swc3=[3])
+
+def test_prefijo_mas_largo_contra_fuerza_bruta():
+    """buscar() coincide con comparar la IP contra todos los prefijos"""
+    aleatorio = random.Random(7)
+    prefijos = []
+    trie = TriePrefijos()
+    for i in range(300):
+        mascara = aleatorio.randint(0, 32)
+        red = ipaddress.IPv4Network((aleatorio.getrandbits(32), mascara), strict=False)
+        prefijos.append(red)
+        trie.agregar(int(red.network_address), mascara, i)
+    for _ in range(2000):
+        ip = ipaddress.IPv4Address(aleatorio.getrandbits(32))
+        esperado = max((red.prefixlen for red in prefijos if ip in red), default=None)
+        encontrado = trie.buscar(int(ip))
+        assert (encontrado[1] if encontrado else None) == esperado
+
+def test_propietarios_y_decisiones():
+    """Las IPs de interfaz identifican su dispositivo y cada router llega a las VLANs remotas"""
+    estado = generar_configuraciones(planificar_sesion(SPEC))
+    indice = IndicePlan.desde_estado(estado)
+    progreso = estado["progreso_routers"]
+
+    red, mascara = progreso["vlans_por_router"]["2"]["10"]
+    gateway = obtener_ip_usable(red, mascara, -1)
+    entrada = indice.propietario(gateway)
+    assert (entrada["tipo"], entrada["vlan"], entrada["dispositivo"]) == ("vlan", 10, "R2")
+    assert indice.propietario("8.8.8.8") is None
+
+    # R1 llega a la VLAN 10 de R2 por su enlace con R2
+    enlace = progreso["todas_las_conexiones"]["(1, 2)"]
+    decision = indice.resolver(1, gateway)
+    assert [ruta["siguiente_salto"] for ruta in decision["rutas"]] == [enlace["ip_r2"]]
+    assert indice.resolver_en_bloque("R1", ["8.8.8.8"]) == [None]
+
+if __name__ == "__main__":
+    try:
+        test_prefijo_mas_largo_contra_fuerza_bruta()
+        test_propietarios_y_decisiones()
+        print("\n✅ PRUEBA COMPLETADA")
+    except Exception as e:
+        print(f"\n❌ Error en la prueba: {e}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,54 @@
+"""
+Script de prueba para verificar la validación global de sesiones
+"""
+import sys
+import os
+
+# Agregar el directorio actual al path para importar los módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from planificador import planificar_sesion, generar_configuraciones
+from validador_sesion import (
+    validar_sesion, exigir_sesion_valida, SesionInvalidaError,
+    RED_NO_ALINEADA, RED_DUPLICADA, SOLAPAMIENTO, VLAN_DUPLICADA, GATEWAY_FUERA
+)
+from specs_prueba import spec_cadena
+
+SPEC = spec_cadena("validador", swc3=[3])
+
+def test_sesion_generada_es_coherente():
+    """Una sesión recién planificada y generada no tiene problemas"""
+    estado = generar_configuraciones(planificar_sesion(SPEC))
+    assert validar_sesion(estado) == []
+    exigir_sesion_valida(estado)
+
+def test_detecta_cada_tipo_de_problema():
+    """Solapamiento, duplicado, desalineación, VLAN repetida y gateway fuera de su red"""
+    estado = generar_configuraciones(planificar_sesion(SPEC))
+    progreso = estado["progreso_routers"]
+    red_r1, _ = progreso["vlans_por_router"]["1"]["10"]
+
+    progreso["vlans_por_router"]["2"]["30"] = [red_r1, 25]  # Dentro de la VLAN 10 de R1
+    progreso["vlans_por_router"]["3"]["40"] = list(progreso["vlans_por_router"]["1"]["20"])
+    progreso["vlans_por_router"]["3"]["020"] = ["19.0.200.1", 24]
+    progreso["todas_las_conexiones"]["(1, 2)"]["ip_r2"] = progreso["todas_las_conexiones"]["(1, 2)"]["red"]
+    comandos = progreso["comandos_router"]["2"]
+    comandos[comandos.index("encapsulation dot1Q 10") + 1] = "ip add 10.9.9.9 255.255.255.0"
+
+    tipos = {problema["tipo"] for problema in validar_sesion(estado)}
+    assert tipos == {SOLAPAMIENTO, RED_DUPLICADA, RED_NO_ALINEADA, VLAN_DUPLICADA, GATEWAY_FUERA}
+    try:
+        exigir_sesion_valida(estado)
+        assert False, "Debía lanzar SesionInvalidaError"
+    except SesionInvalidaError:
+        pass
+
+if __name__ == "__main__":
+    try:
+        test_sesion_generada_es_coherente()
+        test_detecta_cada_tipo_de_problema()
+        print("\n✅ PRUEBA COMPLETADA")
+    except Exception as e:
+        print(f"\n❌ Error en la prueba: {e}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,95 @@
+"""
+Script de prueba para verificar la simulación de alcance entre VLANs
+"""
+import sys
+import os
+
+# Agregar el directorio actual al path para importar los módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from planificador import planificar_sesion, generar_configuraciones
+from verificador_alcance import verificar_sesion
+from trie_prefijos import interfaces_de_comandos
+from specs_prueba import spec_cadena
+
+SPEC = spec_cadena("alcance")
+
+def _rutas_hacia(estado, router, destino):
+    """Índice de la ruta de un router hacia la red destino"""
+    comandos = estado["progreso_routers"]["comandos_router"][router]
+    return next(i for i, c in enumerate(comandos) if c.startswith(f"ip route {destino} "))
+
+def test_plan_generado_sin_fallos():
+    """Las rutas generadas llevan de cada VLAN a todas las demás"""
+    informe = verificar_sesion(generar_configuraciones(planificar_sesion(SPEC)))
+    assert informe["pares"] == 16 and informe["alcanzables"] == 16
+    assert not informe["descartes"] and not informe["bucles"]
+
+def test_detecta_descartes_y_bucles():
+    """Quitar una ruta deja un descarte; apuntarla hacia atrás crea un bucle"""
+    estado = generar_configuraciones(planificar_sesion(SPEC))
+    progreso = estado["progreso_routers"]
+    red_r3 = progreso["vlans_por_router"]["3"]["20"][0]
+    comandos_r1 = progreso["comandos_router"]["1"]
+
+    ruta = comandos_r1.pop(_rutas_hacia(estado, "1", red_r3))
+    informe = verificar_sesion(estado)
+    assert [(f["origen"], f["camino"]) for f in informe["descartes"]] == [("R1", ["R1"])]
+
+    # R2 devuelve a R1 el tráfico hacia R3
+    comandos_r1.append(ruta)
+    comandos_r2 = progreso["comandos_router"]["2"]
+    posicion = _rutas_hacia(estado, "2", red_r3)
+    ip_r1 = progreso["todas_las_conexiones"]["(1, 2)"]["ip_r1"]
+    comandos_r2[posicion] = " ".join(comandos_r2[posicion].split()[:4] + [ip_r1])
+    informe = verificar_sesion(estado)
+    assert {f["origen"] for f in informe["bucles"]} == {"R1", "R2"}
+    assert informe["bucles"][0]["camino"] == ["R1", "R2", "R1"]
+
+def test_rutas_de_respaldo_ante_caida_de_enlace():
+    """En un triángulo, quitar las rutas principales del enlace R1-R2 deja activas las flotantes"""
+    estado = generar_configuraciones(planificar_sesion(dict(SPEC, conexiones=[[1, 2], [2, 3], [1, 3]], rutas_respaldo=True)))
+    progreso = estado["progreso_routers"]
+    enlace = progreso["todas_las_conexiones"]["(1, 2)"]
+    for router, ip_vecino in (("1", enlace["ip_r2"]), ("2", enlace["ip_r1"])):
+        comandos = progreso["comandos_router"][router]
+        principales = [c for c in comandos if c.startswith("ip route ") and c.split()[4] == ip_vecino and len(c.split()) == 5]
+        respaldos = [c for c in comandos if c.startswith("ip route ") and c.endswith(" 200")]
+        assert principales and respaldos
+        for ruta in principales:
+            comandos.remove(ruta)
+    informe = verificar_sesion(estado)
+    assert informe["alcanzables"] == informe["pares"] == 16
+
+    # En un anillo de 4 el vecino alternativo podría devolver el tráfico: sin respaldo
+    anillo = dict(SPEC, num_routers=4, conexiones=[[1, 2], [2, 3], [3, 4], [1, 4]], rutas_respaldo=True)
+    progreso = generar_configuraciones(planificar_sesion(anillo))["progreso_routers"]
+    red_r2 = progreso["vlans_por_router"]["2"]["10"][0]
+    rutas = [c for c in progreso["comandos_router"]["1"] if c.startswith(f"ip route {red_r2} ")]
+    assert len(rutas) == 1 and not rutas[0].endswith(" 200")
+
+def test_sesion_ospf_con_rutas_aprendidas():
+    """En modo OSPF las rutas salen de las sentencias network; un vecino pasivo corta el camino"""
+    estado = generar_configuraciones(planificar_sesion(dict(SPEC, swc3=[3], modo_enrutamiento="ospf")))
+    informe = verificar_sesion(estado)
+    assert informe["alcanzables"] == informe["pares"] == 16
+
+    progreso = estado["progreso_routers"]
+    comandos_r3 = progreso["comandos_router"]["3"]
+    interfaz_hacia_r2 = next(i for i, ip, _ in interfaces_de_comandos(comandos_r3)
+                       if ip == progreso["todas_las_conexiones"]["(2, 3)"]["ip_r2"])
+    comandos_r3.insert(comandos_r3.index("router ospf 1") + 1, f"passive-interface {interfaz_hacia_r2}")
+    informe = verificar_sesion(estado)
+    assert {f["origen"] for f in informe["descartes"]} == {"R1", "R2", "R3"}
+
+if __name__ == "__main__":
+    try:
+        test_plan_generado_sin_fallos()
+        test_detecta_descartes_y_bucles()
+        test_rutas_de_respaldo_ante_caida_de_enlace()
+        test_sesion_ospf_con_rutas_aprendidas()
+        print("\n✅ PRUEBA COMPLETADA")
+    except Exception as e:
+        print(f"\n❌ Error en la prueba: {e}")
+        import traceback
+        traceback.print_exc()
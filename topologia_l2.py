@@ -0,0 +1,173 @@
+"""
+Motor de topologías L2: grafo de switches de acceso de un router y reparto de puertos
+
+Un dominio L2 es un grafo de N switches (SW-1..SW-N) con:
+
+    uplinks   switches con un puerto hacia el dispositivo de arriba (router o SWC3)
+    enlaces   (a, b, cables) entre switches; con cables > 1 se forma un EtherChannel
+
+Tipos predefinidos de l2_config (["type"], con ["count"] switches):
+
+    simple         cada switch con uplink y puertos de acceso por VLAN
+    star           todos los switches con uplink (estrella desde router/SWC3)
+    daisy_chain    SW-1 con uplink y SW-i -- SW-i+1 (alias: chain, cadena)
+    ring           cadena cerrada SW-N -- SW-1 (spanning_tree: anillo, por defecto de 3)
+    mesh           SW-1 con uplink y todos los pares enlazados
+    etherchannel   SW-1 con uplink y SW-1 == SW-2 agrupado ("cables", por defecto 3)
+
+Con l2_config["enlaces"] = [[a, b], [a, b, cables], ...] (y opcional ["uplinks"])
+se describe cualquier otro grafo. asignar_puertos() recorre los enlaces una
+sola vez y reparte los puertos de cada switch en orden (uplink, enlaces por
+vecino) a través de interface_manager.get_switch_port, saltando los puertos
+reservados para acceso. Las prioridades STP de los dominios con bucles las
+calcula planificador_stp.py.
+"""
+from interface_manager import get_switch_port, get_switch_access_interface
+
+TIPO_SIMPLE = "simple"
+TIPO_ESTRELLA = "star"
+TIPO_CADENA = "daisy_chain"
+TIPO_ANILLO = "ring"
+TIPO_MALLA = "mesh"
+TIPO_ETHERCHANNEL = "etherchannel"
+TIPO_SPANNING_TREE = "spanning_tree"
+TIPOS_L2 = (TIPO_SIMPLE, TIPO_ESTRELLA, TIPO_CADENA, TIPO_ANILLO, TIPO_MALLA, TIPO_ETHERCHANNEL, TIPO_SPANNING_TREE)
+ALIAS_TIPOS = {"chain": TIPO_CADENA, "cadena": TIPO_CADENA, "estrella": TIPO_ESTRELLA}
+
+CABLES_ETHERCHANNEL = 3
+PROTOCOLOS_ETHERCHANNEL = {"lacp": ("active", "passive"), "pagp": ("desirable", "auto")}
+
+class TopologiaL2:
+    """Grafo de switches de un dominio L2"""
+
+    def __init__(self, num_switches, enlaces=(), uplinks=(1,), tipo=None, protocolo="lacp", puertos_acceso=False):
+        if num_switches < 1:
+            raise ValueError(f"Un dominio L2 necesita al menos un switch, recibido: {num_switches}")
+        if protocolo not in PROTOCOLOS_ETHERCHANNEL:
+            raise ValueError(f"Protocolo EtherChannel '{protocolo}' no válido (opciones: {', '.join(PROTOCOLOS_ETHERCHANNEL)})")
+        self.num_switches = num_switches
+        self.tipo = tipo
+        self.protocolo = protocolo
+        self.puertos_acceso = puertos_acceso
+        self.uplinks = sorted(set(int(sw) for sw in uplinks))
+        self.enlaces = []  # [(a, b, cables)] con a < b
+        vistos = set()
+        for enlace in enlaces:
+            a, b = sorted((int(enlace[0]), int(enlace[1])))
+            cables = int(enlace[2]) if len(enlace) > 2 else 1
+            if a == b or not (1 <= a and b <= num_switches) or cables < 1:
+                raise ValueError(f"Enlace L2 inválido: SW-{enlace[0]} -- SW-{enlace[1]} ({cables} cables)")
+            if (a, b) in vistos:
+                raise ValueError(f"Enlace L2 repetido: SW-{a} -- SW-{b} (usa 'cables' para agruparlo)")
+            vistos.add((a, b))
+            self.enlaces.append((a, b, cables))
+        for sw in self.uplinks:
+            if not 1 <= sw <= num_switches:
+                raise ValueError(f"Uplink en un switch inexistente: SW-{sw}")
+
+    @classmethod
+    def desde_config(cls, l2_config):
+        """Construye la topología a partir de un l2_config de la sesión ({"type", "count", ...})"""
+        tipo = l2_config.get("type", TIPO_SIMPLE)
+        tipo = ALIAS_TIPOS.get(tipo, tipo)
+        protocolo = l2_config.get("protocol", "lacp")
+        if "enlaces" in l2_config:
+            num = int(l2_config.get("count") or max([max(e[0], e[1]) for e in l2_config["enlaces"]] + [1]))
+            return cls(num, l2_config["enlaces"], l2_config.get("uplinks", (1,)), tipo, protocolo)
+        if tipo not in TIPOS_L2:
+            raise ValueError(f"Tipo de topología L2 '{tipo}' no válido (opciones: {', '.join(TIPOS_L2)})")
+
+        por_defecto = {TIPO_ETHERCHANNEL: 2, TIPO_SPANNING_TREE: 3}.get(tipo, 1)
+        num = int(l2_config.get("count", por_defecto))
+        cadena = [(i, i + 1) for i in range(1, num)]
+        if tipo in (TIPO_SIMPLE, TIPO_ESTRELLA):
+            return cls(num, (), range(1, num + 1), tipo, protocolo, puertos_acceso=tipo == TIPO_SIMPLE)
+        if tipo == TIPO_CADENA:
+            return cls(num, cadena, (1,), tipo, protocolo)
+        if tipo in (TIPO_ANILLO, TIPO_SPANNING_TREE):
+            return cls(num, cadena + ([(num, 1)] if num > 2 else []), (1,), tipo, protocolo)
+        if tipo == TIPO_MALLA:
+            return cls(num, [(a, b) for a in range(1, num + 1) for b in range(a + 1, num + 1)], (1,), tipo, protocolo)
+        cables = int(l2_config.get("cables", CABLES_ETHERCHANNEL))
+        return cls(num, [(i, i + 1, cables) for i in range(1, num)], (1,), tipo, protocolo)
+
+    def nombres(self, router_num):
+        """Nombre de cada switch: SW-<router> si es un único switch simple, SW-<router>-<i> en otro caso"""
+        if self.num_switches == 1 and self.tipo in (TIPO_SIMPLE, None):
+            return {1: f"SW-{router_num}"}
+        return {sw: f"SW-{router_num}-{sw}" for sw in range(1, self.num_switches + 1)}
+
+    def vecinos(self):
+        """{switch: [(vecino, cables)]} en el orden de los enlaces"""
+        vecinos = {sw: [] for sw in range(1, self.num_switches + 1)}
+        for a, b, cables in self.enlaces:
+            vecinos[a].append((b, cables))
+            vecinos[b].append((a, cables))
+        return vecinos
+
+    def asignar_puertos(self, router_num, vlan_ids, modo_config=1, puerto_ap=False):
+        """
+        Reparte los puertos de todos los switches del dominio en una pasada.
+
+        Con puerto_ap, cada switch hoja (un solo troncal o uplink) recibe además
+        un puerto para un punto de acceso inalámbrico tras los de enlace.
+
+        Returns:
+            dict: {switch: {"uplink": interfaz | None,
+                            "troncales": [{"vecino", "interfaces", "grupo", "modo"}],
+                            "acceso": [(interfaz, vlan_id)]}}
+                  "grupo"/"modo" solo en EtherChannel (channel-group por switch desde 1);
+                  "ap": interfaz en las hojas si puerto_ap
+        """
+        modo_activo, modo_pasivo = PROTOCOLOS_ETHERCHANNEL[self.protocolo]
+        uplinks = set(self.uplinks)
+        asignacion = {}
+        siguiente = {}  # {switch: próximo índice de puerto libre}
+        reservados = {}  # {switch: interfaces de acceso}
+        for sw in range(1, self.num_switches + 1):
+            acceso = []
+            if self.puertos_acceso:
+                acceso = [(get_switch_access_interface(router_num, vlan_id, modo_config), vlan_id) for vlan_id in vlan_ids]
+            reservados[sw] = {interfaz for interfaz, _ in acceso}
+            siguiente[sw] = 0
+            asignacion[sw] = {"uplink": None, "troncales": [], "acceso": acceso}
+            if sw in uplinks:
+                asignacion[sw]["uplink"] = self._tomar_puertos(sw, 1, siguiente, reservados, modo_config)[0]
+
+        grupos = dict.fromkeys(asignacion, 0)
+        for a, b, cables in self.enlaces:
+            for sw, vecino, modo in ((a, b, modo_activo), (b, a, modo_pasivo)):
+                troncal = {"vecino": vecino, "interfaces": self._tomar_puertos(sw, cables, siguiente, reservados, modo_config)}
+                if cables > 1:
+                    grupos[sw] += 1
+                    troncal["grupo"], troncal["modo"] = grupos[sw], modo
+                asignacion[sw]["troncales"].append(troncal)
+        if puerto_ap:
+            for sw, puertos in asignacion.items():
+                if len(puertos["troncales"]) + (puertos["uplink"] is not None) <= 1:
+                    puertos["ap"] = self._tomar_puertos(sw, 1, siguiente, reservados, modo_config)[0]
+        return asignacion
+
+    @staticmethod
+    def _tomar_puertos(sw, cantidad, siguiente, reservados, modo_config):
+        """Los siguientes `cantidad` puertos libres del switch (sin los reservados para acceso)"""
+        puertos = []
+        while len(puertos) < cantidad:
+            interfaz = get_switch_port(sw, siguiente[sw], modo_config)
+            siguiente[sw] += 1
+            if interfaz not in reservados[sw]:
+                puertos.append(interfaz)
+        return puertos
+
+def rango_interfaces(interfaces):
+    """'fa0/1-3' si son consecutivas en el mismo módulo; si no, 'fa0/1 , fa0/5'"""
+    prefijo = interfaces[0].rpartition("/")[0]
+    numeros = []
+    for interfaz in interfaces:
+        modulo, _, numero = interfaz.rpartition("/")
+        if modulo != prefijo or not numero.isdigit():
+            return " , ".join(interfaces)
+        numeros.append(int(numero))
+    if numeros == list(range(numeros[0], numeros[0] + len(numeros))):
+        return f"{prefijo}/{numeros[0]}-{numeros[-1]}"
+    return " , ".join(interfaces)
@@ -0,0 +1,300 @@
+"""
+Índice de prefijos (trie binario) sobre el plan generado de una sesión
+
+Responde en O(32) por dirección a dos preguntas sin recorrer los .cisco:
+
+    propietario(ip)           ¿Qué red del plan contiene la IP y qué dispositivo/interfaz la usa?
+    resolver(dispositivo, ip) ¿Qué haría ese dispositivo con un paquete hacia la IP? (prefijo más largo)
+
+El índice de propietarios se construye con los combos de VLAN, los enlaces
+P2P, las redes hacia los SWC3 y las direcciones de interfaz de los comandos
+generados. Cada dispositivo con comandos tiene además su tabla de rutas:
+redes conectadas ("int ..." + "ip add ...") y rutas estáticas ("ip route ...",
+"ip default-gateway ..."). ospf_de_comandos() extrae el bloque "router ospf"
+para quien necesite simular el protocolo (verificador_alcance).
+
+Uso:
+    python trie_prefijos.py <sesion.json> <ip> [<ip> ...] [--dispositivo R3]
+    (sin IPs, las lee de la entrada estándar, una por línea)
+"""
+import sys
+
+from ip_utils import ip_a_entero, entero_a_ip, red_entera, convertir_mascara_decimal_a_prefijo
+
+class _Nodo:
+    __slots__ = ("hijos", "valores")
+
+    def __init__(self):
+        self.hijos = [None, None]
+        self.valores = None  # Lista de valores del prefijo que termina en este nodo
+
+class TriePrefijos:
+    """Trie binario de prefijos IPv4: inserción y búsqueda por prefijo más largo en O(32)"""
+
+    def __init__(self):
+        self.raiz = _Nodo()
+        self.total = 0
+
+    def agregar(self, red, mascara, valor):
+        """Añade un valor al prefijo red/mascara (red como entero); un prefijo admite varios valores"""
+        nodo = self.raiz
+        for bit in range(31, 31 - mascara, -1):
+            rama = (red >> bit) & 1
+            if nodo.hijos[rama] is None:
+                nodo.hijos[rama] = _Nodo()
+            nodo = nodo.hijos[rama]
+        if nodo.valores is None:
+            nodo.valores = []
+        nodo.valores.append(valor)
+        self.total += 1
+        return nodo.valores
+
+    def exacto(self, red, mascara):
+        """Valores del prefijo exacto red/mascara, o None"""
+        nodo = self.raiz
+        for bit in range(31, 31 - mascara, -1):
+            nodo = nodo.hijos[(red >> bit) & 1]
+            if nodo is None:
+                return None
+        return nodo.valores
+
+    def buscar(self, direccion):
+        """
+        Prefijo más largo que contiene la dirección (entero).
+
+        Returns:
+            tuple: (red, mascara, valores) o None si ningún prefijo la contiene
+        """
+        nodo = self.raiz
+        mejor_mascara, mejor_valores = 0, nodo.valores
+        for profundidad in range(1, 33):
+            nodo = nodo.hijos[(direccion >> (32 - profundidad)) & 1]
+            if nodo is None:
+                break
+            if nodo.valores:
+                mejor_mascara, mejor_valores = profundidad, nodo.valores
+        if not mejor_valores:
+            return None
+        return red_entera(direccion, mejor_mascara), mejor_mascara, mejor_valores
+
+    def __len__(self):
+        return self.total
+
+def interfaces_de_comandos(comandos):
+    """
+    Direcciones de interfaz de una lista de comandos.
+
+    Returns:
+        list: [(interfaz, ip, mascara)]
+    """
+    interfaces = []
+    interfaz = None
+    for comando in comandos:
+        linea = comando.strip()
+        if linea.startswith(("int ", "interface ")):
+            interfaz = linea.split(None, 1)[1]
+        elif interfaz and linea.startswith(("ip add ", "ip address ")):
+            partes = linea.split()
+            if len(partes) >= 4:
+                interfaces.append((interfaz, partes[2], convertir_mascara_decimal_a_prefijo(partes[3])))
+        elif linea == "exit" or linea.startswith(("ip route ", "hostname ")):
+            interfaz = None
+    return interfaces
+
+def rutas_de_comandos(comandos):
+    """
+    Rutas estáticas de una lista de comandos ("ip route red mascara salto [distancia]").
+    "ip default-gateway X" se trata como 0.0.0.0/0 hacia X.
+
+    Returns:
+        list: [(red, mascara, siguiente_salto, distancia)]
+    """
+    rutas = []
+    for comando in comandos:
+        partes = comando.split()
+        if len(partes) >= 5 and partes[0] == "ip" and partes[1] == "route":
+            distancia = int(partes[5]) if len(partes) > 5 and partes[5].isdigit() else 1
+            rutas.append((partes[2], convertir_mascara_decimal_a_prefijo(partes[3]), partes[4], distancia))
+        elif len(partes) == 3 and partes[:2] == ["ip", "default-gateway"]:
+            rutas.append(("0.0.0.0", 0, partes[2], 1))
+    return rutas
+
+def ospf_de_comandos(comandos):
+    """
+    Bloque "router ospf" de una lista de comandos.
+
+    Returns:
+        dict: {"redes": [(red, wildcard)] como enteros, "pasivas": {interfaz},
+               "redistribuye": bool}, o None si el dispositivo no ejecuta OSPF
+    """
+    ospf = None
+    en_bloque = False
+    for comando in comandos:
+        partes = comando.split()
+        if partes[:2] == ["router", "ospf"]:
+            ospf = {"redes": [], "pasivas": set(), "redistribuye": False}
+            en_bloque = True
+        elif not en_bloque:
+            continue
+        elif partes == ["exit"]:
+            en_bloque = False
+        elif partes[:1] == ["network"] and len(partes) >= 3:
+            ospf["redes"].append((ip_a_entero(partes[1]), ip_a_entero(partes[2])))
+        elif partes[:1] == ["passive-interface"] and len(partes) == 2:
+            ospf["pasivas"].add(partes[1])
+        elif partes[:2] == ["redistribute", "static"]:
+            ospf["redistribuye"] = True
+    return ospf
+
+def dispositivos_con_comandos(progreso):
+    """(nombre, comandos) de todos los routers y switches con comandos generados"""
+    for r_num, comandos in progreso.get("comandos_router", {}).items():
+        yield f"R{r_num}", comandos
+    for switches in progreso.get("comandos_switches", {}).values():
+        yield from switches.items()
+
+class IndicePlan:
+    """Propietarios de las redes del plan y tabla de rutas de cada dispositivo"""
+
+    def __init__(self):
+        self.propietarios = TriePrefijos()
+        self.tablas = {}  # {dispositivo: TriePrefijos}
+
+    @classmethod
+    def desde_estado(cls, estado):
+        """Construye el índice a partir de una sesión (con o sin comandos generados)"""
+        indice = cls()
+        progreso = estado.get("progreso_routers", {})
+        calculada = estado.get("config_calculada", {})
+
+        for r_str, vlans in progreso.get("vlans_por_router", {}).items():
+            for vlan_id, (red, mascara) in vlans.items():
+                indice._agregar_red(red, mascara, "vlan", [f"R{r_str}"], vlan=int(vlan_id))
+        for datos in progreso.get("todas_las_conexiones", {}).values():
+            if isinstance(datos, dict):
+                indice._agregar_red(datos["red"], datos["mascara"], "enlace", [f"R{datos['r1']}", f"R{datos['r2']}"])
+        for r_str, datos in progreso.get("config_swc3", {}).items():
+            red, mascara = datos["red_hacia_router"]
+            indice._agregar_red(red, mascara, "swc3", [f"R{r_str}"])
+        # Lo asignado que aún no usa ningún router
+        for vlan_id, combos in calculada.get("vlans_con_combos", []):
+            for red, mascara in combos:
+                indice._agregar_red(red, mascara, "vlan", [], vlan=int(vlan_id))
+        for red, mascara in calculada.get("redes_p2p_disponibles", []):
+            indice._agregar_red(red, mascara, "p2p", [])
+
+        for dispositivo, comandos in dispositivos_con_comandos(progreso):
+            tabla = indice.tablas.setdefault(dispositivo, TriePrefijos())
+            for interfaz, ip, mascara in interfaces_de_comandos(comandos):
+                red = red_entera(ip_a_entero(ip), mascara)
+                entrada = indice._agregar_red(entero_a_ip(red), mascara, "interfaz", [dispositivo])
+                entrada["interfaces"].append({"dispositivo": dispositivo, "interfaz": interfaz, "ip": ip})
+                tabla.agregar(red, mascara, {"tipo": "conectada", "interfaz": interfaz, "distancia": 0})
+            for red, mascara, salto, distancia in rutas_de_comandos(comandos):
+                tabla.agregar(ip_a_entero(red), mascara, {"tipo": "estatica", "siguiente_salto": salto, "distancia": distancia})
+        return indice
+
+    def _agregar_red(self, red, mascara, tipo, routers, vlan=None):
+        """Entrada de propietario de red/mascara (la primera registrada gana; se completan los routers)"""
+        red_int, mascara = ip_a_entero(red), int(mascara)
+        existentes = self.propietarios.exacto(red_int, mascara)
+        if existentes:
+            entrada = existentes[0]
+            entrada["routers"].extend(r for r in routers if r not in entrada["routers"])
+            return entrada
+        entrada = {"red": red, "mascara": mascara, "tipo": tipo, "routers": list(routers), "interfaces": []}
+        if vlan is not None:
+            entrada["vlan"] = vlan
+        self.propietarios.agregar(red_int, mascara, entrada)
+        return entrada
+
+    def propietario(self, ip):
+        """
+        Red del plan que contiene la IP (prefijo más largo).
+
+        Returns:
+            dict: Entrada de la red; si la IP es de una interfaz, también
+                  "dispositivo" e "interfaz". None si no pertenece al plan.
+        """
+        encontrado = self.propietarios.buscar(ip_a_entero(ip))
+        if encontrado is None:
+            return None
+        resultado = dict(encontrado[2][0])
+        for interfaz in resultado["interfaces"]:
+            if interfaz["ip"] == ip:
+                resultado["dispositivo"] = interfaz["dispositivo"]
+                resultado["interfaz"] = interfaz["interfaz"]
+        return resultado
+
+    def resolver(self, dispositivo, ip):
+        """
+        Decisión de reenvío de un dispositivo hacia la IP.
+
+        Returns:
+            dict: {"red", "mascara", "rutas"} con las rutas de menor distancia
+                  administrativa del prefijo más largo (varias si hay ECMP), o
+                  None si el dispositivo no tiene ruta (descarte)
+        """
+        if isinstance(dispositivo, int) or str(dispositivo).isdigit():
+            dispositivo = f"R{dispositivo}"
+        if dispositivo not in self.tablas:
+            raise ValueError(f"El dispositivo {dispositivo} no tiene comandos generados en la sesión")
+        encontrado = self.tablas[dispositivo].buscar(ip_a_entero(ip))
+        if encontrado is None:
+            return None
+        red, mascara, rutas = encontrado
+        distancia = min(ruta["distancia"] for ruta in rutas)
+        return {"red": entero_a_ip(red), "mascara": mascara, "rutas": [r for r in rutas if r["distancia"] == distancia]}
+
+    def propietarios_en_bloque(self, ips):
+        """propietario() para una secuencia de IPs, en el mismo orden"""
+        return [self.propietario(ip) for ip in ips]
+
+    def resolver_en_bloque(self, dispositivo, ips):
+        """resolver() para una secuencia de IPs desde un mismo dispositivo, en el mismo orden"""
+        return [self.resolver(dispositivo, ip) for ip in ips]
+
+def _describir_propietario(ip, entrada):
+    if entrada is None:
+        return f"{ip}: fuera del plan"
+    texto = f"{ip}: {entrada['red']}/{entrada['mascara']} ({entrada['tipo']}"
+    if "vlan" in entrada:
+        texto += f" {entrada['vlan']}"
+    texto += f", {', '.join(entrada['routers']) or 'sin asignar'})"
+    if "interfaz" in entrada:
+        texto += f" -> {entrada['dispositivo']} {entrada['interfaz']}"
+    return texto
+
+def _describir_decision(ip, dispositivo, decision):
+    if decision is None:
+        return f"{ip}: {dispositivo} no tiene ruta (descarte)"
+    destinos = ", ".join(
+        ruta["interfaz"] if ruta["tipo"] == "conectada" else f"vía {ruta['siguiente_salto']}"
+        for ruta in decision["rutas"]
+    )
+    return f"{ip}: {dispositivo} usa {decision['red']}/{decision['mascara']} -> {destinos}"
+
+if __name__ == "__main__":
+    from session_manager import cargar_sesion
+
+    argumentos = sys.argv[1:]
+    dispositivo = None
+    if "--dispositivo" in argumentos:
+        posicion = argumentos.index("--dispositivo")
+        dispositivo = argumentos[posicion + 1]
+        del argumentos[posicion:posicion + 2]
+    if not argumentos:
+        print("Uso: python trie_prefijos.py <sesion.json> [<ip> ...] [--dispositivo R3]")
+        sys.exit(1)
+
+    estado = cargar_sesion(argumentos[0])
+    if estado is None:
+        sys.exit(1)
+    indice = IndicePlan.desde_estado(estado)
+    ips = argumentos[1:] or [linea.strip() for linea in sys.stdin if linea.strip()]
+    if dispositivo:
+        for ip, decision in zip(ips, indice.resolver_en_bloque(dispositivo, ips)):
+            print(_describir_decision(ip, dispositivo, decision))
+    else:
+        for ip, entrada in zip(ips, indice.propietarios_en_bloque(ips)):
+            print(_describir_propietario(ip, entrada))
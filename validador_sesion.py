@@ -0,0 +1,235 @@
+"""
+Validación global de una sesión (config_calculada + progreso_routers)
+
+Pensada para sesiones editadas a mano o convertidas desde formatos antiguos
+(verificar_compatibilidad_sesion), se ejecuta antes de generar el archivo final:
+
+    red_no_alineada   la dirección no es la de red de su prefijo
+    red_duplicada     el mismo prefijo usado por dos VLANs/enlaces, o asignado dos veces
+    solapamiento      dos prefijos distintos que comparten direcciones
+    vlan_duplicada    una VLAN repetida en un router, en sus subinterfaces o en la lista de VLANs
+    gateway_fuera     un gateway, IP de enlace o default-router fuera de su subred (o en su red/broadcast)
+
+Todas las redes se pasan a enteros y se ordenan una sola vez; los
+solapamientos salen de un barrido lineal sobre esa lista y el resto de
+comprobaciones usan diccionarios, así que el coste total es O(n log n).
+
+Uso:
+    python validador_sesion.py <sesion.json>
+"""
+import sys
+from collections import defaultdict
+
+from ip_utils import ip_a_entero, entero_a_ip, red_entera, obtener_direccion_de_red, convertir_mascara_decimal_a_prefijo
+from trie_prefijos import dispositivos_con_comandos
+
+RED_NO_ALINEADA = "red_no_alineada"
+RED_DUPLICADA = "red_duplicada"
+SOLAPAMIENTO = "solapamiento"
+VLAN_DUPLICADA = "vlan_duplicada"
+GATEWAY_FUERA = "gateway_fuera"
+
+class SesionInvalidaError(ValueError):
+    """La sesión tiene redes o direcciones incoherentes"""
+
+def _rango(red, mascara):
+    inicio = ip_a_entero(red)
+    return inicio, inicio + (1 << (32 - int(mascara))) - 1
+
+def _es_host(ip, red, mascara):
+    """La IP está en red/mascara y no es su dirección de red ni de broadcast (salvo /31 y /32)"""
+    inicio, fin = _rango(red, mascara)
+    direccion = ip_a_entero(ip)
+    if int(mascara) >= 31:
+        return inicio <= direccion <= fin
+    return inicio < direccion < fin
+
+def _redes_de_la_sesion(estado):
+    """
+    Todas las redes de la sesión con su origen.
+
+    Returns:
+        list: [(red, mascara, origen, es_uso)]; es_uso distingue lo que usa un
+              dispositivo (VLAN de un router, enlace...) de lo solo asignado
+    """
+    calculada = estado.get("config_calculada", {})
+    progreso = estado.get("progreso_routers", {})
+    redes = []
+    for r_str, vlans in progreso.get("vlans_por_router", {}).items():
+        for vlan_id, (red, mascara) in vlans.items():
+            redes.append((red, int(mascara), f"VLAN {vlan_id} de R{r_str}", True))
+    for clave, datos in progreso.get("todas_las_conexiones", {}).items():
+        red, mascara = (datos["red"], datos["mascara"]) if isinstance(datos, dict) else datos
+        redes.append((red, int(mascara), f"Enlace {clave}", True))
+    for r_str, datos in progreso.get("config_swc3", {}).items():
+        red, mascara = datos["red_hacia_router"]
+        redes.append((red, int(mascara), f"Enlace R{r_str}-SWC3", True))
+    for r_str, datos in progreso.get("config_wlc", {}).items():
+        if "ip_servidor" in datos:
+            mascara = int(datos["mascara_servidor"])
+            red = obtener_direccion_de_red(datos["ip_servidor"], mascara)
+            redes.append((red, mascara, f"Servidor WLC de R{r_str}", True))
+    for vlan_id, combos in calculada.get("vlans_con_combos", []):
+        for j, (red, mascara) in enumerate(combos):
+            redes.append((red, int(mascara), f"VLAN {vlan_id} Combo-{j+1}", False))
+    for j, (red, mascara) in enumerate(calculada.get("redes_p2p_disponibles", [])):
+        redes.append((red, int(mascara), f"Red P2P {j+1}", False))
+    return redes
+
+def _validar_redes(redes, problemas):
+    """Alineación, duplicados (por prefijo) y solapamientos (barrido sobre la lista ordenada)"""
+    usos = {}  # {(inicio, mascara): primer origen}
+    asignaciones = {}
+    repetidos = defaultdict(list)  # {(es_uso, inicio, mascara): [origenes adicionales]}
+    enteros = {}  # Cada red suele aparecer dos veces (usada y asignada): se convierte una sola
+    for red, mascara, origen, es_uso in redes:
+        inicio = enteros.get(red)
+        if inicio is None:
+            inicio = enteros[red] = ip_a_entero(red)
+        if not 0 <= mascara <= 32:
+            problemas.append({"tipo": RED_NO_ALINEADA, "detalle": f"{origen}: /{mascara} no es un prefijo válido"})
+            continue
+        if inicio & ((1 << (32 - mascara)) - 1):
+            problemas.append({"tipo": RED_NO_ALINEADA, "detalle": f"{origen}: {red}/{mascara} no es una dirección de red"})
+            inicio = red_entera(inicio, mascara)  # Se comprueba como la red que realmente ocupa
+        indice = usos if es_uso else asignaciones
+        clave = (inicio, mascara)
+        if clave in indice:
+            repetidos[(es_uso, inicio, mascara)].append(origen)
+        else:
+            indice[clave] = origen
+
+    for (es_uso, inicio, mascara), adicionales in repetidos.items():
+        primero = (usos if es_uso else asignaciones)[(inicio, mascara)]
+        problemas.append({
+            "tipo": RED_DUPLICADA,
+            "detalle": f"{entero_a_ip(inicio)}/{mascara} aparece en: {', '.join([primero] + adicionales)}"
+        })
+
+    # Un prefijo usado y además asignado es el caso normal: el barrido trabaja con prefijos únicos
+    max_fin, cubridor = -1, None
+    for clave in sorted(usos.keys() | asignaciones.keys()):
+        inicio, mascara = clave
+        fin = inicio + (1 << (32 - mascara)) - 1
+        if inicio <= max_fin:
+            problemas.append({
+                "tipo": SOLAPAMIENTO,
+                "detalle": f"{entero_a_ip(cubridor[0])}/{cubridor[1]} ({usos.get(cubridor) or asignaciones[cubridor]}) "
+                           f"solapa con {entero_a_ip(inicio)}/{mascara} ({usos.get(clave) or asignaciones[clave]})"
+            })
+        if fin > max_fin:
+            max_fin, cubridor = fin, clave
+
+def _validar_vlans(estado, problemas):
+    """VLANs repetidas en la lista de la sesión y en cada router (claves como texto o como número)"""
+    calculada = estado.get("config_calculada", {})
+    vistas = set()
+    for vlan_id, _ in calculada.get("vlans_con_combos", []):
+        if int(vlan_id) in vistas:
+            problemas.append({"tipo": VLAN_DUPLICADA, "detalle": f"VLAN {vlan_id} repetida en vlans_con_combos"})
+        vistas.add(int(vlan_id))
+    for r_str, vlans in estado.get("progreso_routers", {}).get("vlans_por_router", {}).items():
+        vistas = set()
+        for vlan_id in vlans:
+            if int(vlan_id) in vistas:
+                problemas.append({"tipo": VLAN_DUPLICADA, "detalle": f"VLAN {vlan_id} repetida en R{r_str}"})
+            vistas.add(int(vlan_id))
+
+def _validar_enlaces(estado, problemas):
+    """Las IPs de cada extremo de un enlace son hosts distintos de su red"""
+    for clave, datos in estado.get("progreso_routers", {}).get("todas_las_conexiones", {}).items():
+        if not isinstance(datos, dict):
+            continue
+        for extremo in ("ip_r1", "ip_r2"):
+            if not _es_host(datos[extremo], datos["red"], datos["mascara"]):
+                problemas.append({
+                    "tipo": GATEWAY_FUERA,
+                    "detalle": f"Enlace {clave}: {datos[extremo]} no es un host de {datos['red']}/{datos['mascara']}"
+                })
+        if datos["ip_r1"] == datos["ip_r2"]:
+            problemas.append({"tipo": GATEWAY_FUERA, "detalle": f"Enlace {clave}: ambos extremos usan {datos['ip_r1']}"})
+
+def _validar_comandos(estado, problemas):
+    """Subinterfaces (VLAN repetida, gateway fuera de la red de su VLAN) y pools DHCP de los comandos generados"""
+    vlans_por_router = estado.get("progreso_routers", {}).get("vlans_por_router", {})
+    for dispositivo, comandos in dispositivos_con_comandos(estado.get("progreso_routers", {})):
+        vlans_router = vlans_por_router.get(dispositivo[1:], {}) if dispositivo.startswith("R") else {}
+        encapsuladas = set()
+        interfaz = None
+        pool = None  # [nombre, red, mascara, default_router]
+        pools = []
+        for comando in comandos:
+            partes = comando.split()
+            if not partes:
+                continue
+            if partes[0] in ("int", "interface") and len(partes) > 1:
+                interfaz, pool = partes[1], None
+            elif partes[0] == "router":
+                interfaz, pool = None, None  # Las sentencias "network" de OSPF no son de un pool
+            elif partes[:3] == ["ip", "dhcp", "pool"] and len(partes) > 3:
+                interfaz, pool = None, [partes[3], None, None, None]
+                pools.append(pool)
+            elif partes[0] == "encapsulation" and len(partes) > 2 and partes[2].isdigit():
+                vlan_id = int(partes[2])
+                if vlan_id in encapsuladas:
+                    problemas.append({"tipo": VLAN_DUPLICADA, "detalle": f"{dispositivo}: VLAN {vlan_id} en dos subinterfaces"})
+                encapsuladas.add(vlan_id)
+            elif interfaz and "." in interfaz and len(partes) > 3 and partes[0] == "ip" and partes[1] in ("add", "address"):
+                red_vlan = vlans_router.get(interfaz.rsplit(".", 1)[1])
+                if red_vlan and not _es_host(partes[2], *red_vlan):
+                    problemas.append({
+                        "tipo": GATEWAY_FUERA,
+                        "detalle": f"{dispositivo} {interfaz}: {partes[2]} no es un host de {red_vlan[0]}/{red_vlan[1]}"
+                    })
+            elif pool is not None and partes[0] == "network" and len(partes) > 2:
+                pool[1], pool[2] = partes[1], convertir_mascara_decimal_a_prefijo(partes[2])
+            elif pool is not None and partes[0] == "default-router" and len(partes) > 1:
+                pool[3] = partes[1]
+        for nombre, red, mascara, gateway in pools:
+            if red and gateway and not _es_host(gateway, red, mascara):
+                problemas.append({
+                    "tipo": GATEWAY_FUERA,
+                    "detalle": f"{dispositivo} pool {nombre}: default-router {gateway} fuera de {red}/{mascara}"
+                })
+
+def validar_sesion(estado):
+    """
+    Valida la sesión completa.
+
+    Returns:
+        list: Problemas encontrados [{"tipo", "detalle"}] (vacía si es coherente)
+    """
+    problemas = []
+    _validar_redes(_redes_de_la_sesion(estado), problemas)
+    _validar_vlans(estado, problemas)
+    _validar_enlaces(estado, problemas)
+    _validar_comandos(estado, problemas)
+    return problemas
+
+def exigir_sesion_valida(estado):
+    """validar_sesion() que lanza SesionInvalidaError con el primer problema"""
+    problemas = validar_sesion(estado)
+    if problemas:
+        raise SesionInvalidaError(f"{len(problemas)} problemas en la sesión; el primero: {problemas[0]['detalle']}")
+
+def mostrar_problemas(problemas):
+    """Imprime los problemas de validar_sesion()"""
+    if not problemas:
+        print("✅ Sesión coherente: sin solapamientos ni direcciones fuera de su red.")
+        return
+    print(f"⚠️ {len(problemas)} problemas en la sesión:")
+    for problema in problemas:
+        print(f"   [{problema['tipo']}] {problema['detalle']}")
+
+if __name__ == "__main__":
+    from session_manager import cargar_sesion
+
+    if len(sys.argv) != 2:
+        print("Uso: python validador_sesion.py <sesion.json>")
+        sys.exit(1)
+    estado = cargar_sesion(sys.argv[1])
+    if estado is None:
+        sys.exit(1)
+    problemas = validar_sesion(estado)
+    mostrar_problemas(problemas)
+    sys.exit(2 if problemas else 0)
@@ -0,0 +1,291 @@
+"""
+Verificación offline del plano de datos de una sesión generada
+
+Construye la tabla de reenvío de cada dispositivo a partir de sus comandos
+(redes conectadas de interfaces y subinterfaces + "ip route" + OSPF) y simula el
+camino de un paquete desde cada router con VLANs hasta cada VLAN del plan.
+Detecta así, antes de cargar nada en los equipos:
+
+    descartes   un router del camino no tiene ruta hacia el destino
+    bucles      el camino vuelve a un router ya visitado
+
+Las tablas son compactas: dispositivos y saltos se numeran con enteros y cada
+entrada de la tabla es (distancia, salto), con salto = CONECTADA o el índice
+del siguiente dispositivo. El resultado de "desde el dispositivo D hacia el
+destino T" no depende del origen, así que se memoiza: la verificación completa
+cuesta O(dispositivos x destinos x 32).
+
+Un salto hacia una IP que no es de ningún dispositivo con comandos (p. ej. un
+SWC3 sin configuración generada) se da por entregado si el destino es una VLAN
+del router que lo envía, y por descarte en otro caso.
+
+En las sesiones OSPF las rutas aprendidas se derivan de los propios comandos:
+las sentencias network deciden qué interfaces participan, dos routers con
+interfaces no pasivas en la misma red son vecinos, y cada router anuncia sus
+redes incluidas (y sus rutas estáticas si redistribuye). Cada router instala
+con distancia 110 los primeros saltos de los caminos mínimos (coste 1 por
+enlace, ECMP) hacia quien anuncia cada red. Las áreas no se modelan: el
+diseño de disenar_areas_ospf() las une siempre al área 0.
+
+Uso:
+    python verificador_alcance.py <sesion.json>
+"""
+import sys
+
+from ip_utils import ip_a_entero, red_entera
+from trie_prefijos import (
+    TriePrefijos, interfaces_de_comandos, rutas_de_comandos, ospf_de_comandos, dispositivos_con_comandos
+)
+
+# Resultados de la simulación (de mejor a peor: con ECMP se queda el peor camino)
+ENTREGADO = 0
+DESCARTE = 1
+BUCLE = 2
+NOMBRES_RESULTADO = {ENTREGADO: "entregado", DESCARTE: "descarte", BUCLE: "bucle"}
+
+# Saltos especiales en las tablas compactas
+CONECTADA = -1
+SALTO_DESCONOCIDO = -2
+
+DISTANCIA_OSPF = 110
+
+_EN_CURSO = -1
+
+def rutas_ospf(interfaces, rutas, ospf):
+    """
+    Rutas que cada dispositivo aprende por OSPF.
+
+    Args:
+        interfaces: [[(interfaz, ip, mascara)]] por dispositivo
+        rutas: [[(red, mascara, salto, distancia)]] estáticas por dispositivo
+        ospf: [ospf_de_comandos() o None] por dispositivo
+
+    Returns:
+        list: [[(red, mascara, indice_siguiente_dispositivo)]] por dispositivo
+    """
+    anuncios = {}  # {dispositivo: {(red, mascara)}}
+    por_segmento = {}  # {(red, mascara): [dispositivo]} con interfaz OSPF no pasiva
+    for dispositivo, config in enumerate(ospf):
+        if config is None:
+            continue
+        propios = anuncios.setdefault(dispositivo, set())
+        for interfaz, ip, mascara in interfaces[dispositivo]:
+            direccion = ip_a_entero(ip)
+            if not any(direccion & ~wildcard & 0xFFFFFFFF == red for red, wildcard in config["redes"]):
+                continue
+            segmento = (red_entera(ip_a_entero(ip), mascara), mascara)
+            propios.add(segmento)
+            if interfaz not in config["pasivas"]:
+                por_segmento.setdefault(segmento, []).append(dispositivo)
+        if config["redistribuye"]:
+            # Sin default-information originate la ruta por defecto no se redistribuye
+            propios.update((ip_a_entero(red), mascara) for red, mascara, _, _ in rutas[dispositivo] if mascara > 0)
+
+    vecinos = {dispositivo: set() for dispositivo in anuncios}
+    for miembros in por_segmento.values():
+        for dispositivo in miembros:
+            vecinos[dispositivo].update(m for m in miembros if m != dispositivo)
+
+    aprendidas = [[] for _ in interfaces]
+    for origen in anuncios:
+        # BFS: distancia y primeros saltos (ECMP) hacia cada dispositivo OSPF
+        distancias = {origen: 0}
+        primeros = {origen: frozenset()}
+        nivel = [origen]
+        while nivel:
+            siguiente = []
+            for dispositivo in nivel:
+                for vecino in vecinos[dispositivo]:
+                    saltos = {vecino} if dispositivo == origen else primeros[dispositivo]
+                    if vecino not in distancias:
+                        distancias[vecino] = distancias[dispositivo] + 1
+                        primeros[vecino] = frozenset(saltos)
+                        siguiente.append(vecino)
+                    elif distancias[vecino] == distancias[dispositivo] + 1:
+                        primeros[vecino] = primeros[vecino] | saltos
+            nivel = siguiente
+
+        mejores = {}  # {(red, mascara): (distancia, primeros saltos)}
+        for anunciante, prefijos in anuncios.items():
+            if anunciante == origen or anunciante not in distancias:
+                continue
+            for prefijo in prefijos:
+                actual = mejores.get(prefijo)
+                if actual is None or distancias[anunciante] < actual[0]:
+                    mejores[prefijo] = (distancias[anunciante], primeros[anunciante])
+                elif distancias[anunciante] == actual[0]:
+                    mejores[prefijo] = (actual[0], actual[1] | primeros[anunciante])
+        aprendidas[origen] = [(red, mascara, salto) for (red, mascara), (_, saltos) in mejores.items() for salto in saltos]
+    return aprendidas
+
+class VerificadorAlcance:
+    """Tablas de reenvío de todos los dispositivos y simulación memoizada hacia cada VLAN"""
+
+    def __init__(self):
+        self.dispositivos = []  # [nombre] (el índice es el identificador compacto)
+        self.tablas = []  # [TriePrefijos con valores (distancia, salto)]
+        self.destinos = []  # [(nombre, direccion, indice_router_dueno)]
+        self.origenes = {}  # {indice_router: [vlan_id]}
+        self._memo = {}  # {(dispositivo, destino): resultado}
+
+    @classmethod
+    def desde_estado(cls, estado):
+        """Construye las tablas a partir de los comandos generados de la sesión"""
+        verificador = cls()
+        progreso = estado.get("progreso_routers", {})
+        indices = {}
+        comandos_por_dispositivo = []
+        for nombre, comandos in dispositivos_con_comandos(progreso):
+            indices[nombre] = len(verificador.dispositivos)
+            verificador.dispositivos.append(nombre)
+            comandos_por_dispositivo.append(comandos)
+
+        # IP de interfaz -> dispositivo, para resolver los siguientes saltos a enteros
+        dueno_ip = {}
+        interfaces = [interfaces_de_comandos(comandos) for comandos in comandos_por_dispositivo]
+        for indice, lista in enumerate(interfaces):
+            for _, ip, _ in lista:
+                dueno_ip[ip_a_entero(ip)] = indice
+
+        rutas = [rutas_de_comandos(comandos) for comandos in comandos_por_dispositivo]
+        ospf = [ospf_de_comandos(comandos) for comandos in comandos_por_dispositivo]
+        aprendidas = rutas_ospf(interfaces, rutas, ospf)
+        for indice in range(len(comandos_por_dispositivo)):
+            tabla = TriePrefijos()
+            for _, ip, mascara in interfaces[indice]:
+                tabla.agregar(red_entera(ip_a_entero(ip), mascara), mascara, (0, CONECTADA))
+            for red, mascara, salto, distancia in rutas[indice]:
+                tabla.agregar(ip_a_entero(red), mascara, (distancia, dueno_ip.get(ip_a_entero(salto), SALTO_DESCONOCIDO)))
+            for red, mascara, salto in aprendidas[indice]:
+                tabla.agregar(red, mascara, (DISTANCIA_OSPF, salto))
+            verificador.tablas.append(tabla)
+
+        # Destinos: un host de cada VLAN asignada a un router (el primero, el gateway es el último)
+        for r_str, vlans in sorted(progreso.get("vlans_por_router", {}).items(), key=lambda x: int(x[0])):
+            router = indices.get(f"R{r_str}")
+            if router is None:
+                continue
+            for vlan_id, (red, mascara) in sorted(vlans.items(), key=lambda x: int(x[0])):
+                direccion = ip_a_entero(red) + (1 if int(mascara) < 31 else 0)
+                verificador.destinos.append((f"R{r_str} VLAN {vlan_id} ({red}/{mascara})", direccion, router))
+                verificador.origenes.setdefault(router, []).append(int(vlan_id))
+        return verificador
+
+    def _saltos(self, dispositivo, destino):
+        """
+        Siguientes dispositivos desde uno hacia un destino.
+
+        Returns:
+            int | list: ENTREGADO / DESCARTE, o la lista de índices de siguiente salto (ECMP)
+        """
+        _, direccion, dueno = self.destinos[destino]
+        encontrado = self.tablas[dispositivo].buscar(direccion)
+        if encontrado is None:
+            return DESCARTE
+        entradas = encontrado[2]
+        distancia = min(d for d, _ in entradas)
+        saltos = [salto for d, salto in entradas if d == distancia]
+        if CONECTADA in saltos:
+            return ENTREGADO
+        if SALTO_DESCONOCIDO in saltos:
+            return ENTREGADO if dispositivo == dueno else DESCARTE
+        return saltos
+
+    def resultado(self, origen, destino):
+        """
+        Resultado de enviar desde el dispositivo origen al destino (índices).
+        Recorrido en profundidad iterativo con memo: un salto a un dispositivo
+        aún en curso en la pila es un bucle.
+        """
+        memo = self._memo
+        if (origen, destino) in memo:
+            return memo[(origen, destino)]
+        pila = [[origen, None, ENTREGADO]]  # [dispositivo, saltos pendientes, peor resultado visto]
+        while pila:
+            marco = pila[-1]
+            dispositivo, pendientes = marco[0], marco[1]
+            if pendientes is None:
+                saltos = self._saltos(dispositivo, destino)
+                if not isinstance(saltos, list):
+                    memo[(dispositivo, destino)] = saltos
+                    pila.pop()
+                    continue
+                memo[(dispositivo, destino)] = _EN_CURSO
+                pendientes = marco[1] = list(saltos)
+
+            while pendientes:
+                estado_siguiente = memo.get((pendientes[-1], destino))
+                if estado_siguiente is None:
+                    break  # Explorar ese salto antes de seguir con este dispositivo
+                pendientes.pop()
+                marco[2] = max(marco[2], BUCLE if estado_siguiente == _EN_CURSO else estado_siguiente)
+            if pendientes:
+                pila.append([pendientes[-1], None, ENTREGADO])
+            else:
+                memo[(dispositivo, destino)] = marco[2]
+                pila.pop()
+        return memo[(origen, destino)]
+
+    def trazar(self, origen, destino):
+        """Camino (nombres) que sigue el primer salto de cada dispositivo, hasta entregar, descartar o repetir"""
+        camino = [self.dispositivos[origen]]
+        visitados = {origen}
+        dispositivo = origen
+        while True:
+            saltos = self._saltos(dispositivo, destino)
+            if not isinstance(saltos, list):
+                return camino, saltos
+            dispositivo = saltos[0]
+            camino.append(self.dispositivos[dispositivo])
+            if dispositivo in visitados:
+                return camino, BUCLE
+            visitados.add(dispositivo)
+
+    def verificar(self):
+        """
+        Alcance entre todas las VLANs: desde el router de cada VLAN hacia todas las demás.
+
+        Returns:
+            dict: {"pares", "alcanzables", "descartes", "bucles"}; descartes y
+                  bucles son listas de {"origen", "destino", "camino"}
+        """
+        informe = {"pares": 0, "alcanzables": 0, "descartes": [], "bucles": []}
+        for router, vlans in self.origenes.items():
+            for destino, (nombre_destino, _, _) in enumerate(self.destinos):
+                codigo = self.resultado(router, destino)
+                informe["pares"] += len(vlans)
+                if codigo == ENTREGADO:
+                    informe["alcanzables"] += len(vlans)
+                    continue
+                camino, _ = self.trazar(router, destino)
+                fallo = {"origen": self.dispositivos[router], "destino": nombre_destino, "camino": camino}
+                informe["descartes" if codigo == DESCARTE else "bucles"].append(fallo)
+        return informe
+
+def verificar_sesion(estado):
+    """Atajo: construye el verificador de la sesión y devuelve su informe"""
+    return VerificadorAlcance.desde_estado(estado).verificar()
+
+def mostrar_informe(informe):
+    """Imprime el informe de verificar()"""
+    print("\nVERIFICACIÓN DE ALCANCE ENTRE VLANs")
+    print("=" * 70)
+    print(f"   Pares VLAN-VLAN: {informe['pares']}  |  alcanzables: {informe['alcanzables']}")
+    for clave, titulo in (("descartes", "❌ Sin ruta"), ("bucles", "🔁 Bucle")):
+        for fallo in informe[clave]:
+            print(f"   {titulo}: {fallo['origen']} -> {fallo['destino']} | {' -> '.join(fallo['camino'])}")
+    if not informe["descartes"] and not informe["bucles"]:
+        print("   ✅ Todas las VLANs se alcanzan entre sí")
+
+if __name__ == "__main__":
+    from session_manager import cargar_sesion
+
+    if len(sys.argv) != 2:
+        print("Uso: python verificador_alcance.py <sesion.json>")
+        sys.exit(1)
+    estado = cargar_sesion(sys.argv[1])
+    if estado is None:
+        sys.exit(1)
+    informe = verificar_sesion(estado)
+    mostrar_informe(informe)
+    sys.exit(0 if not informe["descartes"] and not informe["bucles"] else 2)
@@ -39,15 +39,15 @@ def numero_a_letras(numero):
 
 def validar_vlan_personalizada():
     """Valida y obtiene ID y nombre personalizado de VLAN"""
-    from validaciones import validar_entrada
+    from validaciones import validar_entrada, leer_entrada, reportar_error
     
     while True:
         vlan_id = validar_entrada("🏷️ ¿ID de VLAN? (ej: 20, 100): ", "numero_positivo")
         if vlan_id < 2:
-            print("❌ Error: Las VLANs de usuario deben tener un ID de 2 o superior.")
+            reportar_error("❌ Error: Las VLANs de usuario deben tener un ID de 2 o superior.")
             continue
         if vlan_id > 4094:
-            print("❌ Error: El ID de VLAN debe ser menor o igual a 4094.")
+            reportar_error("❌ Error: El ID de VLAN debe ser menor o igual a 4094.")
             continue
         break
     
@@ -55,7 +55,7 @@ def validar_vlan_personalizada():
     nombre_auto = numero_a_letras(vlan_id)
     
     # Preguntar si quiere personalizar el nombre
-    nombre_personalizado = input(f"📝 ¿Nombre personalizado? (Enter para usar '{nombre_auto}'): ").strip()
+    nombre_personalizado = leer_entrada(f"📝 ¿Nombre personalizado? (Enter para usar '{nombre_auto}'): ").strip()
     
     if not nombre_personalizado:
         nombre_final = nombre_auto